@@ -2,9 +2,10 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth import get_user_model
 from .forms import CustomAuthenticationForm
-from .models import OTP
+from .models import OTP, SmsOutbox
 
 admin.site.register(OTP)
+admin.site.register(SmsOutbox)
 User = get_user_model()
 
 # سفارشی‌سازی فرم لاگین پنل ادمین
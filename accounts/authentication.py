@@ -0,0 +1,106 @@
+# accounts/authentication.py
+# --------------------------------------------------
+# 🎫 احراز هویت JWT بدون کوئری کاربر در هر درخواست
+# --------------------------------------------------
+# امضای توکن اعتبار کاربر را ثابت می‌کند؛ وضعیت قابل تغییر (فعال بودن، نقش،
+# دسترسی مدیریت) از یک کش کوتاه‌مدت داخل پروسه خوانده می‌شود که با هر
+# ذخیره/حذف کاربر (accounts/signals.py) پاک می‌شود. در پروسه‌های دیگر
+# تغییر حداکثر بعد از AUTH_USER_CACHE_TTL ثانیه دیده می‌شود.
+# وضعیتی که داخل تراکنش خوانده شود فقط بعد از commit کش می‌شود؛ اگر تراکنش
+# برگردد (مثلاً کاربری که در همان تراکنش ساخته شده)، ردیفی با شناسه‌ای که
+# بعداً دوباره استفاده می‌شود در کش نمی‌ماند.
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core.profiling import timed
+from .models import CustomUser
+
+USER_CACHE_TTL = getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+USER_CACHE_SIZE = getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000)
+
+# فیلدهایی که از کش پر می‌شوند؛ بقیه (مثل password) فقط هنگام دسترسی از DB خوانده می‌شوند
+CACHED_FIELDS = ('id', 'mobile', 'is_active', 'is_staff', 'is_superuser', 'role')
+
+
+class UserStateCache:
+    """🧠 کش LRU با انقضا برای وضعیت کاربران (کلید: شناسه کاربر)"""
+
+    def __init__(self, ttl=USER_CACHE_TTL, size=USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self._entries = OrderedDict()
+        self._guard = threading.Lock()
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._guard:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+        state = CustomUser.objects.filter(pk=user_id).values(*CACHED_FIELDS).first()
+        if state is not None:
+            # 🔁 بیرون از تراکنش بلافاصله اجرا می‌شود
+            transaction.on_commit(lambda: self._store(user_id, state, now + self.ttl))
+        return state
+
+    def _store(self, user_id, state, expires):
+        with self._guard:
+            self._entries[user_id] = (expires, state)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._guard:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._guard:
+            self._entries.clear()
+
+
+user_states = UserStateCache()
+
+
+def lightweight_user(state):
+    """
+    👤 نمونه CustomUser با فیلدهای کش‌شده؛ بقیه فیلدها deferred هستند و
+    فقط اگر ویویی به آن‌ها نیاز داشته باشد با یک کوئری بارگذاری می‌شوند.
+    """
+    names = [field.attname for field in CustomUser._meta.concrete_fields if field.attname in state]
+    return CustomUser.from_db('default', names, [state[name] for name in names])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """✅ جایگزین JWTAuthentication: همان اعتبارسنجی توکن، بدون خواندن ردیف کاربر در هر درخواست"""
+
+    def authenticate(self, request):
+        with timed('auth'):  # ⏱️ بخش auth در Server-Timing (core/profiling.py)
+            return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # مقایسه با هش رمز عبور به ردیف کامل نیاز دارد
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        state = user_states.get(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not state['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return lightweight_user(state)
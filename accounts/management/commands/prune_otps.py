@@ -0,0 +1,44 @@
+# accounts/management/commands/prune_otps.py
+# --------------------------------------------------
+# 🧹 حذف دسته‌ای کدهای تأیید منقضی و پیام‌های قدیمی صف پیامک
+# --------------------------------------------------
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import OTP, OTP_TTL, SmsOutbox
+
+
+def delete_in_batches(queryset, batch_size):
+    """🗑️ حذف با دسته‌های کوچک تا قفل طولانی روی جدول نگیریم"""
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += queryset.model.objects.filter(pk__in=ids).delete()[0]
+
+
+class Command(BaseCommand):
+    help = "حذف کدهای OTP منقضی و پیام‌های ارسال‌شده/ناموفق قدیمی (برای اجرای دوره‌ای با cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, dest='batch_size', help="تعداد ردیف در هر DELETE")
+        parser.add_argument(
+            '--outbox-days', type=int, default=7, dest='outbox_days',
+            help="پیام‌های تمام‌شده صف پیامک قدیمی‌تر از این تعداد روز حذف شوند",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        otps = delete_in_batches(OTP.objects.filter(created_at__lt=now - OTP_TTL), options['batch_size'])
+        messages = delete_in_batches(
+            SmsOutbox.objects.filter(
+                status__in=('sent', 'failed', 'expired'),
+                created_at__lt=now - timedelta(days=options['outbox_days']),
+            ),
+            options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"✅ {otps} کد منقضی و {messages} پیام قدیمی حذف شد."))
@@ -0,0 +1,34 @@
+# accounts/management/commands/send_sms_outbox.py
+# --------------------------------------------------
+# 📤 ورکر صف پیامک: ارسال پیام‌های SmsOutbox با هم‌روندی محدود و تلاش مجدد
+# --------------------------------------------------
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.sms import drain
+
+
+class Command(BaseCommand):
+    help = "ارسال پیام‌های صف پیامک (OTP) با هم‌روندی محدود، backoff و خط پشتیبان"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help="حداکثر ارسال هم‌زمان")
+        parser.add_argument('--batch-size', type=int, default=20, dest='batch_size', help="تعداد پیام در هر برداشت")
+        parser.add_argument('--interval', type=float, default=1.0, help="فاصله بررسی صف وقتی خالی است (ثانیه)")
+        parser.add_argument('--once', action='store_true', help="فقط پیام‌های آماده فعلی ارسال شوند و دستور تمام شود")
+
+    def handle(self, *args, **options):
+        total = 0
+        try:
+            while True:
+                processed = drain(batch_size=options['batch_size'], concurrency=options['concurrency'])
+                total += processed
+                if not processed:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"✅ {total} پیام پردازش شد."))
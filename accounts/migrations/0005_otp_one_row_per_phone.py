@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 16:21
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def keep_latest_code_per_phone(apps, schema_editor):
+    # قبل از یکتا شدن phone: فقط آخرین کد هر شماره می‌ماند
+    OTP = apps.get_model('accounts', 'OTP')
+    latest = OTP.objects.values('phone').annotate(last_id=Max('id')).values('last_id')
+    OTP.objects.exclude(id__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_sms_outbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_code_per_phone, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='otp',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='otp',
+            name='phone',
+            field=models.CharField(max_length=11, unique=True),
+        ),
+    ]
@@ -42,11 +42,14 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.mobile
 
-# ✅ مدل کد تأیید
+# ⏱️ مدت اعتبار کد تأیید
+OTP_TTL = timedelta(minutes=2)
+
+# ✅ مدل کد تأیید (برای هر شماره فقط یک ردیف؛ ارسال دوباره همان ردیف را بازنویسی می‌کند)
 class OTP(models.Model):
-    phone = models.CharField(max_length=11)
+    phone = models.CharField(max_length=11, unique=True)
     code = models.CharField(max_length=5)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # 🧹 برای حذف دسته‌ای کدهای منقضی
     attempts = models.PositiveSmallIntegerField(default=0)
 
     def __str__(self):
@@ -54,8 +57,40 @@ class OTP(models.Model):
 
     def is_expired(self):
         """کد بیشتر از ۲ دقیقه اعتبار ندارد"""
-        return timezone.now() > self.created_at + timedelta(minutes=2)
+        return timezone.now() > self.created_at + OTP_TTL
 
     def can_try(self):
         """حداکثر ۵ تلاش برای وارد کردن کد"""
         return self.attempts < 5
+
+
+# 📤 صف ارسال پیامک (outbox): درخواست کاربر فقط ردیف ثبت می‌کند و ورکر ارسال را انجام می‌دهد
+class SmsOutbox(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'در انتظار ارسال'),
+        ('sending', 'در حال ارسال'),
+        ('sent', 'ارسال‌شده'),
+        ('failed', 'ناموفق'),
+        ('expired', 'منقضی'),
+    ]
+
+    phone = models.CharField(max_length=11)
+    message = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # ⏰ زمان تلاش بعدی؛ در حالت sending مهلت ورکر (بعد از آن دوباره قابل برداشت است)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(null=True, blank=True)  # بعد از این زمان ارسال بی‌فایده است (مثلاً کد منقضی)
+    sender = models.CharField(max_length=20, blank=True)  # خطی که پیام از آن رفت
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 📥 برداشت پیام‌های آماده: status IN (...) AND next_attempt_at <= now
+            models.Index(fields=['status', 'next_attempt_at'], name='sms_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.phone} - {self.status}"
@@ -0,0 +1,115 @@
+# accounts/otp.py
+# --------------------------------------------------
+# 🔐 نگهداری کدهای تأیید (OTP) برای مسیر پرتکرار ورود
+# --------------------------------------------------
+# برای هر شماره فقط یک کد زنده وجود دارد: ارسال دوباره آن را بازنویسی می‌کند و
+# تأیید موفق آن را حذف می‌کند؛ بررسی کد حداکثر یک خواندن با کلید یکتا است.
+# OTP_STORE = 'db' (پیش‌فرض، جدول OTP) یا 'cache' (کش مشترک با TTL دو دقیقه؛ نیازمند REDIS_URL).
+
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F
+from django.utils import timezone
+
+from core.cache import is_shared_cache
+from .models import OTP, OTP_TTL
+
+MAX_ATTEMPTS = 5  # هم‌خوان با OTP.can_try
+
+
+class OtpError(Exception):
+    """❌ کد قابل قبول نیست (پیام برای نمایش به کاربر)"""
+
+
+def generate_code():
+    return str(random.randint(10000, 99999))  # ✅ کد ۵ رقمی تصادفی
+
+
+class DatabaseStore:
+    """🗄️ جدول OTP با phone یکتا؛ ثبت با upsert و حذف کدهای منقضی با prune_otps"""
+
+    def save(self, phone, code):
+        # یک INSERT ... ON CONFLICT(phone) DO UPDATE
+        OTP.objects.bulk_create(
+            [OTP(phone=phone, code=code, created_at=timezone.now(), attempts=0)],
+            update_conflicts=True, unique_fields=['phone'], update_fields=['code', 'created_at', 'attempts'],
+        )
+
+    def verify(self, phone, code):
+        otp = OTP.objects.filter(phone=phone).first()
+        if otp is None:
+            raise OtpError("کدی برای این شماره ثبت نشده است.")
+        if not otp.can_try():
+            raise OtpError("تعداد تلاش‌ها به پایان رسیده است.")
+        if otp.is_expired():
+            raise OtpError("کد منقضی شده است.")
+        if otp.code != code:
+            OTP.objects.filter(pk=otp.pk).update(attempts=F('attempts') + 1)
+            raise OtpError("کد وارد شده اشتباه است.")
+        OTP.objects.filter(pk=otp.pk).delete()  # ♻️ کد یک‌بار مصرف است
+
+
+class CacheStore:
+    """
+    ⚡ کش مشترک؛ کلید هر شماره خودش بعد از دو دقیقه منقضی می‌شود (جدولی رشد نمی‌کند).
+    شمارش تلاش‌ها در کلیدی جدا با incr اتمی است تا حدس‌های همزمان از سقف عبور نکنند.
+    """
+
+    KEY = 'otp:{}'
+    ATTEMPTS_KEY = 'otp:attempts:{}'
+
+    def __init__(self):
+        if not is_shared_cache():
+            # ارسال کد و تأیید آن ممکن است به پروسه‌های مختلف برسند
+            raise ImproperlyConfigured("OTP_STORE='cache' needs a cache shared between processes (e.g. REDIS_URL).")
+
+    def save(self, phone, code):
+        expires_at = timezone.now() + OTP_TTL
+        timeout = OTP_TTL.total_seconds()
+        cache.set(self.ATTEMPTS_KEY.format(phone), 0, timeout=timeout)
+        cache.set(self.KEY.format(phone), {'code': code, 'expires_at': expires_at}, timeout=timeout)
+
+    def verify(self, phone, code):
+        key, attempts_key = self.KEY.format(phone), self.ATTEMPTS_KEY.format(phone)
+        entry = cache.get(key)
+        if entry is None:
+            raise OtpError("کدی برای این شماره ثبت نشده است.")
+        remaining = (entry['expires_at'] - timezone.now()).total_seconds()
+        if remaining <= 0:
+            raise OtpError("کد منقضی شده است.")
+        # 🔢 هر تلاش پیش از مقایسه کد یک شماره رزرو می‌کند
+        cache.add(attempts_key, 0, timeout=remaining)
+        try:
+            attempts = cache.incr(attempts_key)
+        except ValueError:
+            raise OtpError("کد منقضی شده است.")
+        if attempts > MAX_ATTEMPTS:
+            raise OtpError("تعداد تلاش‌ها به پایان رسیده است.")
+        if entry['code'] != code:
+            raise OtpError("کد وارد شده اشتباه است.")
+        cache.delete_many([key, attempts_key])
+
+
+STORES = {
+    'db': DatabaseStore,
+    'cache': CacheStore,
+}
+
+
+def get_store():
+    return STORES[getattr(settings, 'OTP_STORE', 'db')]()
+
+
+def issue(phone):
+    """🆕 کد جدید برای شماره (جایگزین کد قبلی)"""
+    code = generate_code()
+    get_store().save(phone, code)
+    return code
+
+
+def verify(phone, code):
+    """✅ بررسی کد؛ در صورت نادرستی OtpError"""
+    get_store().verify(phone, code)
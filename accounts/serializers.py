@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.db import transaction
 from django.utils import timezone
-from .utils import send_otp_sms  # 🔹 ارسال پیامک
-from .models import OTP, CustomUser
-import random
+from .sms import enqueue_otp  # 🔹 ثبت پیامک در صف ارسال
+from .otp import OtpError, issue, verify  # 🔐 نگهداری و بررسی کد (جدول یا کش)
+from .models import CustomUser
 
 class SendCodeSerializer(serializers.Serializer):
     phone = serializers.CharField(max_length=11)
@@ -15,13 +16,12 @@ class SendCodeSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         phone = validated_data['phone']
-        code = str(random.randint(10000, 99999))  # ✅ تولید کد ۵ رقمی تصادفی
+        with transaction.atomic():
+            # ✅ کد ۵ رقمی جدید (جایگزین کد قبلی همین شماره)
+            code = issue(phone)
 
-        # ذخیره کد در دیتابیس
-        OTP.objects.create(phone=phone, code=code)
-
-        # 🚀 ارسال پیامک واقعی
-        send_otp_sms(phone, code)
+            # 📤 پیامک در صف ثبت می‌شود و ورکر (send_sms_outbox) آن را می‌فرستد
+            enqueue_otp(phone, code)
 
         return {'phone': phone}
 
@@ -35,20 +35,9 @@ class VerifyCodeSerializer(serializers.Serializer):
         code = data['code']
 
         try:
-            otp = OTP.objects.filter(phone=phone).latest('created_at')
-        except OTP.DoesNotExist:
-            raise serializers.ValidationError("کدی برای این شماره ثبت نشده است.")
-
-        if not otp.can_try():
-            raise serializers.ValidationError("تعداد تلاش‌ها به پایان رسیده است.")
-
-        if otp.is_expired():
-            raise serializers.ValidationError("کد منقضی شده است.")
-
-        if otp.code != code:
-            otp.attempts += 1
-            otp.save()
-            raise serializers.ValidationError("کد وارد شده اشتباه است.")
+            verify(phone, code)  # حداکثر یک خواندن با کلید یکتا
+        except OtpError as exc:
+            raise serializers.ValidationError(str(exc))
 
         # ✅ ایجاد یا یافتن کاربر
         user, created = CustomUser.objects.get_or_create(mobile=phone)
@@ -0,0 +1,19 @@
+# accounts/signals.py
+# --------------------------------------------------
+# 📡 پاک کردن وضعیت کش‌شده کاربر (accounts/authentication.py) بعد از هر تغییر
+# --------------------------------------------------
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .authentication import user_states
+from .models import CustomUser
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_user_state(sender, instance, **kwargs):
+    # ⚠️ QuerySet.update سیگنال ندارد؛ در آن حالت تغییر بعد از AUTH_USER_CACHE_TTL دیده می‌شود
+    user_states.invalidate(instance.pk)
+    # وضعیتی که قبل از این تغییر در همین تراکنش خوانده شده، بعد از commit کش می‌شود؛ دوباره پاک شود
+    transaction.on_commit(lambda: user_states.invalidate(instance.pk))
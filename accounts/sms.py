@@ -0,0 +1,342 @@
+# accounts/sms.py
+# --------------------------------------------------
+# 📨 ارسال پیامک: ترنسپورت قابل تعویض + صف ارسال (outbox) با تلاش مجدد
+# --------------------------------------------------
+# درخواست ورود فقط یک ردیف SmsOutbox ثبت می‌کند و فوراً پاسخ می‌گیرد؛
+# دستور send_sms_outbox ردیف‌ها را با هم‌روندی محدود، backoff و
+# جایگزینی خط اصلی/پشتیبان ارسال می‌کند.
+# همه ارسال‌ها از SmsGateway می‌گذرند: اتصال‌های پایدار (keep-alive)، قطع‌کن مدار
+# برای هر خط (خط خراب برای مدتی کنار گذاشته می‌شود) و آمار تأخیر/موفقیت هر خط.
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.profiling import timed
+from .models import OTP_TTL, SmsOutbox
+
+logger = logging.getLogger(__name__)
+
+TSMS_URL = getattr(settings, 'TSMS_URL', 'http://tsms.ir/url/tsmshttp.php')
+TSMS_CONNECT_TIMEOUT = getattr(settings, 'TSMS_CONNECT_TIMEOUT', 2)
+TSMS_READ_TIMEOUT = getattr(settings, 'TSMS_READ_TIMEOUT', 4)
+TSMS_POOL_SIZE = getattr(settings, 'TSMS_POOL_SIZE', 10)
+
+BREAKER_FAILURES = getattr(settings, 'SMS_BREAKER_FAILURES', 3)  # خطای پیاپی تا باز شدن مدار
+BREAKER_COOLDOWN = getattr(settings, 'SMS_BREAKER_COOLDOWN', 30)  # ثانیه؛ مدت کنار گذاشتن خط
+
+MAX_ATTEMPTS = getattr(settings, 'SMS_OUTBOX_MAX_ATTEMPTS', 5)
+BACKOFF_BASE = getattr(settings, 'SMS_OUTBOX_BACKOFF_BASE', 2)  # ثانیه؛ دو برابر در هر تلاش
+BACKOFF_MAX = getattr(settings, 'SMS_OUTBOX_BACKOFF_MAX', 30)
+LEASE_SECONDS = getattr(settings, 'SMS_OUTBOX_LEASE', 60)  # مهلت ورکر برای هر پیام برداشته‌شده
+
+
+class SmsError(Exception):
+    """❌ خطای ارسال از یک خط (پاسخ نامعتبر یا خطای شبکه)"""
+
+
+# --------------------------------------------------
+# 🔌 ترنسپورت‌ها
+# --------------------------------------------------
+
+class BaseTransport:
+    """هر ترنسپورت فقط send را پیاده می‌کند؛ در صورت شکست SmsError می‌دهد"""
+
+    def send(self, sender, phone, message):
+        raise NotImplementedError
+
+
+class TsmsTransport(BaseTransport):
+    """
+    🌐 درگاه HTTP سامانه TSMS (با TSMS_URL می‌توان به سرور جعلی محلی اشاره کرد).
+    یک Session مشترک با استخر اتصال؛ نخ‌های ورکر اتصال‌ها را دوباره استفاده می‌کنند.
+    """
+
+    def __init__(self, url=None, timeout=None):
+        self.url = url or TSMS_URL
+        self.timeout = timeout or (TSMS_CONNECT_TIMEOUT, TSMS_READ_TIMEOUT)
+        self.session = requests.Session()
+        # ⚠️ بدون retry داخلی: تلاش مجدد با خط پشتیبان و صف ارسال انجام می‌شود
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=TSMS_POOL_SIZE, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def send(self, sender, phone, message):
+        params = {
+            'from': sender, 'to': phone, 'message': message,
+            'username': settings.TSMS_USERNAME, 'password': settings.TSMS_PASSWORD,
+        }
+        try:
+            response = self.session.get(self.url, params=params, timeout=self.timeout)
+        except requests.RequestException as exc:
+            raise SmsError(str(exc)) from exc
+        if response.text.strip() != "1":
+            raise SmsError(f"TSMS response: {response.text.strip()[:200]}")
+
+
+class LocmemTransport(BaseTransport):
+    """🧪 برای تست‌ها: پیام‌ها در LocmemTransport.outbox جمع می‌شوند"""
+
+    outbox = []
+    failing_senders = set()  # خط‌هایی که باید شکست بخورند
+
+    def send(self, sender, phone, message):
+        if sender in self.failing_senders:
+            raise SmsError(f"{sender} is down")
+        self.outbox.append({'sender': sender, 'phone': phone, 'message': message})
+
+
+def senders():
+    """📶 خط اصلی و سپس خط پشتیبان (بدون تکرار)"""
+    lines = [settings.TSMS_SENDER_PRIMARY, settings.TSMS_SENDER_FALLBACK]
+    return [line for index, line in enumerate(lines) if line and line not in lines[:index]]
+
+
+# --------------------------------------------------
+# ⚡ قطع‌کن مدار و آمار هر خط
+# --------------------------------------------------
+
+BREAKER_KEY = 'sms:breaker:{}:{}'
+STATS_KEY = 'sms:stats:{}:{}'
+STAT_NAMES = ('sent', 'failed', 'skipped', 'latency_ms')
+
+
+class CircuitBreaker:
+    """
+    ⚡ وضعیت در کش مشترک نگه داشته می‌شود تا همه پروسه‌ها (وب و ورکرها) یک خط خراب را
+    با هم کنار بگذارند:
+    - بسته: بعد از BREAKER_FAILURES خطای پیاپی باز می‌شود.
+    - باز: تا BREAKER_COOLDOWN ثانیه هیچ درخواستی به این خط نمی‌رود.
+    - نیمه‌باز: بعد از آن فقط یک درخواست آزمایشی می‌رود؛ یک خطا مدار را دوباره باز می‌کند.
+    """
+
+    def __init__(self, sender):
+        self.sender = sender
+
+    def _key(self, name):
+        return BREAKER_KEY.format(self.sender, name)
+
+    def state(self):
+        found = cache.get_many([self._key('open'), self._key('tripped')])
+        if self._key('open') in found:
+            return 'open'
+        return 'half-open' if self._key('tripped') in found else 'closed'
+
+    def allow(self):
+        state = self.state()
+        if state == 'open':
+            return False
+        if state == 'half-open':
+            # فقط یک درخواست آزمایشی هم‌زمان
+            return cache.add(self._key('probe'), 1, timeout=TSMS_CONNECT_TIMEOUT + TSMS_READ_TIMEOUT)
+        return True
+
+    def record_success(self):
+        cache.delete_many([self._key('failures'), self._key('tripped'), self._key('probe')])
+
+    def record_failure(self):
+        if cache.get(self._key('tripped')) is not None:
+            failures = BREAKER_FAILURES  # آزمایش نیمه‌باز شکست خورد
+        else:
+            try:
+                failures = cache.incr(self._key('failures'))
+            except ValueError:
+                cache.add(self._key('failures'), 1, timeout=BREAKER_COOLDOWN * 4)
+                failures = 1
+        if failures >= BREAKER_FAILURES:
+            cache.set(self._key('open'), 1, timeout=BREAKER_COOLDOWN)
+            cache.set(self._key('tripped'), 1, timeout=BREAKER_COOLDOWN * 4)
+            cache.delete_many([self._key('failures'), self._key('probe')])
+            logger.warning("⚡ مدار خط %s باز شد (%s ثانیه)", self.sender, BREAKER_COOLDOWN)
+
+
+class SmsGateway:
+    """🚪 ارسال با جایگزینی خط‌ها، قطع‌کن مدار و ثبت آمار (نمونه مشترک: get_gateway)"""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self._guard = threading.Lock()
+        self._local = {}      # sender -> شمارنده‌های این پروسه
+        self._latencies = {}  # sender -> آخرین زمان‌های پاسخ (میلی‌ثانیه)
+
+    def _record(self, sender, name, latency_ms=None):
+        with self._guard:
+            stats = self._local.setdefault(sender, dict.fromkeys(STAT_NAMES, 0))
+            stats[name] += 1
+            if latency_ms is not None:
+                stats['latency_ms'] += latency_ms
+                self._latencies.setdefault(sender, deque(maxlen=500)).append(latency_ms)
+        for key, amount in ((name, 1), ('latency_ms', latency_ms or 0)):
+            if not amount:
+                continue
+            try:
+                cache.incr(STATS_KEY.format(sender, key), amount)
+            except ValueError:
+                cache.add(STATS_KEY.format(sender, key), amount, timeout=None)
+
+    def send(self, phone, message):
+        """
+        🚀 ارسال (blocking): خط‌هایی که مدارشان باز است بدون انتظار رد می‌شوند.
+        خروجی: (خط موفق یا None، آخرین خطا)
+        """
+        with timed('sms'):  # ⏱️ بخش sms در Server-Timing وقتی ارسال داخل درخواست باشد
+            return self._send(phone, message)
+
+    def _send(self, phone, message):
+        error = ''
+        for sender in senders():
+            breaker = CircuitBreaker(sender)
+            if not breaker.allow():
+                self._record(sender, 'skipped')
+                error = f"{sender}: circuit open"
+                continue
+            started = time.monotonic()
+            try:
+                self.transport.send(sender, phone, message)
+            except SmsError as exc:
+                self._record(sender, 'failed', round((time.monotonic() - started) * 1000))
+                breaker.record_failure()
+                error = f"{sender}: {exc}"
+                logger.warning("❌ ارسال پیامک از خط %s ناموفق بود: %s", sender, exc)
+                continue
+            self._record(sender, 'sent', round((time.monotonic() - started) * 1000))
+            breaker.record_success()
+            return sender, ''
+        return None, error
+
+    def stats(self):
+        """📈 آمار هر خط: این پروسه (با p50/p99 تأخیر) و مجموع همه پروسه‌ها"""
+        result = {}
+        for sender in senders():
+            shared = cache.get_many([STATS_KEY.format(sender, name) for name in STAT_NAMES])
+            with self._guard:
+                local = dict(self._local.get(sender) or dict.fromkeys(STAT_NAMES, 0))
+                latencies = sorted(self._latencies.get(sender, ()))
+            if latencies:
+                local['p50_ms'] = latencies[len(latencies) // 2]
+                local['p99_ms'] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            result[sender] = {
+                'circuit': CircuitBreaker(sender).state(),
+                'process': local,
+                'shared': {name: shared.get(STATS_KEY.format(sender, name), 0) for name in STAT_NAMES},
+            }
+        return result
+
+
+@lru_cache(maxsize=None)
+def _load_gateway(path):
+    return SmsGateway(import_string(path)())
+
+
+def get_gateway():
+    """🔌 درگاه مشترک با ترنسپورت SMS_TRANSPORT (در هر پروسه یک نمونه و یک استخر اتصال)"""
+    return _load_gateway(getattr(settings, 'SMS_TRANSPORT', 'accounts.sms.TsmsTransport'))
+
+
+def deliver(phone, message, gateway=None):
+    """🚀 ارسال فوری از طریق درگاه مشترک؛ خروجی: (خط موفق یا None، آخرین خطا)"""
+    return (gateway or get_gateway()).send(phone, message)
+
+
+def otp_message(code):
+    return f"کد ورود شما: {code}"
+
+
+# --------------------------------------------------
+# 📤 صف ارسال
+# --------------------------------------------------
+
+def enqueue(phone, message, ttl=None):
+    """✅ ثبت پیام در صف (در همان تراکنش درخواست)"""
+    now = timezone.now()
+    return SmsOutbox.objects.create(
+        phone=phone, message=message, next_attempt_at=now,
+        expires_at=now + ttl if ttl else None,
+    )
+
+
+def enqueue_otp(phone, code):
+    return enqueue(phone, otp_message(code), ttl=OTP_TTL)
+
+
+def backoff(attempts):
+    """⏳ فاصله تا تلاش بعدی: نمایی با سقف و کمی jitter"""
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim(batch_size):
+    """
+    📥 برداشت پیام‌های آماده. هر ردیف با یک UPDATE شرطی برداشته می‌شود،
+    پس چند ورکر هم‌زمان یک پیام را دو بار ارسال نمی‌کنند؛ پیام ورکرِ از کار افتاده
+    بعد از LEASE_SECONDS دوباره قابل برداشت است.
+    """
+    now = timezone.now()
+    due = (
+        SmsOutbox.objects.filter(status__in=('pending', 'sending'), next_attempt_at__lte=now)
+        .order_by('next_attempt_at')
+        .values_list('pk', 'status', 'next_attempt_at')[:batch_size]
+    )
+    lease = now + timedelta(seconds=LEASE_SECONDS)
+    claimed = [
+        pk for pk, status, next_attempt_at in due
+        if SmsOutbox.objects.filter(pk=pk, status=status, next_attempt_at=next_attempt_at)
+        .update(status='sending', next_attempt_at=lease)
+    ]
+    return list(SmsOutbox.objects.filter(pk__in=claimed))
+
+
+def record_result(message, sender, error):
+    """📝 ثبت نتیجه یک تلاش (موفق، تلاش مجدد با backoff یا شکست نهایی)"""
+    now = timezone.now()
+    message.attempts += 1
+    if sender:
+        message.status, message.sender, message.sent_at, message.last_error = 'sent', sender, now, ''
+    elif message.attempts >= MAX_ATTEMPTS:
+        message.status, message.last_error = 'failed', error
+    else:
+        message.status, message.last_error = 'pending', error
+        message.next_attempt_at = now + backoff(message.attempts)
+    message.save(update_fields=['status', 'attempts', 'sender', 'sent_at', 'last_error', 'next_attempt_at'])
+
+
+def drain(batch_size=20, concurrency=4, gateway=None):
+    """
+    🔁 یک دور ارسال: برداشت یک دسته و ارسال هم‌روند (فقط فراخوانی شبکه در نخ‌ها؛
+    نوشتن در دیتابیس در نخ اصلی). تعداد پیام‌های پردازش‌شده برگردانده می‌شود.
+    """
+    gateway = gateway or get_gateway()
+    messages = claim(batch_size)
+    if not messages:
+        return 0
+
+    now = timezone.now()
+    live = []
+    for message in messages:
+        if message.expires_at and message.expires_at <= now:
+            message.status = 'expired'
+            message.save(update_fields=['status'])
+        else:
+            live.append(message)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = executor.map(lambda message: gateway.send(message.phone, message.message), live)
+        for message, (sender, error) in zip(live, results):
+            record_result(message, sender, error)
+    return len(messages)
+
+
+def pending_count():
+    return SmsOutbox.objects.filter(status__in=('pending', 'sending')).count()
@@ -1,3 +1,218 @@
-from django.test import TestCase
+import threading
+from io import StringIO
+from datetime import timedelta
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from django.core.management import call_command
+
+from .authentication import user_states
+from .models import OTP, CustomUser, SmsOutbox
+from .otp import MAX_ATTEMPTS, OtpError, issue, verify
+from .sms import BREAKER_FAILURES, LocmemTransport, SmsError, SmsGateway, TsmsTransport, drain
+
+
+# 📨 ارسال کد از طریق صف پیامک با ترنسپورت حافظه‌ای
+@override_settings(
+    SMS_TRANSPORT='accounts.sms.LocmemTransport',
+    TSMS_SENDER_PRIMARY='3000',
+    TSMS_SENDER_FALLBACK='4000',
+)
+class SmsOutboxTests(TestCase):
+    def setUp(self):
+        cache.clear()  # وضعیت قطع‌کن مدار و آمار در کش است
+        LocmemTransport.outbox.clear()
+        LocmemTransport.failing_senders.clear()
+
+    def send_code(self, phone='09120000000'):
+        response = APIClient().post(reverse('send-code'), {'phone': phone}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_send_code_only_enqueues(self):
+        self.send_code()
+        self.assertEqual(LocmemTransport.outbox, [])
+        message = SmsOutbox.objects.get()
+        self.assertEqual(message.status, 'pending')
+        self.assertIn(OTP.objects.get().code, message.message)
+
+    def test_drain_falls_back_to_second_line(self):
+        LocmemTransport.failing_senders.add('3000')
+        self.send_code()
+        self.assertEqual(drain(), 1)
+        message = SmsOutbox.objects.get()
+        self.assertEqual((message.status, message.sender), ('sent', '4000'))
+        self.assertEqual([sms['sender'] for sms in LocmemTransport.outbox], ['4000'])
+
+    def test_failed_send_is_retried_with_backoff(self):
+        LocmemTransport.failing_senders.update({'3000', '4000'})
+        self.send_code()
+        drain()
+        message = SmsOutbox.objects.get()
+        self.assertEqual((message.status, message.attempts), ('pending', 1))
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertEqual(drain(), 0)  # هنوز زمان تلاش بعدی نرسیده
+
+    def test_expired_code_is_not_sent(self):
+        self.send_code()
+        SmsOutbox.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        drain()
+        self.assertEqual(SmsOutbox.objects.get().status, 'expired')
+        self.assertEqual(LocmemTransport.outbox, [])
+
+    def test_open_circuit_skips_primary_line(self):
+        LocmemTransport.failing_senders.add('3000')
+        gateway = SmsGateway(LocmemTransport())
+        for _ in range(BREAKER_FAILURES + 1):
+            self.assertEqual(gateway.send('09120000000', 'x')[0], '4000')
+        stats = gateway.stats()['3000']
+        self.assertEqual(stats['circuit'], 'open')
+        self.assertEqual((stats['process']['failed'], stats['process']['skipped']), (BREAKER_FAILURES, 1))
+
+
+# 🌐 ترنسپورت TSMS در برابر یک سرور جعلی محلی
+class FakeTsmsHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        self.requests.append(params)
+        body = b"1" if params['from'] == ['3000'] else b"-1"
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TsmsTransportTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeTsmsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        FakeTsmsHandler.requests.clear()
+
+    def test_send_and_reject(self):
+        transport = TsmsTransport(url=f'http://127.0.0.1:{self.server.server_port}/')
+        transport.send('3000', '09120000000', 'کد ورود شما: 12345')
+        with self.assertRaises(SmsError):
+            transport.send('4000', '09120000000', 'x')
+        self.assertEqual(FakeTsmsHandler.requests[0]['message'], ['کد ورود شما: 12345'])
+
+
+# 🔐 ذخیره و بررسی کد تأیید در هر دو نوع store
+class OtpStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def check_store(self):
+        issue('09120000000')
+        code = issue('09120000000')  # ارسال دوباره کد قبلی را بازنویسی می‌کند
+        with self.assertRaisesMessage(OtpError, "کد وارد شده اشتباه است."):
+            verify('09120000000', '00000')
+        verify('09120000000', code)
+        with self.assertRaisesMessage(OtpError, "کدی برای این شماره ثبت نشده است."):
+            verify('09120000000', code)  # یک‌بار مصرف
+
+    def test_database_store(self):
+        self.check_store()
+        issue('09120000001')
+        self.assertEqual(OTP.objects.filter(phone='09120000001').count(), 1)
+
+    @override_settings(OTP_STORE='cache')
+    def test_cache_store(self):
+        with mock.patch('accounts.otp.is_shared_cache', return_value=True):
+            self.check_store()
+            self.check_attempts()
+        self.assertFalse(OTP.objects.exists())
+
+    @override_settings(OTP_STORE='cache')
+    def test_cache_store_needs_shared_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            issue('09120000000')
+
+    @override_settings(OTP_STORE='cache')
+    def test_cache_store_parallel_guesses_are_counted(self):
+        with mock.patch('accounts.otp.is_shared_cache', return_value=True):
+            code = issue('09120000000')
+            start = threading.Barrier(MAX_ATTEMPTS * 2)
+
+            def guess():
+                start.wait()
+                try:
+                    verify('09120000000', '00000')
+                except OtpError:
+                    pass
+
+            threads = [threading.Thread(target=guess) for _ in range(MAX_ATTEMPTS * 2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(cache.get('otp:attempts:09120000000'), MAX_ATTEMPTS * 2)
+            with self.assertRaisesMessage(OtpError, "تعداد تلاش‌ها به پایان رسیده است."):
+                verify('09120000000', code)
+
+    def check_attempts(self):
+        code = issue('09120000000')
+        for _ in range(MAX_ATTEMPTS):
+            with self.assertRaises(OtpError):
+                verify('09120000000', '00000')
+        with self.assertRaisesMessage(OtpError, "تعداد تلاش‌ها به پایان رسیده است."):
+            verify('09120000000', code)
+
+    def test_attempts_are_limited(self):
+        self.check_attempts()
+
+    def test_prune_deletes_expired_codes(self):
+        issue('09120000000')
+        issue('09120000001')
+        OTP.objects.filter(phone='09120000000').update(created_at=timezone.now() - timedelta(minutes=3))
+        call_command('prune_otps', batch_size=1, stdout=StringIO())
+        self.assertEqual(list(OTP.objects.values_list('phone', flat=True)), ['09120000001'])
+
+
+# 🎫 احراز هویت JWT با وضعیت کش‌شده کاربر
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create(mobile='09120000000', role='admin')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.addCleanup(user_states.invalidate, self.user.pk)  # ردیف با برگشت تراکنش تست حذف می‌شود
+
+    def test_no_user_query_after_first_request(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('admin-cache-stats'))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('admin-cache-stats')).status_code, 200)
+
+    def test_user_changes_invalidate_cached_state(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('admin-cache-stats'))
+            self.user.role = 'user'
+            self.user.save()  # وضعیت خوانده‌شده قبل از تغییر بعد از commit هم کش نمی‌ماند
+        self.assertEqual(self.client.get(reverse('admin-cache-stats')).status_code, 403)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('admin-cache-stats')).status_code, 401)
+
+    def test_state_read_in_rolled_back_transaction_is_not_cached(self):
+        with transaction.atomic():
+            user = CustomUser.objects.create(mobile='09120000001')
+            self.assertIsNotNone(user_states.get(user.pk))
+            transaction.set_rollback(True)
+        # شناسه‌ای که بعداً دوباره به کاربر دیگری (مثلاً با bulk_create) داده شود
+        CustomUser.objects.bulk_create([CustomUser(pk=user.pk, mobile='09120000002', is_active=False)])
+        self.assertFalse(user_states.get(user.pk)['is_active'])
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import SendCodeView, VerifyCodeView
+from .views import SendCodeView, VerifyCodeView, SmsStatsView
 
 urlpatterns = [
     path('send-code/', SendCodeView.as_view(), name='send-code'),
     path('verify-code/', VerifyCodeView.as_view(), name='verify-code'),
+    path('sms-stats/', SmsStatsView.as_view(), name='sms-stats'),
 ]
\ No newline at end of file
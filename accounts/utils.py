@@ -1,29 +1,8 @@
 # accounts/utils.py
-import requests
-from urllib.parse import quote
-from django.conf import settings
+from .sms import deliver, otp_message
 
-def send_otp_sms(phone, code):
-    username = settings.TSMS_USERNAME
-    password = settings.TSMS_PASSWORD
-    senders = [settings.TSMS_SENDER_PRIMARY, settings.TSMS_SENDER_FALLBACK]
-
-    message = f"کد ورود شما: {code}"
-    encoded_message = quote(message)
-
-    for sender in senders:
-        url = (
-            f"http://tsms.ir/url/tsmshttp.php?"
-            f"from={sender}&to={phone}&username={username}&password={password}"
-            f"&message={encoded_message}"
-        )
-        try:
-            response = requests.get(url, timeout=10)
-            print(f"📨 پاسخ TSMS از {sender}:", response.text)
-            if response.text.strip() == "1":
-                return True  # ارسال موفق
-        except requests.RequestException as e:
-            print(f"❌ خطا در خط {sender}:", str(e))
-
-    return False  # ارسال از هیچ‌کدام موفق نبود
 
+def send_otp_sms(phone, code):
+    """🚀 ارسال فوری (blocking) کد؛ مسیر ورود از صف ارسال استفاده می‌کند (accounts/sms.py)"""
+    sender, _error = deliver(phone, otp_message(code))
+    return sender is not None  # ارسال از یکی از خط‌ها موفق بود؟
@@ -6,7 +6,12 @@ from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from rest_framework.decorators import api_view
 from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from tools.permissions import IsAdminUserRole
+from core.query_budget import query_budget
+from .sms import get_gateway, pending_count
 
+@query_budget(POST=4)
 class SendCodeView(APIView):
     def post(self, request):
         serializer = SendCodeSerializer(data=request.data)
@@ -17,6 +22,7 @@ class SendCodeView(APIView):
 
 
 
+@query_budget(POST=6)
 class VerifyCodeView(APIView):
     def post(self, request):
         serializer = VerifyCodeSerializer(data=request.data)
@@ -25,3 +31,10 @@ class VerifyCodeView(APIView):
         return Response(serializer.errors, status=400)
 
 
+# 📈 وضعیت خط‌های پیامک (مدار، تعداد ارسال/خطا، تأخیر) و طول صف ارسال — فقط مدیر
+@query_budget(GET=2)
+class SmsStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUserRole]
+
+    def get(self, request):
+        return Response({"senders": get_gateway().stats(), "pending": pending_count()})
@@ -10,10 +10,16 @@ class Post(models.Model):
     excerpt = models.TextField(verbose_name='خلاصه')
     content = models.TextField(verbose_name='محتوای کامل')
     image = models.ImageField(upload_to='blog_images/', blank=True, null=True, verbose_name='تصویر شاخص')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)  # 🖼️ نسخه‌های تغییر اندازه‌یافته (core/images.py)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts', verbose_name='نویسنده')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='تاریخ بروزرسانی')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='post_created_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
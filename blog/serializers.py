@@ -1,8 +1,12 @@
 from rest_framework import serializers
+
+from core.images import srcset
+from core.profiling import ProfiledSerializerMixin
 from .models import Post
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     author_username = serializers.ReadOnlyField(source='author.username')
+    image_srcset = serializers.SerializerMethodField()  # 🖼️ نسخه‌های WebP/JPEG با ابعاد
 
     class Meta:
         model = Post
@@ -13,7 +17,11 @@ class PostSerializer(serializers.ModelSerializer):
             'excerpt',
             'content',
             'image',
+            'image_srcset',
             'author_username',
             'created_at',
             'updated_at',
         ]
+
+    def get_image_srcset(self, obj):
+        return srcset(obj.image_variants, self.context.get('request'))
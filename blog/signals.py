@@ -0,0 +1,24 @@
+# blog/signals.py
+# --------------------------------------------------
+# 📡 بی‌اعتبارسازی کش مقالات بعد از هر تغییر
+# --------------------------------------------------
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core import images
+from core.cache import bump_namespace
+from .models import Post
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_blog_cache(sender, **kwargs):
+    transaction.on_commit(lambda: bump_namespace('blog'))
+
+
+# 🖼️ نسخه‌های تغییر اندازه‌یافته تصویر مقاله
+@receiver(post_save, sender=Post)
+def process_post_image(sender, instance, raw=False, **kwargs):
+    if not raw:
+        images.schedule(instance)
@@ -1,3 +1,24 @@
-from django.test import TestCase
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import CustomUser
+from .models import Post
+
+
+# 🏷️ درخواست شرطی لیست پست‌ها
+@override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+class PostListConditionalTests(TestCase):
+    def setUp(self):
+        self.author = CustomUser.objects.create_user('09120000000')
+        self.post = Post.objects.create(title='اول', slug='first', excerpt='e', content='c', author=self.author)
+
+    def test_etag_and_last_modified(self):
+        url = reverse('post-list')
+        first = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, 304)
+
+        self.post.title = 'اول (ویرایش)'
+        self.post.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
@@ -1,16 +1,35 @@
+from django.db.models import Count, Max
 from rest_framework import generics, permissions
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.query_budget import query_budget
 from .models import Post
 from .serializers import PostSerializer
 
-class PostListCreateAPIView(generics.ListCreateAPIView):
-    queryset = Post.objects.all().order_by('-created_at')
+@query_budget(GET=2, POST=3)
+class PostListCreateAPIView(ConditionalGetMixin, CachedResponseMixin, generics.ListCreateAPIView):
+    cache_namespaces = ('blog',)  # 📦 کش GET ناشناس
+    queryset = Post.objects.select_related('author').order_by('-created_at')
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-class PostDetailAPIView(generics.RetrieveAPIView):
-    queryset = Post.objects.all()
+    def get_conditional_validators(self, request, *args, **kwargs):
+        # 🏷️ ETag از آخرین ویرایش و تعداد پست‌ها (حذف پست هم دیده می‌شود)
+        state = Post.objects.aggregate(last=Max('updated_at'), count=Count('id'))
+        return (state['last'], state['count']), state['last']
+
+@query_budget(GET=2)
+class PostDetailAPIView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_namespaces = ('blog',)
+    queryset = Post.objects.select_related('author')
     serializer_class = PostSerializer
     lookup_field = 'slug'
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        updated_at = Post.objects.filter(slug=kwargs['slug']).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None
+        return updated_at, updated_at
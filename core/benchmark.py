@@ -0,0 +1,208 @@
+# core/benchmark.py
+# --------------------------------------------------
+# ⏱️ بنچمارک تأخیر endpointهای اصلی با کلاینت تست جنگو (درون پروسه، بدون شبکه)
+# --------------------------------------------------
+# برای هر سناریو: چند درخواست گرم‌کننده، سپس N درخواست زمان‌گیری‌شده
+# (p50/p95/p99 بر حسب میلی‌ثانیه)، یک درخواست جدا برای شمارش کوئری‌ها و
+# یک درخواست جدا با tracemalloc برای اوج حافظه تخصیص‌یافته؛ تا ابزارهای
+# اندازه‌گیری روی زمان‌ها اثر نگذارند.
+# نتیجه با baseline ذخیره‌شده (JSON) مقایسه می‌شود؛ افزایش کوئری‌ها یا
+# زمان/حافظه بیش از آستانه، پسرفت حساب می‌شود.
+
+import json
+import math
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+BENCHMARK_BASELINES = getattr(settings, 'BENCHMARK_BASELINES', settings.BASE_DIR / 'benchmarks' / 'baselines.json')
+BENCHMARK_THRESHOLD = getattr(settings, 'BENCHMARK_THRESHOLD', 0.25)  # ۲۵٪ کندتر = پسرفت
+
+# معیارهایی که با آستانه نسبی مقایسه می‌شوند (p99 برای نویز زیاد فقط گزارش می‌شود)
+RELATIVE_METRICS = ('p50_ms', 'p95_ms', 'peak_kib')
+# زیر این مقدارها اختلاف نسبی معنی ندارد (نویز زمان‌سنج و تخصیص‌های کوچک)
+ABSOLUTE_SLACK = {'p50_ms': 1.0, 'p95_ms': 2.0, 'peak_kib': 64.0}
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[dict], str]
+    data: Callable[[dict], dict] = None
+    authenticated: bool = False
+    # قبل از هر درخواست و بیرون از زمان‌گیری؛ تا همه درخواست‌ها از یک وضعیت شروع کنند
+    setup: Callable[[dict], None] = None
+
+
+SCENARIOS = [
+    Scenario('tools-list', 'get', lambda ctx: '/api/tools/'),
+    Scenario('tool-detail', 'get', lambda ctx: f"/api/tools/{ctx['tool_id']}/"),
+    Scenario('reviews-by-tool', 'get', lambda ctx: f"/api/reviews/?tool={ctx['tool_id']}"),
+    Scenario('top-rated', 'get', lambda ctx: '/api/tools/top/'),
+    Scenario('compare', 'get', lambda ctx: f"/api/tools/compare/?ids={ctx['compare_ids']}"),
+    # toggle یک در میان می‌سازد و حذف می‌کند؛ هر مسیر سناریوی جدا با وضعیت اولیه ثابت دارد
+    Scenario(
+        'reaction-create', 'post', lambda ctx: f"/api/reviews/{ctx['review_id']}/toggle-reaction/",
+        data=lambda ctx: {'type': 'like'}, authenticated=True, setup=lambda ctx: set_reaction(ctx, None),
+    ),
+    Scenario(
+        'reaction-delete', 'post', lambda ctx: f"/api/reviews/{ctx['review_id']}/toggle-reaction/",
+        data=lambda ctx: {'type': 'like'}, authenticated=True, setup=lambda ctx: set_reaction(ctx, 'like'),
+    ),
+]
+
+
+def set_reaction(context, reaction_type):
+    """🔁 ری‌اکشن کاربر بنچمارک روی نظر هدف: حذف (None) یا ثبت با نوع داده‌شده"""
+    from tools.models import ReviewReaction
+
+    reactions = ReviewReaction.objects.filter(user_id=context['user_id'], review_id=context['review_id'])
+    if reaction_type is None:
+        for reaction in reactions:
+            reaction.delete()  # با سیگنال‌ها، تا شمارنده‌های نظر درست بمانند
+        return
+    reaction = reactions.first()
+    if reaction is None:
+        ReviewReaction.objects.create(user_id=context['user_id'], review_id=context['review_id'], type=reaction_type)
+    elif reaction.type != reaction_type:
+        reaction.type = reaction_type
+        reaction.save()
+
+
+def build_context():
+    """🎯 شناسه‌های بدترین حالت: ابزار با بیشترین نظر، نظر با بیشترین ری‌اکشن و ..."""
+    from accounts.models import CustomUser
+    from tools.models import Tool, ToolReview
+
+    tools = list(Tool.objects.order_by('-rating_count', 'pk').values_list('pk', flat=True)[:3])
+    review = (
+        ToolReview.objects.annotate(reactions_total=Count('reactions'))
+        .order_by('-reactions_total', 'pk').values_list('pk', flat=True).first()
+    )
+    user = CustomUser.objects.filter(is_active=True).order_by('pk').first()
+    if not tools or review is None or user is None:
+        raise ValueError("برای بنچمارک دست‌کم یک ابزار، یک نظر و یک کاربر لازم است.")
+    return {
+        'tool_id': tools[0],
+        'compare_ids': ','.join(map(str, tools)),
+        'review_id': review,
+        'user_id': user.pk,
+        'token': str(RefreshToken.for_user(user).access_token),
+    }
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(scenario, context, iterations=30, warmup=3):
+    client = APIClient()
+    if scenario.authenticated:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {context['token']}")
+    path = scenario.path(context)
+    data = scenario.data(context) if scenario.data else None
+
+    def prepare():
+        if scenario.setup:
+            scenario.setup(context)
+
+    def call():
+        response = getattr(client, scenario.method)(path, data, format='json') if data is not None \
+            else getattr(client, scenario.method)(path)
+        if response.status_code >= 400:
+            raise AssertionError(f"{scenario.name}: {response.status_code} {getattr(response, 'data', '')}")
+        return response
+
+    for _ in range(warmup):
+        prepare()
+        call()
+
+    timings = []
+    for _ in range(iterations):
+        prepare()
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    prepare()
+    with CaptureQueriesContext(connection) as queries:
+        call()
+    query_count = len(queries)  # قبل از درخواست بعدی که queries_log را پاک می‌کند
+
+    prepare()
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentile(timings, 0.50), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'p99_ms': round(percentile(timings, 0.99), 2),
+        'queries': query_count,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_suite(iterations=30, warmup=3, scenarios=SCENARIOS):
+    """🏃 همه سناریوها روی پایگاه داده فعلی (کش پاسخ خاموش تا مسیر واقعی اندازه‌گیری شود)"""
+    context = build_context()
+    with override_settings(RESPONSE_CACHE={**getattr(settings, 'RESPONSE_CACHE', {}), 'ENABLED': False}):
+        return {scenario.name: measure(scenario, context, iterations, warmup) for scenario in scenarios}
+
+
+def compare(results, baseline, threshold=BENCHMARK_THRESHOLD):
+    """
+    🔍 مقایسه نتایج {size: {endpoint: metrics}} با baseline.
+    خروجی: فهرست پیام‌های پسرفت (خالی یعنی قبول).
+    """
+    regressions = []
+    for size, endpoints in results.items():
+        for name, metrics in endpoints.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                continue
+            if metrics['queries'] > previous['queries']:
+                regressions.append(f"{size}/{name}: queries {previous['queries']} → {metrics['queries']}")
+            for metric in RELATIVE_METRICS:
+                limit = max(previous[metric] * (1 + threshold), previous[metric] + ABSOLUTE_SLACK[metric])
+                if metrics[metric] > limit:
+                    regressions.append(f"{size}/{name}: {metric} {previous[metric]} → {metrics[metric]}")
+    return regressions
+
+
+def load_baselines(path=BENCHMARK_BASELINES):
+    try:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle).get('results', {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(results, path=BENCHMARK_BASELINES):
+    """💾 ذخیره baseline (اندازه‌هایی که اجرا نشده‌اند دست‌نخورده می‌مانند)"""
+    merged = {**load_baselines(path), **results}
+    payload = {
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(), 'db': connection.vendor},
+        'results': merged,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+        handle.write('\n')
@@ -0,0 +1,260 @@
+# core/cache.py
+# --------------------------------------------------
+# 🗃️ نسخه‌بندی فضای نام کش (namespace versioning)
+# --------------------------------------------------
+# هر دسته از داده‌ها (مثلاً tools یا blog) یک شمارنده نسخه در کش دارد.
+# کلیدهای کش نسخه‌های فعلی را در خود دارند؛ با هر نوشتن، سیگنال‌ها
+# نسخه را یکی بالا می‌برند و همه ورودی‌های قدیمی خودبه‌خود بی‌اعتبار می‌شوند.
+
+import hashlib
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+VERSION_KEY = 'nsver:{}'
+
+# کش‌هایی که بین پروسه‌ها مشترک نیستند
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def is_shared_cache():
+    """🌐 آیا بالا رفتن نسخه در یک پروسه به پروسه‌های دیگر هم می‌رسد؟"""
+    return not isinstance(caches['default'], PROCESS_LOCAL_CACHES)
+
+
+def _initial_version():
+    # ⏱️ مقدار شروع بر اساس زمان، تا اگر کلید نسخه از کش بیرون رفت با نسخه‌های قدیمی تداخل نکند
+    return int(time.time() * 1000)
+
+
+def namespace_version(namespace):
+    """🔢 نسخه فعلی یک فضای نام"""
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def namespace_versions(namespaces):
+    """🔢 نسخه چند فضای نام با یک رفت‌وبرگشت به کش"""
+    keys = {VERSION_KEY.format(ns): ns for ns in namespaces}
+    found = cache.get_many(list(keys))
+    return {ns: found.get(key) or namespace_version(ns) for key, ns in keys.items()}
+
+
+def bump_namespace(*namespaces):
+    """⬆️ بی‌اعتبار کردن همه کلیدهای یک یا چند فضای نام؛ نسخه‌های جدید برگردانده می‌شوند"""
+    versions = {}
+    for namespace in namespaces:
+        key = VERSION_KEY.format(namespace)
+        try:
+            versions[namespace] = cache.incr(key)
+        except ValueError:
+            # کلید هنوز ساخته نشده (یا از کش بیرون رفته)
+            cache.add(key, _initial_version(), timeout=None)
+            versions[namespace] = cache.get(key)
+    return versions
+
+
+def versioned_key(prefix, namespaces, *parts):
+    """🔑 کلید کش شامل نسخه فضاهای نام و هش بخش‌های متغیر (مسیر، پارامترها، ...)"""
+    versions = namespace_versions(namespaces)
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    stamp = '.'.join(f'{ns}{versions[ns]}' for ns in sorted(versions))
+    return f'{prefix}:{stamp}:{digest}'
+
+
+# --------------------------------------------------
+# 📦 کش پاسخ درخواست‌های GET ناشناس
+# --------------------------------------------------
+# - کلید: مسیر + پارامترهای مرتب‌شده + نسخه فضاهای نام وابسته
+# - هر ورودی تا fresh_until تازه است و بعد از آن تا پایان TTL «کهنه»؛
+#   در حالت کهنه فقط یک درخواست (دارنده قفل) پاسخ را از نو می‌سازد و بقیه
+#   همان پاسخ کهنه را می‌گیرند (stale-while-revalidate).
+# - در نبود ورودی، هر کلید فقط یک بار همزمان ساخته می‌شود (single flight):
+#   قفل thread در همین پروسه و cache.add برای پروسه‌های دیگر.
+# - حذف LRU را خود backend کش انجام می‌دهد (locmem با MAX_ENTRIES، یا
+#   سیاست allkeys-lru در Redis).
+
+RESPONSE_CACHE = getattr(settings, 'RESPONSE_CACHE', {})
+DEFAULT_FRESH_TIMEOUT = RESPONSE_CACHE.get('TIMEOUT', 60)
+DEFAULT_STALE_TIMEOUT = RESPONSE_CACHE.get('STALE_TIMEOUT', 300)
+LOCK_TIMEOUT = RESPONSE_CACHE.get('LOCK_TIMEOUT', 10)
+LOCK_WAIT = RESPONSE_CACHE.get('LOCK_WAIT', 2.0)
+
+# هدرهایی که همراه بدنه کش می‌شوند
+CACHED_HEADERS = ('Content-Type', 'Vary', 'ETag', 'Last-Modified')
+
+STATS_KEY = 'respcache:stats:{}'
+STAT_NAMES = ('hit', 'stale', 'miss', 'wait')
+
+
+class ResponseCache:
+    def __init__(self):
+        self._locks = weakref.WeakValueDictionary()
+        self._locks_guard = threading.Lock()
+        self._local_stats = dict.fromkeys(STAT_NAMES, 0)
+        self._stats_guard = threading.Lock()
+
+    # ---------- آمار ----------
+
+    def _count(self, name):
+        with self._stats_guard:
+            self._local_stats[name] += 1
+        try:
+            cache.incr(STATS_KEY.format(name))
+        except ValueError:
+            cache.add(STATS_KEY.format(name), 1, timeout=None)
+
+    def stats(self):
+        """📈 شمارنده‌های این پروسه و مجموع همه پروسه‌ها (در کش مشترک)"""
+        shared = cache.get_many([STATS_KEY.format(name) for name in STAT_NAMES])
+        with self._stats_guard:
+            local = dict(self._local_stats)
+        return {
+            'process': local,
+            'shared': {name: shared.get(STATS_KEY.format(name), 0) for name in STAT_NAMES},
+        }
+
+    # ---------- قفل‌ها ----------
+
+    def _local_lock(self, key):
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _acquire_shared(self, key):
+        return cache.add(f'{key}:lock', 1, LOCK_TIMEOUT)
+
+    def _release_shared(self, key):
+        cache.delete(f'{key}:lock')
+
+    # ---------- خواندن / ساختن ----------
+
+    def _store(self, key, value, fresh, stale):
+        cache.set(key, {'value': value, 'fresh_until': time.time() + fresh}, fresh + stale)
+
+    def _rebuild(self, key, compute, fresh, stale, cacheable):
+        """🔨 ساختن مقدار و ذخیره آن (اگر cacheable اجازه دهد)؛ قفل مشترک در هر حال آزاد می‌شود"""
+        try:
+            value = compute()
+            if cacheable is None or cacheable(value):
+                self._store(key, value, fresh, stale)
+            return value
+        finally:
+            self._release_shared(key)
+
+    def fetch(self, key, compute, fresh=DEFAULT_FRESH_TIMEOUT, stale=DEFAULT_STALE_TIMEOUT, cacheable=None):
+        """
+        ✅ مقدار کش‌شده یا ساخته‌شده با compute().
+        cacheable(value) تعیین می‌کند نتیجه ذخیره شود یا نه (مثلاً فقط پاسخ‌های 200).
+        """
+        entry = cache.get(key)
+        if entry is not None:
+            if entry['fresh_until'] > time.time():
+                self._count('hit')
+                return entry['value']
+            # ♻️ کهنه: فقط یک نفر بازسازی می‌کند
+            if self._acquire_shared(key):
+                self._count('miss')
+                return self._rebuild(key, compute, fresh, stale, cacheable)
+            self._count('stale')
+            return entry['value']
+
+        with self._local_lock(key):
+            entry = cache.get(key)
+            if entry is not None:
+                self._count('hit')
+                return entry['value']
+
+            deadline = time.time() + LOCK_WAIT
+            while not self._acquire_shared(key):
+                # پروسه دیگری در حال ساخت همین کلید است
+                if time.time() > deadline:
+                    break
+                time.sleep(0.05)
+                entry = cache.get(key)
+                if entry is not None:
+                    self._count('wait')
+                    return entry['value']
+
+            self._count('miss')
+            return self._rebuild(key, compute, fresh, stale, cacheable)
+
+
+response_cache = ResponseCache()
+
+
+class CachedResponseMixin:
+    """
+    📦 کش پاسخ رندرشده GET برای درخواست‌های بدون احراز هویت (ویوهای DRF).
+    در حالت hit، احراز هویت، کوئری‌ها، سریالایز و رندر همه حذف می‌شوند.
+    cache_namespaces فضاهای نامی هستند که تغییرشان پاسخ را بی‌اعتبار می‌کند.
+    """
+    cache_namespaces = ()
+    cache_timeout = DEFAULT_FRESH_TIMEOUT
+    cache_stale_timeout = DEFAULT_STALE_TIMEOUT
+
+    def should_cache_response(self, request):
+        return (
+            getattr(settings, 'RESPONSE_CACHE', {}).get('ENABLED', True)
+            and bool(self.cache_namespaces)
+            and request.method == 'GET'
+            and 'HTTP_AUTHORIZATION' not in request.META
+        )
+
+    def response_cache_key(self, request):
+        params = tuple(sorted((key, tuple(request.GET.getlist(key))) for key in request.GET))
+        # میزبان هم در کلید است چون لینک‌های next/previous و آدرس تصاویر مطلق‌اند؛
+        # Accept هم، چون قالب خروجی (JSON یا صفحه مرورگر) به آن بستگی دارد
+        return versioned_key(
+            'resp', self.cache_namespaces,
+            request.get_host(), request.path, params, request.META.get('HTTP_ACCEPT', ''),
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.should_cache_response(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        def compute():
+            response = super(CachedResponseMixin, self).dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            headers = {name: response[name] for name in CACHED_HEADERS if response.has_header(name)}
+            return response.status_code, response.content, headers
+
+        status, content, headers = response_cache.fetch(
+            self.response_cache_key(request),
+            compute,
+            fresh=self.cache_timeout,
+            stale=self.cache_stale_timeout,
+            cacheable=lambda value: value[0] == 200,
+        )
+
+        # 🏷️ اگر پاسخ کش‌شده ETag/Last-Modified دارد، درخواست شرطی بدون بدنه جواب می‌گیرد
+        if status == 200 and 'ETag' in headers:
+            last_modified = headers.get('Last-Modified')
+            not_modified = get_conditional_response(
+                request,
+                etag=headers['ETag'],
+                last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+            )
+            if not_modified is not None:
+                return not_modified
+
+        response = HttpResponse(content, status=status)
+        for name, value in headers.items():
+            response[name] = value
+        return response
@@ -0,0 +1,52 @@
+# core/conditional.py
+# --------------------------------------------------
+# 🏷️ درخواست‌های شرطی (ETag / Last-Modified) برای ویوهای DRF
+# --------------------------------------------------
+# اعتبارسنج‌ها (validators) بدون سریالایز کردن بدنه و معمولاً با یک کوئری
+# کوچک محاسبه می‌شوند؛ اگر کلاینت نسخه فعلی را داشته باشد 304 برمی‌گردد.
+
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """🔑 ETag قوی از روی اجزای تعیین‌کننده پاسخ"""
+    return '"%s"' % hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+class ConditionalGetMixin:
+    """
+    ✅ ویو باید get_conditional_validators را پیاده کند و (اجزای وضعیت، datetime آخرین تغییر)
+    برگرداند؛ None یعنی شرطی نیست (مثلاً شیء پیدا نشد).
+    ETag علاوه بر وضعیت داده، به مسیر، پارامترها، Accept و توکن کاربر وابسته است
+    چون پاسخ (مثلاً my_reaction) برای هر کاربر فرق می‌کند.
+    """
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_conditional_validators(request, *args, **kwargs)
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        state, last_modified = validators
+        auth = request.META.get('HTTP_AUTHORIZATION', '')
+        etag = make_etag(
+            request.path, request.META.get('QUERY_STRING', ''), request.META.get('HTTP_ACCEPT', ''),
+            hashlib.sha1(auth.encode()).hexdigest() if auth else '', state,
+        )
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
@@ -0,0 +1,42 @@
+# core/db_router.py
+# --------------------------------------------------
+# 📖 مسیریابی خواندن به رپلیکا (در صورت تعریف DATABASES['replica'])
+# --------------------------------------------------
+# ReplicaRoutingMiddleware برای هر درخواست GET/HEAD مشخص می‌کند که آیا
+# خواندن از رپلیکا مجاز است؛ بعد از هر نوشتن، درخواست‌های بعدی همان کاربر
+# تا REPLICA_STICKY_SECONDS از پایگاه اصلی می‌خوانند (read-your-writes).
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA = 'replica'
+REPLICA_APPS = set(getattr(settings, 'REPLICA_APPS', ('tools', 'blog')))
+
+# ✅ فقط داخل درخواست‌های مجاز True است (دستورات مدیریتی و ورکرها همیشه از اصلی می‌خوانند)
+use_replica = ContextVar('use_replica', default=False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            use_replica.get()
+            and REPLICA in settings.DATABASES
+            and model._meta.app_label in REPLICA_APPS
+            # ⚠️ داخل تراکنش باز، خواندن باید همان داده‌های تراکنش را ببیند
+            and not connections['default'].in_atomic_block
+        ):
+            return REPLICA
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # رپلیکا کپی همان پایگاه اصلی است
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # رپلیکا از طریق replication به‌روز می‌شود، نه migrate
+        return db != REPLICA
@@ -0,0 +1,238 @@
+# core/images.py
+# --------------------------------------------------
+# 🖼️ ساخت نسخه‌های تغییر اندازه‌یافته تصاویر (لوگو، اسکرین‌شات، تصویر مقاله)
+# --------------------------------------------------
+# بعد از commit ذخیره، تصویر اصلی در یک نخ پس‌زمینه باز می‌شود و برای هر
+# اندازه (thumb، card، full) یک WebP و یک JPEG بدون متادیتا ساخته می‌شود.
+# نام فایل‌ها از هش محتوای تصویر اصلی ساخته می‌شود، پس هرگز تغییر نمی‌کنند
+# و می‌توانند با Cache-Control: immutable سرو شوند.
+# نتیجه (ابعاد و مسیر نسخه‌ها) در یک فیلد JSON کنار فیلد تصویر ذخیره می‌شود.
+# نسخه‌های تصویرهای جایگزین‌شده با prune (دستور process_images --prune) پاک می‌شوند.
+
+import hashlib
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import bump_namespace
+
+logger = logging.getLogger(__name__)
+
+# 📐 حداکثر عرض هر نسخه (تصویر کوچک‌تر بزرگ نمی‌شود)
+IMAGE_VARIANTS = getattr(settings, 'IMAGE_VARIANTS', {'thumb': 160, 'card': 480, 'full': 1600})
+IMAGE_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+IMAGE_WORKERS = getattr(settings, 'IMAGE_WORKERS', 2)
+# 🗑️ prune فایل‌های مشتق جوان‌تر از این (ثانیه) را پاک نمی‌کند
+PRUNE_GRACE_SECONDS = 60 * 60
+
+# فایل‌های مشتق در زیرپوشه derived کنار پوشه آپلود
+DERIVED_DIR = 'derived'
+
+# 📋 فیلدهای تصویر پروژه: (مدل، فیلد تصویر، فیلد JSON نسخه‌ها، فضاهای نام کش)
+IMAGE_FIELDS = [
+    ('tools.Tool', 'logo', 'logo_variants', ('tools',)),
+    ('tools.Tool', 'homepage_screenshot', 'screenshot_variants', ('tools',)),
+    ('blog.Post', 'image', 'image_variants', ('blog',)),
+]
+
+_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix='images')
+
+
+def content_hash(field_file):
+    digest = hashlib.sha1()
+    field_file.open('rb')
+    try:
+        for chunk in field_file.chunks():
+            digest.update(chunk)
+    finally:
+        field_file.close()
+    return digest.hexdigest()[:16]
+
+
+def _encode(image, fmt):
+    pil_format, options = IMAGE_FORMATS[fmt]
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        # JPEG شفافیت ندارد: زمینه سفید
+        background = Image.new('RGB', image.size, 'white')
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    buffer = BytesIO()
+    image.save(buffer, pil_format, **options)  # بدون exif/icc: متادیتا کپی نمی‌شود
+    return buffer.getvalue()
+
+
+def build_variants(field_file):
+    """
+    🏗️ ساخت نسخه‌ها از یک فایل تصویر (هم‌زمان؛ در نخ پس‌زمینه یا دستور مدیریتی صدا زده می‌شود).
+    خروجی: {'source', 'width', 'height', 'variants': {name: {'width', 'height', 'webp', 'jpeg'}}}
+    """
+    digest = content_hash(field_file)
+    directory = posixpath.join(posixpath.dirname(field_file.name), DERIVED_DIR)
+
+    field_file.open('rb')
+    try:
+        with Image.open(field_file) as source:
+            image = ImageOps.exif_transpose(source)
+            image.load()
+    finally:
+        field_file.close()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'P') else 'RGB')
+
+    variants, previous = {}, None
+    for name, max_width in sorted(IMAGE_VARIANTS.items(), key=lambda item: item[1]):
+        if previous is not None and previous['width'] == image.width:
+            # تصویر کوچک‌تر از این اندازه است: همان فایل‌های نسخه قبلی
+            variants[name] = previous
+            continue
+        resized = image
+        if image.width > max_width:
+            resized = image.resize((max_width, max(1, round(image.height * max_width / image.width))), Image.LANCZOS)
+        variant = {'width': resized.width, 'height': resized.height}
+        for fmt in IMAGE_FORMATS:
+            path = posixpath.join(directory, f'{digest}-{name}.{fmt}')
+            if not default_storage.exists(path):  # همان محتوا = همان نام
+                path = default_storage.save(path, ContentFile(_encode(resized, fmt)))
+            variant[fmt] = path
+        variants[name] = previous = variant
+
+    return {'source': field_file.name, 'width': image.width, 'height': image.height, 'variants': variants}
+
+
+def needs_processing(instance, field, variants_field):
+    name = getattr(instance, field).name or ''
+    return name != (getattr(instance, variants_field) or {}).get('source', '')
+
+
+def process(model_label, pk, field, variants_field, namespaces=(), force=False):
+    """
+    🔁 ساخت نسخه‌های یک ردیف و ذخیره با UPDATE (بدون سیگنال save).
+    اگر تصویر در این فاصله عوض شده باشد نتیجه ذخیره نمی‌شود.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).only('pk', field, variants_field).first()
+    if instance is None or not (force or needs_processing(instance, field, variants_field)):
+        return False
+
+    field_file = getattr(instance, field)
+    if field_file:
+        data, unchanged = build_variants(field_file), Q(**{field: field_file.name})
+    else:
+        # تصویر حذف شده: فقط نسخه‌های قبلی فراموش می‌شوند
+        data, unchanged = {}, Q(**{field: ''}) | Q(**{f'{field}__isnull': True})
+    updated = model.objects.filter(unchanged, pk=pk).update(
+        **{variants_field: data, 'updated_at': timezone.now()}
+    )
+    if updated and namespaces:
+        bump_namespace(*namespaces)
+    return bool(updated)
+
+
+def _run(*args):
+    try:
+        process(*args)
+    except Exception:
+        logger.exception("🖼️ ساخت نسخه‌های تصویر %s ناموفق بود", args[:3])
+    finally:
+        connections.close_all()  # اتصال‌های این نخ باز نمانند
+
+
+def schedule(instance):
+    """⏳ تصاویر تغییرکرده ردیف بعد از commit در نخ پس‌زمینه پردازش می‌شوند (بیرون از مسیر درخواست)"""
+    for label, field, variants_field, namespaces in IMAGE_FIELDS:
+        if label != instance._meta.label or not needs_processing(instance, field, variants_field):
+            continue
+        args = (label, instance.pk, field, variants_field, namespaces)
+        if getattr(settings, 'IMAGE_PROCESSING_SYNC', False):
+            transaction.on_commit(lambda args=args: process(*args))
+        else:
+            transaction.on_commit(lambda args=args: _executor.submit(_run, *args))
+
+
+def sweep(force=False):
+    """🧹 پردازش هم‌زمان همه ردیف‌هایی که نسخه‌هایشان با تصویر فعلی نمی‌خواند (یا همه با force)"""
+    processed = 0
+    for label, field, variants_field, namespaces in IMAGE_FIELDS:
+        model = apps.get_model(label)
+        rows = model.objects.only('pk', field, variants_field).order_by('pk')
+        for instance in rows.iterator():
+            if force or needs_processing(instance, field, variants_field):
+                processed += process(label, instance.pk, field, variants_field, namespaces, force=force)
+    return processed
+
+
+def prune(grace=PRUNE_GRACE_SECONDS, dry_run=False):
+    """
+    🗑️ حذف فایل‌های مشتقی که هیچ ردیفی به آن‌ها اشاره نمی‌کند (تصویر عوض یا حذف شده).
+    حذف در process انجام نمی‌شود چون نام‌ها از هش محتواست و دو ردیف با یک تصویر
+    فایل‌های مشترک دارند. فایل‌های تازه‌تر از grace ثانیه نگه داشته می‌شوند تا
+    نسخه‌هایی که هنوز در حال ساخت‌اند (و در JSON ثبت نشده‌اند) پاک نشوند.
+    خروجی: مسیرهای حذف‌شده (یا در dry_run، قابل حذف)
+    """
+    referenced, directories = set(), set()
+    for label, field, variants_field, _namespaces in IMAGE_FIELDS:
+        model = apps.get_model(label)
+        upload_to = model._meta.get_field(field).upload_to
+        if isinstance(upload_to, str):
+            directories.add(posixpath.join(upload_to.rstrip('/'), DERIVED_DIR))
+        for data in model.objects.values_list(variants_field, flat=True).iterator():
+            for variant in (data or {}).get('variants', {}).values():
+                for fmt in IMAGE_FORMATS:
+                    referenced.add(variant[fmt])
+                    directories.add(posixpath.dirname(variant[fmt]))
+
+    cutoff = timezone.now() - timedelta(seconds=grace)
+    removed = []
+    for directory in sorted(directories):
+        try:
+            _dirs, files = default_storage.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for name in files:
+            path = posixpath.join(directory, name)
+            if path in referenced or default_storage.get_modified_time(path) > cutoff:
+                continue
+            if not dry_run:
+                default_storage.delete(path)
+            removed.append(path)
+    return removed
+
+
+def srcset(data, request=None):
+    """
+    🔗 نقشه نسخه‌ها برای سریالایزرها:
+    {'width', 'height', 'webp': 'url 160w, ...', 'jpeg': '...', 'variants': {name: {'webp': url, 'jpeg': url, ...}}}
+    تا زمان آماده شدن نسخه‌ها None است.
+    """
+    if not data or not data.get('variants'):
+        return None
+
+    def url(path):
+        link = default_storage.url(path)
+        return request.build_absolute_uri(link) if request is not None else link
+
+    variants = {
+        name: {**variant, **{fmt: url(variant[fmt]) for fmt in IMAGE_FORMATS}}
+        for name, variant in data['variants'].items()
+    }
+    result = {'width': data['width'], 'height': data['height'], 'variants': variants}
+    for fmt in IMAGE_FORMATS:
+        # تصویر کوچک ممکن است برای چند اندازه یک عرض داشته باشد؛ هر عرض یک بار
+        by_width = {variant['width']: variant[fmt] for variant in variants.values()}
+        result[fmt] = ', '.join(f"{link} {width}w" for width, link in sorted(by_width.items()))
+    return result
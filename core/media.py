@@ -0,0 +1,160 @@
+# core/media.py
+# --------------------------------------------------
+# 🗂️ سرو فایل‌های media (لوگو، اسکرین‌شات، تصاویر مقالات)
+# --------------------------------------------------
+# جنگو فقط مجوز و مسیر فایل را بررسی می‌کند و انتقال بایت‌ها را به وب‌سرور
+# جلویی می‌سپارد (MEDIA_ACCEL):
+#   nginx  → هدر X-Accel-Redirect به یک location داخلی، مثلاً:
+#            location /protected-media/ { internal; alias /srv/hooshmetr/media/; }
+#   apache → هدر X-Sendfile با مسیر کامل فایل (mod_xsendfile)
+# بدون وب‌سرور جلویی، FileResponse فایل را با wsgi.file_wrapper (sendfile) می‌فرستد.
+# درخواست‌های Range (مثلاً اسکرین‌شات‌های حجیم) با پاسخ 206 جواب داده می‌شوند.
+# فایل‌های مشتق با نام هش‌دار (core/images.py) هرگز تغییر نمی‌کنند و
+# Cache-Control: immutable می‌گیرند.
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import APIException
+
+MEDIA_ACCEL = getattr(settings, 'MEDIA_ACCEL', '')  # '' | 'nginx' | 'apache'
+MEDIA_ACCEL_PREFIX = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/')
+MEDIA_MAX_AGE = getattr(settings, 'MEDIA_MAX_AGE', 60 * 60)
+MEDIA_IMMUTABLE_MAX_AGE = getattr(settings, 'MEDIA_IMMUTABLE_MAX_AGE', 60 * 60 * 24 * 365)
+# پوشه‌هایی که فقط مدیران (role='admin' با توکن JWT) می‌توانند ببینند
+MEDIA_PRIVATE_PREFIXES = tuple(getattr(settings, 'MEDIA_PRIVATE_PREFIXES', ()))
+
+# نام فایل‌های مشتق: <پوشه>/derived/<هش ۱۶ رقمی>-<نسخه>.<فرمت>
+HASHED_NAME = re.compile(r'(^|/)derived/[0-9a-f]{16}-[\w-]+\.\w+$')
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def is_private(name):
+    return name.startswith(MEDIA_PRIVATE_PREFIXES)
+
+
+def authorize(request, name):
+    """🔐 فایل‌های عمومی برای همه؛ پوشه‌های خصوصی فقط برای مدیر با توکن معتبر"""
+    if not is_private(name):
+        return True
+    from accounts.authentication import CachedJWTAuthentication
+
+    try:
+        result = CachedJWTAuthentication().authenticate(request)
+    except APIException:
+        return False
+    return result is not None and getattr(result[0], 'role', None) == 'admin'
+
+
+def cache_control(name):
+    if is_private(name):
+        return 'private, no-cache'
+    if HASHED_NAME.search(name):
+        return f'public, max-age={MEDIA_IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={MEDIA_MAX_AGE}'
+
+
+def parse_range(header, size):
+    """
+    📏 فقط یک بازه (bytes=a-b ، bytes=a- ، bytes=-n) پشتیبانی می‌شود.
+    خروجی: (start, end) شامل هر دو سر، None برای نادیده گرفتن هدر (پاسخ کامل 200)
+    و ValueError برای بازه خارج از فایل (416).
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None  # چند بازه یا نحو نامعتبر: طبق RFC 9110 کل فایل فرستاده می‌شود
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def iter_range(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, name):
+    """📤 سرو یک فایل از MEDIA_ROOT با هدرهای کش، درخواست شرطی و Range"""
+    try:
+        path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = os.stat(path)
+    except OSError:
+        raise Http404
+    if not os.path.isfile(path) or not authorize(request, name):
+        raise Http404  # وجود فایل خصوصی هم لو نمی‌رود
+
+    etag = '"%x-%x"' % (int(stat.st_mtime), stat.st_size)
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': cache_control(name),
+        'Accept-Ranges': 'bytes',
+        'X-Content-Type-Options': 'nosniff',
+    }
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        response = not_modified
+    elif MEDIA_ACCEL == 'nginx':
+        # nginx خودش Range و ارسال بدون کپی را انجام می‌دهد و Cache-Control را نگه می‌دارد
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + quote(name)
+    elif MEDIA_ACCEL == 'apache':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+    else:
+        response = file_response(request, path, stat.st_size, content_type, etag)
+
+    for header, value in headers.items():
+        response[header] = value
+    if is_private(name):
+        patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def file_response(request, path, size, content_type, etag):
+    """📦 ارسال مستقیم از جنگو: کل فایل با FileResponse و یک بازه با پاسخ 206"""
+    header = request.META.get('HTTP_RANGE', '')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if header and (if_range is None or if_range == etag):
+        try:
+            byte_range = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        if byte_range is not None:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                iter_range(path, start, end - start + 1), status=206, content_type=content_type,
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(end - start + 1)
+            return response
+    return FileResponse(open(path, 'rb'), content_type=content_type)
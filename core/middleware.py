@@ -0,0 +1,112 @@
+# core/middleware.py
+# --------------------------------------------------
+# 🧩 میان‌افزارهای مشترک پروژه
+# --------------------------------------------------
+
+import hashlib
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+from .cache import is_shared_cache
+from .db_router import REPLICA, use_replica
+from .profiling import RequestProfile, log_slow_request, profiling
+
+STICKY_SECONDS = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+STICKY_KEY = 'db:sticky:{}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    📖 GET/HEAD/OPTIONS از رپلیکا خوانده می‌شوند مگر این‌که همین کاربر به‌تازگی نوشته باشد.
+    کاربر از روی هش هدر Authorization شناخته می‌شود (نوشتن در API فقط با توکن ممکن است و
+    فرانت‌اند روی دامنه دیگری است، پس کوکی به کار نمی‌آید). علامت «به‌تازگی نوشته» در کش
+    مشترک است تا درخواست بعدی روی هر پروسه‌ای آن را ببیند؛ با کش داخل پروسه راه نمی‌افتد.
+    """
+
+    def __init__(self, get_response):
+        if REPLICA not in settings.DATABASES:
+            raise MiddlewareNotUsed  # بدون رپلیکا هزینه‌ای در هر درخواست نداشته باشد
+        if not is_shared_cache():
+            raise ImproperlyConfigured(
+                "DATABASES['replica'] needs a cache shared between processes (e.g. REDIS_URL) "
+                "to keep reads after a write on the primary database."
+            )
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token_key = self.token_key(request)
+        recently_wrote = token_key is not None and cache.get(token_key) is not None
+        reset = use_replica.set(request.method in SAFE_METHODS and not recently_wrote)
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.reset(reset)
+
+        if request.method not in SAFE_METHODS and response.status_code < 500 and token_key is not None:
+            # ✍️ خواندن‌های بعدی این کاربر تا چند ثانیه از پایگاه اصلی
+            cache.set(token_key, 1, timeout=STICKY_SECONDS)
+        return response
+
+    @staticmethod
+    def token_key(request):
+        auth = request.META.get('HTTP_AUTHORIZATION')
+        if not auth:
+            return None
+        return STICKY_KEY.format(hashlib.sha1(auth.encode()).hexdigest())
+
+
+class ProfilingMiddleware:
+    """
+    ⏱️ پروفایل درخواست‌ها (فقط با PROFILING['ENABLED']؛ در غیر این صورت اصلاً در زنجیره نیست).
+    برای درخواست‌های نمونه‌برداری‌شده (نرخ هر مسیر با نام url در ROUTE_SAMPLE_RATES، پیش‌فرض
+    SAMPLE_RATE): تعداد و زمان کوئری‌ها و بخش‌های timed() در هدر Server-Timing، و اگر کل زمان
+    از SLOW_REQUEST_MS بیشتر شد یک رکورد JSON با کندترین کوئری‌ها در لاگ core.profiling.
+    زمان تولید بدنه پاسخ‌های جریانی حساب نمی‌شود. باید آخرین میان‌افزار باشد تا app ≈ زمان ویو.
+    """
+
+    def __init__(self, get_response):
+        options = getattr(settings, 'PROFILING', {})
+        if not options.get('ENABLED'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = options.get('SAMPLE_RATE', 1.0)
+        self.route_sample_rates = options.get('ROUTE_SAMPLE_RATES', {})
+        self.slow_ms = options.get('SLOW_REQUEST_MS', 500)
+        self.server_timing = options.get('SERVER_TIMING', True)
+        self.top_sql = options.get('TOP_SQL', 5)
+
+    def route(self, request):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        return match.url_name or match.route
+
+    def __call__(self, request):
+        route = self.route(request)
+        rate = self.route_sample_rates.get(route, self.sample_rate)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            stack.enter_context(profiling(profile))
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        if self.server_timing:
+            response['Server-Timing'] = profile.server_timing(total_ms)
+        if total_ms >= self.slow_ms:
+            log_slow_request(profile.record(request, response, route, total_ms, self.top_sql))
+        return response
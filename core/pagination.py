@@ -0,0 +1,18 @@
+# core/pagination.py
+# --------------------------------------------------
+# 📄 صفحه‌بندی cursor (keyset) مشترک بین اپ‌ها
+# --------------------------------------------------
+
+from rest_framework.pagination import CursorPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    ✅ صفحه‌بندی پایدار بر اساس کلید (بدون OFFSET).
+    پاسخ شامل next/previous به‌صورت cursor مبهم است و اندازه صفحه
+    با ?page_size= قابل تغییر است ولی سمت سرور محدود می‌شود.
+    ترتیب باید با یک ایندکس روی مدل هم‌خوان باشد.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
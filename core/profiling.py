@@ -0,0 +1,112 @@
+# core/profiling.py
+# --------------------------------------------------
+# ⏱️ پروفایل درخواست‌ها: زمان SQL، سریالایزر، احراز هویت و پیامک
+# --------------------------------------------------
+# ProfilingMiddleware (core/middleware.py) برای درخواست‌های نمونه‌برداری‌شده یک
+# RequestProfile در ContextVar می‌گذارد؛ کد برنامه با timed('نام') زمان بخش‌های
+# خودش را به آن اضافه می‌کند. بدون پروفایل فعال، timed فقط یک ContextVar.get است.
+# بخش‌ها ممکن است هم‌پوشانی داشته باشند (کوئری‌های داخل سریالایزر در هر دو
+# بخش db و serializer حساب می‌شوند)؛ مثل Server-Timing که هم‌پوشانی را مجاز می‌داند.
+
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.spans = defaultdict(float)  # نام بخش → میلی‌ثانیه
+        self.depth = defaultdict(int)    # تو در تو بودن همان بخش (فقط بیرونی‌ترین شمرده می‌شود)
+        self.queries = []                # (sql, میلی‌ثانیه)
+
+    def __call__(self, execute, sql, params, many, context):
+        # 🗄️ connection.execute_wrapper
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - started) * 1000))
+
+    @property
+    def db_ms(self):
+        return sum(duration for _, duration in self.queries)
+
+    def top_sql(self, limit=5):
+        """🐢 کوئری‌ها گروه‌بندی‌شده بر اساس متن، به ترتیب مجموع زمان"""
+        groups = {}
+        for sql, duration in self.queries:
+            total, count = groups.get(sql, (0.0, 0))
+            groups[sql] = (total + duration, count + 1)
+        ranked = sorted(groups.items(), key=lambda item: -item[1][0])[:limit]
+        return [{'sql': sql, 'ms': round(total, 2), 'count': count} for sql, (total, count) in ranked]
+
+    def server_timing(self, total_ms):
+        """📊 مقدار هدر Server-Timing"""
+        parts = [f'db;dur={self.db_ms:.1f};desc="{len(self.queries)} queries"']
+        parts += [f'{name};dur={duration:.1f}' for name, duration in sorted(self.spans.items())]
+        parts.append(f'app;dur={total_ms:.1f}')
+        return ', '.join(parts)
+
+    def record(self, request, response, route, total_ms, top_sql=5):
+        """📝 رکورد ساختاریافته برای لاگ درخواست کند"""
+        return {
+            'method': request.method,
+            'path': request.path,
+            'route': route,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'db_ms': round(self.db_ms, 2),
+            'queries': len(self.queries),
+            **{f'{name}_ms': round(duration, 2) for name, duration in sorted(self.spans.items())},
+            'top_sql': self.top_sql(top_sql),
+        }
+
+
+def current_profile():
+    return _current.get()
+
+
+@contextmanager
+def profiling(profile):
+    """🎬 فعال کردن پروفایل برای کد داخل بلوک (توسط میان‌افزار)"""
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """⏱️ افزودن زمان بلوک به بخش name از پروفایل درخواست جاری (در صورت وجود)"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    profile.depth[name] += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.depth[name] -= 1
+        if not profile.depth[name]:
+            profile.spans[name] += (time.perf_counter() - started) * 1000
+
+
+class ProfiledSerializerMixin:
+    """🧩 زمان to_representation در بخش serializer (سریالایزرهای تو در تو یک بار شمرده می‌شوند)"""
+
+    def to_representation(self, instance):
+        with timed('serializer'):
+            return super().to_representation(instance)
+
+
+def log_slow_request(record):
+    logger.warning(json.dumps(record, ensure_ascii=False, default=str))
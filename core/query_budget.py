@@ -0,0 +1,130 @@
+# core/query_budget.py
+# --------------------------------------------------
+# 🧮 سقف تعداد کوئری SQL برای هر ویو و متد HTTP
+# --------------------------------------------------
+# بودجه کنار خود ویو تعریف می‌شود:
+#
+#     @query_budget(GET=4, POST=9)
+#     class ToolListCreateView(...): ...
+#
+#     @query_budget(GET=2)          # بالای @api_view
+#     @api_view(["GET"])
+#     def my_reactions(request): ...
+#
+# بودجه برای مسیر «سرد» است: کش پاسخ خاموش، کش کاربران احراز هویت خالی.
+# تست main.tests.QueryBudgetTests همه مسیرهای API را در دو اندازه داده اجرا
+# می‌کند و اگر تعداد کوئری با تعداد ردیف‌ها زیاد شود یا از بودجه بگذرد، کوئری‌ها
+# را به تفکیک محل فراخوانی در کد پروژه چاپ می‌کند.
+#
+# تعداد کوئری در دو اندازه باید برابر باشد (بدون اختلاف مجاز)؛ مسیری که
+# شاخه‌های وابسته به داده دارد باید طوری نوشته شود که همیشه همان کوئری‌ها را بزند.
+
+import os
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+
+PROJECT_ROOT = str(settings.BASE_DIR) + os.sep
+SKIPPED_METHODS = ('OPTIONS', 'HEAD')  # پاسخ‌های خودکار جنگو/DRF
+
+
+def query_budget(**budgets):
+    """🏷️ ثبت سقف کوئری برای متدهای یک ویو (کلاس یا تابع خروجی @api_view)"""
+    budgets = {method.upper(): limit for method, limit in budgets.items()}
+
+    def decorator(view):
+        view.query_budgets = {**getattr(view, 'query_budgets', {}), **budgets}
+        return view
+    return decorator
+
+
+def view_methods(callback):
+    """📋 متدهای HTTP پیاده‌شده توسط callback یک مسیر (خروجی as_view)"""
+    view_class = getattr(callback, 'view_class', None)
+    if view_class is None:
+        return []
+    return [
+        method.upper() for method in view_class.http_method_names
+        if hasattr(view_class, method) and method.upper() not in SKIPPED_METHODS
+    ]
+
+
+def budget_for(callback, method):
+    """🔢 سقف کوئری callback یک مسیر برای متد داده‌شده؛ None یعنی تعریف نشده"""
+    for target in (callback, getattr(callback, 'view_class', None)):
+        budgets = getattr(target, 'query_budgets', None)
+        if budgets is not None:
+            return budgets.get(method.upper())
+    return None
+
+
+def _describe(frame):
+    """path:line (تابع) نسبت به ریشه پروژه یا site-packages"""
+    filename = frame.f_code.co_filename
+    _, marker, rest = filename.partition(f'site-packages{os.sep}')
+    if marker:
+        filename = rest
+    elif filename.startswith(PROJECT_ROOT):
+        filename = filename[len(PROJECT_ROOT):]
+    return f"{filename}:{frame.f_lineno} ({frame.f_code.co_name})"
+
+
+def call_site():
+    """
+    📍 نزدیک‌ترین فریم کد پروژه؛ اگر کوئری از داخل یک کتابخانه (مثلاً اعتبارسنجی DRF)
+    اجرا شده، درونی‌ترین فریم آن کتابخانه (بیرون از لایه پایگاه داده جنگو) هم می‌آید.
+    """
+    frame = sys._getframe(1)
+    library = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename != __file__ and f'{os.sep}django{os.sep}db{os.sep}' not in filename:
+            if filename.startswith(PROJECT_ROOT) and 'site-packages' not in filename:
+                return f"{_describe(frame)} ← {library}" if library else _describe(frame)
+            library = library or _describe(frame)
+        frame = frame.f_back
+    return library or '<django>'
+
+
+class QueryRecorder:
+    """
+    📝 ثبت کوئری‌های یک بلوک همراه با محل فراخوانی (با connection.execute_wrapper،
+    مستقل از DEBUG و queries_log).
+    """
+
+    def __init__(self, using=connection):
+        self.connection = using
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, call_site()))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.queries = []
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._wrapper.__exit__(*exc_info)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def by_call_site(self):
+        """🗂️ {محل فراخوانی: [sql, ...]} به ترتیب تعداد کوئری (بیشترین اول)"""
+        groups = defaultdict(list)
+        for sql, site in self.queries:
+            groups[site].append(sql)
+        return dict(sorted(groups.items(), key=lambda item: -len(item[1])))
+
+    def report(self, max_sql_length=300):
+        lines = []
+        for site, statements in self.by_call_site().items():
+            lines.append(f"  {len(statements)}× {site}")
+            for sql in dict.fromkeys(statements):  # هر متن یکتا یک بار
+                lines.append(f"      {sql[:max_sql_length]}")
+        return "\n".join(lines)
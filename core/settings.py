@@ -15,6 +15,9 @@ from decouple import config
 TSMS_USERNAME = config('TSMS_USERNAME')
 TSMS_PASSWORD = config('TSMS_PASSWORD')
 TSMS_SENDER = config('TSMS_SENDER')
+# 📶 خط اصلی و پشتیبان ارسال (پیش‌فرض هر دو همان TSMS_SENDER)
+TSMS_SENDER_PRIMARY = config('TSMS_SENDER_PRIMARY', default=TSMS_SENDER)
+TSMS_SENDER_FALLBACK = config('TSMS_SENDER_FALLBACK', default=TSMS_SENDER)
 
 
 from pathlib import Path
@@ -76,9 +79,12 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
-    
+        # 🎫 همان JWT، با وضعیت کاربر از کش داخل پروسه به جای کوئری در هر درخواست
+        'accounts.authentication.CachedJWTAuthentication',
+    ),
+    # 📄 صفحه‌بندی cursor برای همه لیست‌ها (لیست‌های کوچک مثل تگ‌ها آن را غیرفعال می‌کنند)
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.DefaultCursorPagination',
+    'PAGE_SIZE': 20,
 }
 
 
@@ -91,6 +97,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',  # 📖 GET ها از رپلیکا (در صورت تعریف)
+    'core.middleware.ProfilingMiddleware',  # ⏱️ فقط با PROFILING_ENABLED؛ باید آخر بماند
 ]
 
 # تنظیم CORS برای دسترسی به API از هر منبع
@@ -119,11 +127,98 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# 🗄️ پایگاه داده بر اساس محیط: DB_ENGINE=sqlite (پیش‌فرض) یا postgres
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)  # اتصال پایدار بین درخواست‌ها (ثانیه)
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='hooshmetr'),
+            'USER': config('DB_USER', default='hooshmetr'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,  # اتصال قطع‌شده قبل از استفاده دوباره بررسی و جایگزین می‌شود
+            'OPTIONS': {'connect_timeout': 5},
+        }
     }
+    # 📖 رپلیکای فقط‌خواندنی (اختیاری): خواندن‌های GET اپ‌های tools و blog (core/db_router.py)
+    # ⚠️ به کش مشترک (REDIS_URL) نیاز دارد؛ با کش locmem میان‌افزار ImproperlyConfigured می‌دهد
+    if config('DB_REPLICA_HOST', default=''):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': config('DB_REPLICA_HOST'),
+            'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'OPTIONS': {
+                # ✅ WAL: خواننده‌ها پشت نویسنده منتظر نمی‌مانند؛ NORMAL در WAL امن و سریع‌تر است
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA mmap_size=134217728;'  # ۱۲۸ مگابایت
+                    'PRAGMA cache_size=-20000;'    # حدود ۲۰ مگابایت
+                    'PRAGMA temp_store=MEMORY;'
+                ),
+                'timeout': 20,  # busy_timeout: انتظار برای قفل نوشتن به جای خطای database is locked
+                # قفل نوشتن از ابتدای تراکنش گرفته شود (ارتقای قفل وسط تراکنش در WAL خطا می‌دهد)
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+REPLICA_APPS = ('tools', 'blog')
+REPLICA_STICKY_SECONDS = 10  # بعد از هر نوشتن، خواندن‌های همان کاربر تا این مدت از پایگاه اصلی
+
+
+# 🗃️ کش: پیش‌فرض حافظه محلی هر پروسه (LRU با MAX_ENTRIES)
+# با REDIS_URL کش بین همه پروسه‌ها مشترک می‌شود (نیازمند پکیج redis؛ سیاست حذف allkeys-lru)
+# ⚠️ با چند worker، بی‌اعتبارسازی کش‌ها فقط با کش مشترک به همه پروسه‌ها می‌رسد
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'hooshmetr',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+# 📦 کش پاسخ درخواست‌های GET ناشناس (core/cache.py) — زمان‌ها به ثانیه
+RESPONSE_CACHE = {
+    'ENABLED': config('RESPONSE_CACHE_ENABLED', default=True, cast=bool),
+    'TIMEOUT': 60,          # تازه
+    'STALE_TIMEOUT': 300,   # کهنه ولی قابل استفاده تا بازسازی
+    'LOCK_TIMEOUT': 10,
+    'LOCK_WAIT': 2.0,
+}
+
+# ⏱️ پروفایل درخواست‌ها (core/profiling.py): Server-Timing و لاگ درخواست‌های کند
+# نرخ نمونه‌برداری بین ۰ و ۱؛ ROUTE_SAMPLE_RATES با نام url، مثلاً {'tool-detail': 0.1}
+PROFILING = {
+    'ENABLED': config('PROFILING_ENABLED', default=False, cast=bool),
+    'SAMPLE_RATE': config('PROFILING_SAMPLE_RATE', default=1.0, cast=float),
+    'ROUTE_SAMPLE_RATES': {},
+    'SLOW_REQUEST_MS': 500,
+    'TOP_SQL': 5,
+    'SERVER_TIMING': True,
 }
 
 
@@ -184,3 +279,70 @@ SIMPLE_JWT = {
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# 🗂️ سرو media: 'nginx' (X-Accel-Redirect به MEDIA_ACCEL_PREFIX)، 'apache' (X-Sendfile) یا '' (خود جنگو)
+MEDIA_ACCEL = config('MEDIA_ACCEL', default='')
+MEDIA_ACCEL_PREFIX = '/protected-media/'  # location داخلی nginx با alias به MEDIA_ROOT
+MEDIA_MAX_AGE = 60 * 60                   # فایل‌های آپلودی (ممکن است جایگزین شوند)
+MEDIA_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365  # نسخه‌های هش‌دار derived/
+MEDIA_PRIVATE_PREFIXES = ()               # پوشه‌های فقط-مدیر، مثلاً ('exports/',)
+
+# 🧵 سقف درخت نظرات (عمق پاسخ‌ها و تعداد پاسخ هر نظر) در API
+REVIEW_THREAD_MAX_DEPTH = 5
+REVIEW_THREAD_MAX_REPLIES = 50
+
+# 🔎 حداکثر تعداد نتایج رتبه‌بندی‌شده جستجوی ابزارها (بریده شدن در پاسخ لیست اعلام می‌شود)
+TOOL_SEARCH_MAX_RESULTS = 200
+
+# 🧮 سقف عمر ایندکس بیت‌مپ ویژگی‌ها در هر پروسه (ثانیه)؛ فقط وقتی REDIS_URL تنظیم نشده
+TOOL_BITMAP_MAX_AGE = 30
+
+# 📊 مدت کش شمارش فیلترهای ابزار (ثانیه)؛ با هر تغییر ابزار خودکار بی‌اعتبار می‌شود
+TOOL_FACETS_CACHE_TIMEOUT = 300
+
+# ⚖️ مقایسه ابزارها: حداکثر تعداد در هر درخواست، مدت کش ماتریس، تعداد مجموعه‌های پرتکرار ثبت‌شده
+# و طول پنجره شمارش درخواست‌ها (شمارش هر پنجره در پنجره بعد نصف حساب می‌شود)
+TOOL_COMPARE_MAX_TOOLS = 5
+TOOL_COMPARE_CACHE_TIMEOUT = 60 * 60 * 24
+TOOL_COMPARE_TRACKED_SETS = 200
+TOOL_COMPARE_HITS_WINDOW = 60 * 60 * 24
+
+# 🏆 رتبه‌بندی بیزی: هر ابزار با LEADERBOARD_PRIOR_WEIGHT نظر فرضی با امتیاز LEADERBOARD_PRIOR_MEAN شروع می‌کند
+# (بعد از تغییر، دستور rebuild_leaderboard را اجرا کنید)
+LEADERBOARD_PRIOR_MEAN = 3.0
+LEADERBOARD_PRIOR_WEIGHT = 10
+
+# 🖼️ نسخه‌های تصاویر (حداکثر عرض هر نسخه) که بعد از آپلود در پس‌زمینه ساخته می‌شوند
+# (بعد از تغییر، دستور process_images --force را اجرا کنید)
+IMAGE_VARIANTS = {'thumb': 160, 'card': 480, 'full': 1600}
+IMAGE_WORKERS = 2
+IMAGE_PROCESSING_SYNC = False  # True: ساخت هم‌زمان بعد از commit (برای تست)
+
+# 🗺️ نقشه سایت: آدرس فرانت‌اند، اندازه هر شارد، تعداد مقایسه‌های پرتکرار و مدت کش خروجی
+SITE_URL = config('SITE_URL', default='https://hooshmetr.com')
+SITEMAP_SHARD_SIZE = 5000
+SITEMAP_COMPARE_SETS = 500
+SITEMAP_CACHE_TIMEOUT = 60 * 60
+
+# ⏱️ بنچمارک endpointها (دستور benchmark_endpoints): فایل baseline و آستانه کندی نسبی برای پسرفت
+BENCHMARK_BASELINES = BASE_DIR / 'benchmarks' / 'baselines.json'
+BENCHMARK_THRESHOLD = 0.25
+
+# 📨 پیامک: ترنسپورت (accounts.sms.LocmemTransport برای تست) و صف ارسال (دستور send_sms_outbox)
+SMS_TRANSPORT = config('SMS_TRANSPORT', default='accounts.sms.TsmsTransport')
+TSMS_URL = config('TSMS_URL', default='http://tsms.ir/url/tsmshttp.php')
+TSMS_CONNECT_TIMEOUT = 2     # ثانیه؛ زمان‌های کوتاه تا خط کند سریع به خط پشتیبان برسد
+TSMS_READ_TIMEOUT = 4
+TSMS_POOL_SIZE = 10          # اتصال‌های پایدار به درگاه (هم‌اندازه --concurrency ورکر)
+SMS_BREAKER_FAILURES = 3     # خطای پیاپی تا باز شدن مدار یک خط
+SMS_BREAKER_COOLDOWN = 30    # ثانیه؛ مدت کنار گذاشتن خط خراب
+SMS_OUTBOX_MAX_ATTEMPTS = 5
+SMS_OUTBOX_BACKOFF_BASE = 2   # ثانیه؛ در هر تلاش دو برابر
+SMS_OUTBOX_BACKOFF_MAX = 30
+SMS_OUTBOX_LEASE = 60         # پیام برداشته‌شده توسط ورکرِ از کار افتاده بعد از این مدت دوباره ارسال می‌شود
+
+# 🔐 محل نگهداری کدهای تأیید: 'db' (جدول OTP، با prune_otps پاک‌سازی شود) یا 'cache' (کش مشترک با TTL؛ فقط با REDIS_URL)
+OTP_STORE = config('OTP_STORE', default='db')
+
+# 🎫 کش وضعیت کاربر در احراز هویت JWT (ثانیه / حداکثر تعداد کاربر در هر پروسه)
+AUTH_USER_CACHE_TTL = 60
+AUTH_USER_CACHE_SIZE = 10000
@@ -1,32 +1,29 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
-from main.views import robots_txt
-from django.contrib.sitemaps.views import sitemap
-from main.sitemaps import StaticViewSitemap
+from core.media import serve_media
+from main.views import robots_txt, sitemap_index, sitemap_section
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
 
 
-sitemaps = {
-    'static': StaticViewSitemap
-}
-
 urlpatterns = [
     path('admin/', admin.site.urls),                     # مسیر پنل مدیریت جنگو
     path('api/', include('tools.urls')),                 # ابزارهای هوش مصنوعی
     path('api/auth/', include('accounts.urls')),         # احراز هویت و ارسال کد (تغییر مسیر 'api/')
     path("robots.txt", robots_txt, name="robots_txt"),
-    path("sitemap.xml", sitemap, {'sitemaps': sitemaps}, name="sitemap"),
+    path("sitemap.xml", sitemap_index, name="sitemap"),
+    path("sitemap-<slug:section>-<int:shard>.xml", sitemap_section, name="sitemap-section"),
     path('api/blog/', include('blog.urls')),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
 ]
 
-# اضافه کردن تنظیمات static برای فایل‌های media هنگام DEBUG
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# 🗂️ فایل‌های media (در همه محیط‌ها؛ انتقال بایت‌ها با MEDIA_ACCEL به وب‌سرور سپرده می‌شود)
+if settings.MEDIA_URL.startswith('/'):
+    urlpatterns += [
+        path(f"{settings.MEDIA_URL.strip('/')}/<path:name>", serve_media, name='media'),
+    ]
@@ -45,11 +45,13 @@ function ReviewList({ toolId, refresh, onReviewSubmitted }) {
             reviewSort === "popular" ? "&ordering=likes" : ""
           }`
         );
-        setReviews(response.data);
+        // 📄 پاسخ صفحه‌بندی‌شده است (cursor): نظرات داخل results
+        const results = response.data.results;
+        setReviews(results);
 
         // 📌 واکنش‌های کاربر از API جدا نیست پس از بررسی لیست خودمون می‌سازیم
         const userReactions = {};
-        response.data.forEach((r) => {
+        results.forEach((r) => {
           if (r.user === currentUser && r.my_reaction) {
             userReactions[r.id] = r.my_reaction;
           }
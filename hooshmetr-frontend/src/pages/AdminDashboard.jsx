@@ -48,8 +48,9 @@ function AdminDashboard() {
           headers: { Authorization: `Bearer ${token}` },
         }),
       ]);
-      setTools(toolsRes.data);
-      setReviews(reviewsRes.data);
+      // 📄 پاسخ‌ها صفحه‌بندی‌شده‌اند (cursor)
+      setTools(toolsRes.data.results);
+      setReviews(reviewsRes.data.results);
     } catch {
       alert("دسترسی ادمین نیاز است.");
     } finally {
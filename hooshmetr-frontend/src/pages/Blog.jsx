@@ -10,7 +10,7 @@ const Blog = () => {
     const fetchPosts = async () => {
       try {
         const response = await axios.get("/api/blog/posts/");
-        setPosts(response.data);
+        setPosts(response.data.results); // 📄 پاسخ صفحه‌بندی‌شده
       } catch (error) {
         console.error("خطا در دریافت مقالات:", error);
       } finally {
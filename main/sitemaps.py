@@ -1,12 +1,135 @@
-from django.contrib.sitemaps import Sitemap
-from django.urls import reverse
+# main/sitemaps.py
+# --------------------------------------------------
+# 🗺️ نقشه سایت: ایندکس + شاردهای ثابت برای صفحات، ابزارها، مقالات و مقایسه‌ها
+# --------------------------------------------------
+# - هر شارد ابزار/مقاله یک بازه ثابت از شناسه‌ها است (شارد n: شناسه‌های
+#   n*SHARD_SIZE+1 تا (n+1)*SHARD_SIZE)، پس با اضافه/حذف ردیف جابه‌جا نمی‌شود
+#   و هیچ شاردی از SHARD_SIZE آدرس بزرگ‌تر نمی‌شود.
+# - ردیف‌ها با ‎.iterator()‎ و values_list خوانده و XML تکه‌تکه تولید می‌شود.
+# - خروجی هر شارد با نسخه فضای نام (tools / blog) کش می‌شود و با هر تغییر
+#   ابزار یا مقاله خودکار بی‌اعتبار می‌شود.
+# آدرس‌ها به صفحات فرانت‌اند (SITE_URL) اشاره می‌کنند، نه به API.
 
-class StaticViewSitemap(Sitemap):
-    changefreq = "weekly"
-    priority = 0.8
+from xml.sax.saxutils import escape
 
-    def items(self):
-        return ['home']  # هر اسم URL name که در urls.py تعریف کردی
+from django.conf import settings
+from django.db.models import F, Max
 
-    def location(self, item):
-        return reverse(item)
+from blog.models import Post
+from tools.compare import popular_sets
+from tools.models import Tool
+
+SITE_URL = getattr(settings, 'SITE_URL', 'https://hooshmetr.com').rstrip('/')
+SHARD_SIZE = getattr(settings, 'SITEMAP_SHARD_SIZE', 5000)  # حداکثر مجاز پروتکل: 50000
+COMPARE_SETS = getattr(settings, 'SITEMAP_COMPARE_SETS', 500)
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def url_entry(loc, lastmod=None, tag='url', base=SITE_URL):
+    parts = [f'<{tag}><loc>{escape(base + loc)}</loc>']
+    if lastmod is not None:
+        parts.append(f'<lastmod>{lastmod.isoformat(timespec="seconds")}</lastmod>')
+    parts.append(f'</{tag}>\n')
+    return ''.join(parts)
+
+
+def render_urlset(entries):
+    """📄 تولید تدریجی یک urlset از (مسیر، lastmod)"""
+    yield XML_HEADER + f'<urlset xmlns="{NS}">\n'
+    for loc, lastmod in entries:
+        yield url_entry(loc, lastmod)
+    yield '</urlset>\n'
+
+
+class Section:
+    """🧩 یک بخش نقشه سایت؛ namespaces فضاهای نام کشی است که خروجی به آن وابسته است"""
+    name = ''
+    namespaces = ()
+
+    def shards(self):
+        """[(شماره شارد، lastmod)] برای ایندکس"""
+        return [(0, None)]
+
+    def entries(self, shard):
+        raise NotImplementedError
+
+
+class StaticSection(Section):
+    name = 'static'
+    paths = ('/', '/tools', '/blog')
+
+    def entries(self, shard):
+        return ((path, None) for path in self.paths)
+
+
+class ModelSection(Section):
+    """📚 بخش‌های مبتنی بر مدل با شاردهای بازه شناسه"""
+    model = None
+    fields = ()
+
+    def location(self, row):
+        raise NotImplementedError
+
+    def shards(self):
+        # یک کوئری گروه‌بندی‌شده برای lastmod همه شاردها
+        rows = (
+            self.model.objects.annotate(shard=(F('pk') - 1) / SHARD_SIZE)
+            .values('shard').annotate(lastmod=Max('updated_at')).order_by('shard')
+        )
+        return [(row['shard'], row['lastmod']) for row in rows]
+
+    def entries(self, shard):
+        rows = (
+            self.model.objects.filter(pk__gt=shard * SHARD_SIZE, pk__lte=(shard + 1) * SHARD_SIZE)
+            .order_by('pk').values_list(*self.fields)
+        )
+        for row in rows.iterator(chunk_size=1000):
+            yield self.location(row), row[-1]
+
+
+class ToolSection(ModelSection):
+    name = 'tools'
+    namespaces = ('tools',)
+    model = Tool
+    fields = ('pk', 'updated_at')
+
+    def location(self, row):
+        return f'/tools/{row[0]}'
+
+
+class PostSection(ModelSection):
+    name = 'blog'
+    namespaces = ('blog',)
+    model = Post
+    fields = ('slug', 'updated_at')
+
+    def location(self, row):
+        return f'/blog/{row[0]}'
+
+
+class CompareSection(Section):
+    """⚖️ پرتکرارترین مقایسه‌ها (tools/compare.py) که همه ابزارهایشان هنوز وجود دارند"""
+    name = 'compare'
+    namespaces = ('tools',)
+
+    def entries(self, shard):
+        sets = [ids for ids, hits in popular_sets(COMPARE_SETS)]
+        wanted = {pk for ids in sets for pk in ids}
+        updated = dict(Tool.objects.filter(pk__in=wanted).values_list('pk', 'updated_at'))
+        for ids in sets:
+            if all(pk in updated for pk in ids):
+                yield '/compare?ids=' + ','.join(map(str, ids)), max(updated[pk] for pk in ids)
+
+
+SECTIONS = {section.name: section for section in (StaticSection(), ToolSection(), PostSection(), CompareSection())}
+
+
+def render_index(base):
+    """🗂️ ایندکس: یک sitemap برای هر شارد غیرخالی هر بخش (روی همان هاست ایندکس)"""
+    yield XML_HEADER + f'<sitemapindex xmlns="{NS}">\n'
+    for section in SECTIONS.values():
+        for shard, lastmod in section.shards():
+            yield url_entry(f'/sitemap-{section.name}-{shard}.xml', lastmod, tag='sitemap', base=base)
+    yield '</sitemapindex>\n'
@@ -1,3 +1,543 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts import urls as accounts_urls
+from accounts.models import CustomUser
+from accounts.otp import issue
+from blog import urls as blog_urls
+from blog.models import Post
+from core import images, middleware
+from core.cache import ResponseCache, versioned_key
+from core.db_router import ReplicaRouter, use_replica
+from core.images import srcset
+from core.middleware import ReplicaRoutingMiddleware
+from core.query_budget import QueryRecorder, budget_for, view_methods
+from tools import urls as tools_urls
+from tools.models import Category, Tag, Technology, Tool, ToolReview
+from tools.scaledata import generate
+from tools.threads import MAX_REPLY_DEPTH
+
+
+# 🗂️ سرو فایل‌های media با هدرهای کش و Range
+class MediaServingTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        override = override_settings(MEDIA_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.write('logos/logo.png', b'0123456789')
+        self.write('logos/derived/0123456789abcdef-thumb.webp', b'webp')
+
+    def write(self, name, content):
+        path = f'{self.root}/{name}'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as handle:
+            handle.write(content)
+
+    def get(self, name, **headers):
+        return self.client.get(reverse('media', args=[name]), **headers)
+
+    def test_full_file_and_cache_headers(self):
+        response = self.get('logos/logo.png')
+        self.assertEqual((response.status_code, b''.join(response.streaming_content)), (200, b'0123456789'))
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+        self.assertIn('immutable', self.get('logos/derived/0123456789abcdef-thumb.webp')['Cache-Control'])
+        self.assertEqual(self.get('logos/logo.png', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_range_requests(self):
+        response = self.get('logos/logo.png', HTTP_RANGE='bytes=2-4')
+        self.assertEqual((response.status_code, response['Content-Range']), (206, 'bytes 2-4/10'))
+        self.assertEqual(b''.join(response.streaming_content), b'234')
+        self.assertEqual(b''.join(self.get('logos/logo.png', HTTP_RANGE='bytes=-3').streaming_content), b'789')
+        self.assertEqual(self.get('logos/logo.png', HTTP_RANGE='bytes=20-').status_code, 416)
+
+    def test_missing_and_traversal(self):
+        self.assertEqual(self.get('logos/none.png').status_code, 404)
+        self.assertEqual(self.get('../settings.py').status_code, 404)
+
+
+# 🖼️ نسخه‌های تغییر اندازه‌یافته تصاویر (core/images.py)
+class ImageVariantsTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.root, IMAGE_PROCESSING_SYNC=True)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.author = CustomUser.objects.create_user('09120000000')
+
+    def upload(self, size, color='red', fmt='JPEG', rotated=False):
+        exif = Image.Exif()
+        exif[0x010F] = 'camera'  # Make
+        if rotated:
+            exif[0x0112] = 6  # Orientation: ۹۰ درجه
+        buffer = BytesIO()
+        Image.new('RGB', size, color).save(buffer, fmt, exif=exif.tobytes())
+        return SimpleUploadedFile(f'photo.{fmt.lower()}', buffer.getvalue())
+
+    def create_post(self, slug, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(title=slug, slug=slug, excerpt='e', content='c', author=self.author, image=image)
+        post.refresh_from_db()
+        return post
+
+    def replace_image(self, post, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            post.image = image
+            post.save()
+        post.refresh_from_db()
+        return post
+
+    def open_variant(self, path):
+        with default_storage.open(path) as handle:
+            image = Image.open(handle)
+            image.load()
+        return image
+
+    def test_sizes_formats_and_metadata(self):
+        post = self.create_post('big', self.upload((2000, 1000)))
+        data = post.image_variants
+        self.assertEqual((data['source'], data['width'], data['height']), (post.image.name, 2000, 1000))
+        self.assertEqual(
+            {name: (variant['width'], variant['height']) for name, variant in data['variants'].items()},
+            {'thumb': (160, 80), 'card': (480, 240), 'full': (1600, 800)},
+        )
+        for variant in data['variants'].values():
+            for fmt, pil_format in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+                image = self.open_variant(variant[fmt])
+                self.assertEqual((image.format, image.width), (pil_format, variant['width']))
+                self.assertEqual(len(image.getexif()), 0)
+                self.assertNotIn('icc_profile', image.info)
+
+    def test_orientation_and_no_upscaling(self):
+        post = self.create_post('small', self.upload((300, 200), fmt='PNG', rotated=True))
+        variants = post.image_variants['variants']
+        # ۳۰۰×۲۰۰ با چرخش EXIF → ۲۰۰×۳۰۰
+        self.assertEqual((variants['thumb']['width'], variants['thumb']['height']), (160, 240))
+        self.assertEqual((variants['card']['width'], variants['card']['height']), (200, 300))
+        self.assertEqual(variants['card'], variants['full'])  # تصویر بزرگ نمی‌شود؛ همان فایل‌ها
+
+        result = srcset(post.image_variants)
+        for fmt in ('webp', 'jpeg'):
+            self.assertEqual([entry.rsplit(' ', 1)[1] for entry in result[fmt].split(', ')], ['160w', '200w'])
+
+    def test_serializer_output(self):
+        post = self.create_post('served', self.upload((1000, 500)))
+        response = self.client.get(reverse('post-detail', args=[post.slug]))
+        image_srcset = response.json()['image_srcset']
+        self.assertEqual((image_srcset['width'], image_srcset['height']), (1000, 500))
+        self.assertTrue(image_srcset['variants']['thumb']['webp'].startswith('http://testserver/'))
+        self.assertEqual(
+            [entry.rsplit(' ', 1)[1] for entry in image_srcset['webp'].split(', ')], ['160w', '480w', '1000w'],
+        )
+
+        empty = Post.objects.create(title='e', slug='no-image', excerpt='e', content='c', author=self.author)
+        self.assertIsNone(self.client.get(reverse('post-detail', args=[empty.slug])).json()['image_srcset'])
+
+    def test_process_skips_changed_image(self):
+        post = Post.objects.create(
+            title='p', slug='raced', excerpt='e', content='c', author=self.author, image=self.upload((400, 200)),
+        )
+
+        build_variants = images.build_variants
+
+        def build_then_replace(field_file):
+            data = build_variants(field_file)
+            Post.objects.filter(pk=post.pk).update(image='blog_images/other.jpeg')
+            return data
+
+        with mock.patch.object(images, 'build_variants', side_effect=build_then_replace):
+            self.assertFalse(images.process('blog.Post', post.pk, 'image', 'image_variants'))
+        self.assertEqual(Post.objects.get(pk=post.pk).image_variants, {})
+
+    def test_prune_replaced_variants(self):
+        first = self.create_post('first', self.upload((400, 200), color='red'))
+        shared = self.create_post('shared', self.upload((400, 200), color='red'))  # همان محتوا، همان فایل‌ها
+        old_paths = {variant['webp'] for variant in first.image_variants['variants'].values()}
+        self.assertEqual(old_paths, {variant['webp'] for variant in shared.image_variants['variants'].values()})
+
+        self.replace_image(first, self.upload((400, 200), color='blue'))
+        self.assertEqual(images.prune(grace=0), [])  # هنوز ردیف shared به آن‌ها اشاره می‌کند
+
+        self.replace_image(shared, self.upload((400, 200), color='blue'))
+        self.assertEqual(images.prune(), [])  # فایل‌های تازه در مهلت grace
+        removed = images.prune(grace=0)
+        self.assertEqual({path for path in removed if path.endswith('.webp')}, old_paths)
+        self.assertFalse(any(default_storage.exists(path) for path in removed))
+        for variant in shared.image_variants['variants'].values():
+            self.assertTrue(default_storage.exists(variant['jpeg']))
+
+
+# 🗺️ نقشه سایت شاردشده
+class SitemapTests(TestCase):
+    def fetch(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content if response.streaming else [response.content]).decode()
+
+    def test_index_and_tool_shard(self):
+        cache.clear()
+        tool = Tool.objects.create(name='ابزار', description='d', website='https://a.ir')
+        index = self.fetch(reverse('sitemap'))
+        self.assertIn('/sitemap-tools-0.xml', index)
+        self.assertNotIn('/sitemap-blog-0.xml', index)  # شارد خالی در ایندکس نمی‌آید
+
+        shard = reverse('sitemap-section', args=['tools', 0])
+        self.assertIn(f'https://hooshmetr.com/tools/{tool.pk}</loc>', self.fetch(shard))
+        with self.assertNumQueries(0):
+            self.fetch(shard)  # از کش
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other = Tool.objects.create(name='دیگری', description='d', website='https://b.ir')
+        self.assertIn(f'/tools/{other.pk}</loc>', self.fetch(shard))
+
+    def test_robots_points_to_site_url(self):
+        self.assertIn(b'Sitemap: https://hooshmetr.com/sitemap.xml', self.client.get('/robots.txt').content)
+
+    def test_unknown_section(self):
+        self.assertEqual(self.client.get(reverse('sitemap-section', args=['nope', 0])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('sitemap-section', args=['static', 1])).status_code, 404)
+
+
+# 📖 مسیریابی خواندن به رپلیکا (core/db_router.py و ReplicaRoutingMiddleware)
+@mock.patch.dict(settings.DATABASES, {'replica': {**settings.DATABASES['default']}})
+class ReplicaRoutingTests(SimpleTestCase):
+    databases = {'default'}
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self.reads = []
+
+    def get_response(self, request):
+        self.reads.append(use_replica.get())
+        return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+    def shared_cache(self):
+        return override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': self.cache_dir,
+        }})
+
+    def test_db_for_read(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Tool), 'default')  # بیرون از درخواست
+        token = use_replica.set(True)
+        try:
+            self.assertEqual(router.db_for_read(Tool), 'replica')
+            self.assertEqual(router.db_for_read(Post), 'replica')
+            self.assertEqual(router.db_for_read(CustomUser), 'default')  # اپ خارج از REPLICA_APPS
+            with transaction.atomic():
+                self.assertEqual(router.db_for_read(Tool), 'default')
+        finally:
+            use_replica.reset(token)
+        self.assertEqual(router.db_for_write(Tool), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'tools'))
+
+    def test_requires_shared_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ReplicaRoutingMiddleware(self.get_response)
+
+    def test_sticky_window(self):
+        factory = RequestFactory()
+        with self.shared_cache(), mock.patch.object(middleware, 'STICKY_SECONDS', 1):
+            routing = ReplicaRoutingMiddleware(self.get_response)
+            alice, bob = {'HTTP_AUTHORIZATION': 'Bearer a'}, {'HTTP_AUTHORIZATION': 'Bearer b'}
+            routing(factory.get('/', **alice))
+            routing(factory.post('/', **alice))
+            routing(factory.get('/', **alice))
+            routing(factory.head('/', **bob))
+            routing(factory.get('/'))
+            time.sleep(1.1)
+            routing(factory.get('/', **alice))
+        self.assertEqual(self.reads, [True, False, False, True, True, True])
+
+
+# 📦 کش پاسخ (core/cache.py)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cache = ResponseCache()
+        self.calls = 0
+
+    def compute(self, value='v'):
+        def build():
+            self.calls += 1
+            return value
+        return build
+
+    def test_hit_and_miss_counters(self):
+        self.assertEqual(self.cache.fetch('k', self.compute()), 'v')
+        self.assertEqual(self.cache.fetch('k', self.compute()), 'v')
+        self.assertEqual(self.calls, 1)
+        stats = self.cache.stats()
+        self.assertEqual(stats['process'], {'hit': 1, 'stale': 0, 'miss': 1, 'wait': 0})
+        self.assertEqual(stats['shared'], stats['process'])
+
+    def test_uncacheable_values_are_not_stored(self):
+        self.cache.fetch('k', self.compute(404), cacheable=lambda value: value == 200)
+        self.assertIsNone(cache.get('k'))
+
+        # مسیر بازسازی ورودی کهنه هم همین قاعده را رعایت می‌کند
+        self.cache.fetch('k', self.compute(200), fresh=0, stale=60)
+        self.cache.fetch('k', self.compute(500), fresh=0, stale=60, cacheable=lambda value: value == 200)
+        self.assertEqual(cache.get('k')['value'], 200)
+
+    def test_stale_while_revalidate(self):
+        self.cache.fetch('k', self.compute('old'), fresh=0, stale=60)
+        # کس دیگری در حال بازسازی است: پاسخ کهنه بدون صدا زدن compute
+        self.assertTrue(cache.add('k:lock', 1))
+        self.assertEqual(self.cache.fetch('k', self.compute('new'), fresh=0, stale=60), 'old')
+        self.assertEqual(self.calls, 1)
+        cache.delete('k:lock')
+        self.assertEqual(self.cache.fetch('k', self.compute('new'), fresh=60, stale=60), 'new')
+        self.assertEqual(self.cache.fetch('k', self.compute('newer')), 'new')
+        self.assertEqual(self.cache.stats()['process'], {'hit': 1, 'stale': 1, 'miss': 2, 'wait': 0})
+
+    def test_single_flight(self):
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            time.sleep(0.2)
+            self.calls += 1
+            return 'v'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.fetch('k', slow)))]
+        threads[0].start()
+        started.wait()
+        threads.append(threading.Thread(target=lambda: results.append(self.cache.fetch('k', slow))))
+        threads[1].start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((results, self.calls), (['v', 'v'], 1))
+
+        # پروسه دیگری قفل مشترک را دارد: منتظر نتیجه آن می‌مانیم
+        self.assertTrue(cache.add('other:lock', 1))
+        threading.Timer(0.1, lambda: self.cache._store('other', 'theirs', 60, 60)).start()
+        self.assertEqual(self.cache.fetch('other', slow), 'theirs')
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.stats()['process']['wait'], 1)
+
+    def test_namespace_bump_invalidates_responses(self):
+        Tag.objects.create(name='اول')
+        url = reverse('tag-list-create')
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).content, first.content)
+
+        key = versioned_key('resp', ('taxonomy',), 'x')
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name='دوم')
+        self.assertNotEqual(versioned_key('resp', ('taxonomy',), 'x'), key)
+        self.assertIn('دوم', self.client.get(url).content.decode())
+
+
+# 🧮 بودجه کوئری همه مسیرهای API در دو اندازه داده
+def unreacted_review(user):
+    return ToolReview.objects.exclude(reactions__user=user).order_by('pk').first()
+
+
+# (نام مسیر، متد) → (آرگومان‌های مسیر، بدنه، نقش کاربر)؛ ورودی تابع‌ها: context
+REQUESTS = {
+    ('tool-list-create', 'GET'): (None, None, None),
+    ('tool-list-create', 'POST'): (None, lambda ctx: {
+        'name': 'ابزار تازه', 'description': 'd', 'website': 'https://new.ir', 'license_type': 'free',
+        'categories': [ctx['category']], 'technologies': [ctx['technology']], 'tag_ids': [ctx['tag']],
+    }, 'user'),
+    ('tool-facets', 'GET'): (None, None, None),
+    ('tool-detail', 'GET'): (lambda ctx: [ctx['tool']], None, 'user'),
+    ('tool-review-create', 'POST'): (lambda ctx: [ctx['tool']], lambda ctx: {'rating': 4, 'comment': 'c'}, 'admin'),
+    ('tool-review-list-create', 'GET'): (None, None, 'user'),
+    ('tool-review-list-create', 'POST'): (None, lambda ctx: {'tool': ctx['tool'], 'rating': 4, 'comment': 'c'}, 'admin'),
+    ('review-detail', 'GET'): (lambda ctx: [ctx['review']], None, 'user'),
+    ('review-detail', 'PUT'): (lambda ctx: [ctx['review']], lambda ctx: {'rating': 2, 'comment': 'c'}, 'admin'),
+    ('review-detail', 'PATCH'): (lambda ctx: [ctx['review']], lambda ctx: {'rating': 2}, 'admin'),
+    ('review-detail', 'DELETE'): (lambda ctx: [ctx['review']], None, 'admin'),
+    ('reaction-create', 'POST'): (None, lambda ctx: {'review': unreacted_review(ctx['user']).pk, 'type': 'like'}, 'user'),
+    ('toggle_reaction', 'POST'): (lambda ctx: [ctx['review']], lambda ctx: {'type': 'like'}, 'user'),
+    ('my-reviews', 'GET'): (None, None, 'user'),
+    ('my-reactions', 'GET'): (None, None, 'user'),
+    ('tool-compare', 'GET'): (None, None, None),
+    ('top-rated-tools', 'GET'): (None, None, None),
+    ('tag-list-create', 'GET'): (None, None, None),
+    ('tag-list-create', 'POST'): (None, lambda ctx: {'name': 'تگ تازه'}, 'user'),
+    ('category-list-create', 'GET'): (None, None, None),
+    ('category-list-create', 'POST'): (None, lambda ctx: {'name': 'دسته تازه'}, 'user'),
+    ('technology-list-create', 'GET'): (None, None, None),
+    ('technology-list-create', 'POST'): (None, lambda ctx: {'name': 'تکنولوژی تازه'}, 'user'),
+    ('tool-delete', 'DELETE'): (lambda ctx: [ctx['tool']], None, 'admin'),
+    ('admin-dashboard', 'GET'): (None, None, 'admin'),
+    ('admin-tool-edit', 'GET'): (lambda ctx: [ctx['tool']], None, 'admin'),
+    ('admin-tool-edit', 'PUT'): (lambda ctx: [ctx['tool']], lambda ctx: {
+        'name': 'نام تازه', 'description': 'd', 'website': 'https://new.ir', 'license_type': 'free',
+        'categories': [ctx['category']], 'technologies': [ctx['technology']], 'tag_ids': [ctx['tag']],
+    }, 'admin'),
+    ('admin-tool-edit', 'PATCH'): (lambda ctx: [ctx['tool']], lambda ctx: {'description': 'd2'}, 'admin'),
+    ('admin-tool-edit', 'DELETE'): (lambda ctx: [ctx['tool']], None, 'admin'),
+    ('admin-tool-catalog', 'GET'): (None, None, 'admin'),
+    ('admin-tool-catalog', 'POST'): (None, lambda ctx: {'file': SimpleUploadedFile('tools.jsonl', (
+        '{"name": "ابزار وارداتی", "description": "d", "website": "https://imp.ir", "license_type": "free", '
+        '"categories": ["c"], "tags": ["t"]}\n'
+    ).encode())}, 'admin'),
+    ('admin-cache-stats', 'GET'): (None, None, 'admin'),
+    ('send-code', 'POST'): (None, lambda ctx: {'phone': '09120000001'}, None),
+    ('verify-code', 'POST'): (None, lambda ctx: {'phone': '09120000002', 'code': issue('09120000002')}, None),
+    ('sms-stats', 'GET'): (None, None, 'admin'),
+    ('post-list', 'GET'): (None, None, None),
+    ('post-list', 'POST'): (None, lambda ctx: {'title': 'پست تازه', 'slug': 'new-post', 'excerpt': 'e', 'content': 'c'}, 'user'),
+    ('post-detail', 'GET'): (lambda ctx: [ctx['post']], None, None),
+}
+QUERY_STRINGS = {
+    'tool-compare': lambda ctx: {'ids': ctx['compare_ids']},
+    'tool-review-list-create': lambda ctx: {'tool': ctx['tool']},
+    'admin-tool-catalog': lambda ctx: {'fmt': 'jsonl'},
+}
+# دو اندازه: در اولی لیست‌ها از یک صفحه کوچک‌ترند تا N+1 در صفحه‌بندی پنهان نماند
+DATA_SIZES = (
+    {'tools': 8, 'tags': 6, 'categories': 4, 'technologies': 5, 'users': 30, 'reviews': 60, 'reactions': 150, 'otps': 5},
+    {'tools': 30, 'tags': 20, 'categories': 8, 'technologies': 10, 'users': 120, 'reviews': 400, 'reactions': 1200, 'otps': 20},
+)
+POSTS = (3, 25)
+
+
+@override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+class QueryBudgetTests(TestCase):
+    routes = [pattern for module in (tools_urls, accounts_urls, blog_urls) for pattern in module.urlpatterns]
+
+    def test_every_route_has_a_budget(self):
+        for pattern in self.routes:
+            for method in view_methods(pattern.callback):
+                with self.subTest(route=pattern.name, method=method):
+                    self.assertIsNotNone(budget_for(pattern.callback, method), "بودجه کوئری تعریف نشده")
+                    self.assertIn((pattern.name, method), REQUESTS, "درخواست نمونه در REQUESTS تعریف نشده")
+
+    def build(self, sizes, posts):
+        """🏭 داده مصنوعی + شکل ثابت برای ردیف‌های هدف (عضویت‌های ابزار و زنجیره پاسخ تا حداکثر عمق)"""
+        generate(sizes, seed=7)
+        admin = CustomUser.objects.create(mobile='09110000000', role='admin', is_staff=True)
+        Post.objects.bulk_create(Post(
+            title=f'پست {index}', slug=f'post-{index}', excerpt='e', content='c', author=admin,
+        ) for index in range(posts))
+        tools = list(Tool.objects.order_by('-rating_count', 'pk')[:3])
+        tool = tools[0]
+        tool.categories.set(Category.objects.order_by('pk')[:2])
+        tool.tags.set(Tag.objects.order_by('pk')[:3])
+        review = ToolReview.objects.filter(tool=tool, parent=None).order_by('-like_count', 'pk').first()
+        parent = review
+        for user in CustomUser.objects.exclude(toolreview__tool=tool).exclude(pk=admin.pk)[:MAX_REPLY_DEPTH + 1]:
+            parent = ToolReview.objects.create(tool=tool, user=user, parent=parent, rating=3, comment='r')
+        return {
+            'tool': tool.pk,
+            'compare_ids': ','.join(str(item.pk) for item in tools),
+            'review': review.pk,
+            'post': 'post-0',
+            'category': Category.objects.values_list('pk', flat=True).first(),
+            'technology': Technology.objects.values_list('pk', flat=True).first(),
+            'tag': Tag.objects.values_list('pk', flat=True).first(),
+            'user': review.user,
+            'tokens': {role: str(RefreshToken.for_user(account).access_token)
+                       for role, account in (('user', review.user), ('admin', admin))},
+        }
+
+    def request(self, pattern, method, ctx):
+        args, data, role = REQUESTS[(pattern.name, method)]
+        cache.clear()
+        client = APIClient()
+        if role:
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {ctx['tokens'][role]}")
+        url = reverse(pattern.name, args=args(ctx) if args else None)
+        query = QUERY_STRINGS.get(pattern.name)
+        if query:
+            url += '?' + '&'.join(f'{key}={value}' for key, value in query(ctx).items())
+        body = data(ctx) if data else None
+        options = {'format': 'multipart'} if body and 'file' in body else {'format': 'json'}
+        with QueryRecorder() as queries:
+            response = getattr(client, method.lower())(url, body, **options)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, 400, f"{pattern.name} {method}: {getattr(response, 'data', '')}")
+        return queries
+
+    def measure(self, sizes, posts):
+        """📏 تعداد کوئری هر (مسیر، متد)؛ هر درخواست در تراکنشی جدا که برگردانده می‌شود"""
+        results = {}
+        with transaction.atomic():
+            ctx = self.build(sizes, posts)
+            for pattern in self.routes:
+                for method in view_methods(pattern.callback):
+                    with transaction.atomic():
+                        results[(pattern.name, method)] = self.request(pattern, method, ctx)
+                        transaction.set_rollback(True)
+            transaction.set_rollback(True)
+        return results
+
+    def test_query_counts_are_bounded(self):
+        small, large = (self.measure(sizes, posts) for sizes, posts in zip(DATA_SIZES, POSTS))
+        failures = []
+        for pattern in self.routes:
+            for method in view_methods(pattern.callback):
+                key = (pattern.name, method)
+                budget = budget_for(pattern.callback, method)
+                counts = (len(small[key]), len(large[key]))
+                # هر رشدی با تعداد ردیف‌ها شکست است (بدون اختلاف مجاز)
+                if counts[1] != counts[0] or counts[1] > budget:
+                    failures.append(
+                        f"{pattern.name} {method}: {counts[0]} → {counts[1]} کوئری (بودجه {budget})\n"
+                        + large[key].report()
+                    )
+        if failures:
+            self.fail("\n\n" + "\n\n".join(failures))
+
+
+# ⏱️ پروفایل درخواست‌ها: Server-Timing و لاگ درخواست کند
+PROFILING_ON = {**settings.PROFILING, 'ENABLED': True, 'SLOW_REQUEST_MS': 0}
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tool = Tool.objects.create(name='ابزار', description='d', website='https://a.ir')
+
+    def get(self):
+        return self.client.get(reverse('tool-detail', args=[self.tool.pk]))
+
+    def test_disabled_by_default(self):
+        self.assertNotIn('Server-Timing', self.get())
+
+    @override_settings(PROFILING=PROFILING_ON)
+    def test_server_timing_and_slow_log(self):
+        with self.assertLogs('core.profiling', 'WARNING') as logs:
+            response = self.get()
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'serializer;dur=', 'app;dur='):
+            self.assertIn(metric, timing)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record['route'], record['status']), ('tool-detail', 200))
+        self.assertGreater(record['queries'], 0)
+        self.assertTrue(record['top_sql'][0]['sql'].startswith('SELECT'))
+
+    @override_settings(PROFILING={**PROFILING_ON, 'ROUTE_SAMPLE_RATES': {'tool-detail': 0}})
+    def test_route_sampling(self):
+        self.assertNotIn('Server-Timing', self.get())
@@ -1,9 +1,53 @@
-from django.http import HttpResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+
+from core.cache import versioned_key
+from .sitemaps import SECTIONS, SITE_URL, ModelSection, render_index, render_urlset
+
+SITEMAP_CACHE_TIMEOUT = getattr(settings, 'SITEMAP_CACHE_TIMEOUT', 60 * 60)
+SITEMAP_CONTENT_TYPE = 'application/xml; charset=utf-8'
+
 
 def robots_txt(request):
     lines = [
         "User-Agent: *",
         "Disallow: /admin/",  # جلوی ایندکس صفحه مدیریت رو می‌گیره
-        "Sitemap: https://hooshmetr.com/sitemap.xml"
+        f"Sitemap: {SITE_URL}/sitemap.xml",
     ]
-    return HttpResponse("\n".join(lines), content_type="text/plain")
\ No newline at end of file
+    return HttpResponse("\n".join(lines), content_type="text/plain")
+
+
+def cached_xml(key, chunks):
+    """
+    🗺️ پاسخ کش‌شده در صورت وجود؛ وگرنه XML تکه‌تکه استریم و
+    بعد از تولید کامل برای درخواست‌های بعدی کش می‌شود.
+    """
+    body = cache.get(key)
+    if body is not None:
+        return HttpResponse(body, content_type=SITEMAP_CONTENT_TYPE)
+
+    def stream():
+        parts = []
+        for chunk in chunks:
+            data = chunk.encode()
+            parts.append(data)
+            yield data
+        cache.set(key, b''.join(parts), SITEMAP_CACHE_TIMEOUT)
+
+    return StreamingHttpResponse(stream(), content_type=SITEMAP_CONTENT_TYPE)
+
+
+def sitemap_index(request):
+    base = request.build_absolute_uri('/').rstrip('/')
+    namespaces = {ns for section in SECTIONS.values() for ns in section.namespaces}
+    key = versioned_key('sitemap', namespaces, 'index', base)
+    return cached_xml(key, render_index(base))
+
+
+def sitemap_section(request, section, shard):
+    part = SECTIONS.get(section)
+    if part is None or (shard and not isinstance(part, ModelSection)):
+        raise Http404
+    key = versioned_key('sitemap', part.namespaces, section, shard)
+    return cached_xml(key, render_urlset(part.entries(shard)))
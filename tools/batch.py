@@ -0,0 +1,94 @@
+# tools/batch.py
+# --------------------------------------------------
+# 📦 جمع کردن کار سیگنال‌های حذف در حذف‌های آبشاری
+# --------------------------------------------------
+# حذف یک ابزار یا نظر، همه نظرها/پاسخ‌ها و ری‌اکشن‌های زیرمجموعه را هم حذف
+# می‌کند و جنگو برای هر ردیف post_delete می‌فرستد؛ یعنی برای هر ردیف یک
+# UPDATE شمارنده، یک touch و یک به‌روزرسانی رتبه‌بندی. داخل deferred_deletes()
+# گیرنده‌های post_delete فقط تغییرات را جمع می‌کنند و در پایان، برای ردیف‌هایی
+# که هنوز وجود دارند، هر کار یک بار انجام می‌شود (تعداد کوئری مستقل از تعداد
+# ردیف‌های حذف‌شده).
+# delete_tool() نظرها و ری‌اکشن‌های ابزار را با یک DELETE برای هر جدول حذف
+# می‌کند (بدون خواندن ردیف‌ها و DELETE های چندتکه با سقف پارامترها).
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from core.cache import bump_namespace
+from . import leaderboard
+from .models import ReviewReaction, Tool, ToolReview
+from .ratings import apply_rating_delta
+
+_current = ContextVar('tools_deferred_deletes', default=None)
+
+
+class DeletionBatch:
+    def __init__(self):
+        self.rating_deltas = defaultdict(lambda: [0, 0])  # tool_id → [sum, count]
+        self.reaction_deltas = defaultdict(lambda: defaultdict(int))  # review_id → {counter: delta}
+        self.tools = set()  # ابزارهایی که خلاصه امتیاز یا رتبه‌شان عوض شد
+        self.reviews = set()  # نظرهایی که ری‌اکشنشان حذف شد
+        self.namespaces = set()
+
+    def flush(self):
+        tool_ids = self.tools | set(self.rating_deltas)
+        existing_tools = set(Tool.objects.filter(pk__in=tool_ids).values_list('pk', flat=True)) if tool_ids else set()
+        for tool_id in existing_tools & set(self.rating_deltas):
+            apply_rating_delta(tool_id, *self.rating_deltas[tool_id])
+
+        if self.reaction_deltas:
+            for review_id in ToolReview.objects.filter(pk__in=self.reaction_deltas).values_list('pk', flat=True):
+                ToolReview.objects.filter(pk=review_id).update(**{
+                    field: F(field) + delta for field, delta in self.reaction_deltas[review_id].items()
+                })
+
+        if existing_tools or self.reviews:
+            Tool.objects.filter(Q(pk__in=existing_tools) | Q(reviews__in=self.reviews)).touch()
+        for tool_id in existing_tools:
+            leaderboard.update_tool(tool_id)
+        if self.namespaces:
+            namespaces = tuple(sorted(self.namespaces))
+            transaction.on_commit(lambda: bump_namespace(*namespaces))
+
+
+def current_batch():
+    """📦 دسته فعال (داخل deferred_deletes) یا None"""
+    return _current.get()
+
+
+@contextmanager
+def deferred_deletes():
+    """🗑️ حذف‌های داخل این بلوک کارهای وابسته را یک‌جا و در همان تراکنش انجام می‌دهند"""
+    if _current.get() is not None:
+        yield _current.get()
+        return
+    batch = DeletionBatch()
+    token = _current.set(batch)
+    try:
+        with transaction.atomic():
+            yield batch
+            _current.reset(token)
+            token = None
+            batch.flush()
+    finally:
+        if token is not None:
+            _current.reset(token)
+
+
+def delete_tool(tool):
+    """
+    🗑️ حذف ابزار با تعداد کوئری ثابت، مستقل از تعداد نظرها و ری‌اکشن‌هایش.
+    شمارنده‌ها، touch و رتبه‌بندی همین ابزار با خودش حذف می‌شوند، پس سیگنال تک‌تک
+    ردیف‌های وابسته لازم نیست؛ فقط فضای نام نظرها (مثل مسیر عادی) بالا می‌رود.
+    پاسخ‌ها همیشه مال همان ابزار نظر والدشان هستند.
+    """
+    with deferred_deletes() as batch:
+        ReviewReaction.objects.filter(review__tool_id=tool.pk)._raw_delete(ReviewReaction.objects.db)
+        reviews = ToolReview.objects.filter(tool_id=tool.pk)
+        reviews._raw_delete(reviews.db)
+        batch.namespaces.update(('reviews', 'tools'))
+        tool.delete()
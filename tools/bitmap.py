@@ -0,0 +1,189 @@
+# tools/bitmap.py
+# --------------------------------------------------
+# 🧮 ایندکس بیت‌مپ درون‌حافظه‌ای برای ویژگی‌های ابزارها
+# --------------------------------------------------
+# برای هر ویژگی بولی، هر مقدار لایسنس، هر دسته، تگ و تکنولوژی یک
+# bitset (عدد صحیح پایتون؛ بیت i = ابزار با id برابر i) نگه داشته می‌شود.
+# ترکیب AND/OR/NOT با عملگرهای بیتی محاسبه و به‌صورت لیست id به ORM داده می‌شود.
+#
+# ایندکس در هر پروسه جداگانه ساخته می‌شود. سیگنال‌ها بعد از هر تغییر ابزار
+# نسخه فضای نام 'tool_features' را بالا می‌برند و ایندکس همین پروسه را
+# وصله می‌کنند؛ پروسه‌هایی که نسخه جدید را ببینند ایندکس را از نو می‌سازند.
+# با کش داخل پروسه (LocMem) نسخه به پروسه‌های دیگر نمی‌رسد؛ آن‌جا ایندکس
+# حداکثر بعد از TOOL_BITMAP_MAX_AGE ثانیه از نو ساخته می‌شود.
+
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from core.cache import is_shared_cache, namespace_version
+from .models import Tool
+
+NAMESPACE = 'tool_features'
+
+BOOLEAN_FEATURES = [
+    'supports_farsi', 'is_sanctioned', 'is_filtered',
+    'has_chatbot', 'multi_language_support', 'desktop_version',
+]
+
+# 🔗 روابط M2M: پیشوند عبارت ← (جدول واسط، ستون مقصد)
+RELATIONS = {
+    'category': (Tool.categories.through, 'category_id'),
+    'technology': (Tool.technologies.through, 'technology_id'),
+    'tag': (Tool.tags.through, 'tag_id'),
+}
+
+# سقف عمر ایندکس (ثانیه) وقتی کش بین پروسه‌ها مشترک نیست
+MAX_AGE = getattr(settings, 'TOOL_BITMAP_MAX_AGE', 30)
+
+# بیش از این تعداد id با یک پارامتر آرایه‌ای به دیتابیس داده می‌شود
+INLINE_IDS_LIMIT = 500
+
+
+class InvalidFeature(ValueError):
+    pass
+
+
+class ToolBitmapIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._bitmaps = {}
+        self._all = 0
+        self.version = None
+        self.built_at = None
+
+    # ---------- ساخت و وصله ----------
+
+    def _set(self, key, tool_id):
+        self._bitmaps[key] = self._bitmaps.get(key, 0) | (1 << tool_id)
+
+    def _load(self, tools, relations):
+        for tool_id, license_type, *flags in tools:
+            self._all |= 1 << tool_id
+            self._set(('license', license_type), tool_id)
+            for feature, value in zip(BOOLEAN_FEATURES, flags):
+                if value:
+                    self._set(('feature', feature), tool_id)
+        for prefix, rows in relations.items():
+            for tool_id, target_id in rows:
+                self._set((prefix, target_id), tool_id)
+
+    def _fetch(self, tool_ids=None):
+        tools = Tool.objects.all()
+        if tool_ids is not None:
+            tools = tools.filter(pk__in=tool_ids)
+        relations = {}
+        for prefix, (through, column) in RELATIONS.items():
+            rows = through.objects.all()
+            if tool_ids is not None:
+                rows = rows.filter(tool_id__in=tool_ids)
+            relations[prefix] = rows.values_list('tool_id', column).iterator()
+        return tools.values_list('id', 'license_type', *BOOLEAN_FEATURES).iterator(), relations
+
+    def rebuild(self):
+        """🔁 ساخت کامل (۴ کوئری)"""
+        with self._lock:
+            version = namespace_version(NAMESPACE)
+            self._bitmaps, self._all = {}, 0
+            self._load(*self._fetch())
+            self.version = version
+            self.built_at = time.monotonic()
+
+    def refresh_tools(self, tool_ids, version):
+        """
+        🩹 وصله ایندکس برای چند ابزار بعد از تغییر (ذخیره، حذف، تغییر M2M).
+        version نسخه‌ای است که همین تغییر ساخته؛ اگر در این فاصله پروسه دیگری
+        هم نسخه را بالا برده باشد، ایندکس در درخواست بعدی از نو ساخته می‌شود.
+        """
+        with self._lock:
+            if self.version is None:
+                return
+            mask = 0
+            for tool_id in tool_ids:
+                mask |= 1 << tool_id
+            self._all &= ~mask
+            self._bitmaps = {key: bits & ~mask for key, bits in self._bitmaps.items()}
+            self._load(*self._fetch(list(tool_ids)))
+            self.version = version if self.version == version - 1 else None
+
+    def invalidate(self):
+        with self._lock:
+            self.version = None
+
+    def _ensure_fresh(self):
+        if self.version is None or self.version != namespace_version(NAMESPACE):
+            self.rebuild()
+        elif not is_shared_cache() and time.monotonic() - self.built_at > MAX_AGE:
+            # ⏱️ تغییرات پروسه‌های دیگر دیده نمی‌شوند؛ کهنگی محدود به MAX_AGE
+            self.rebuild()
+
+    # ---------- پرس‌وجو ----------
+
+    def term(self, expression):
+        """
+        🔤 bitset یک عبارت: نام ویژگی بولی (supports_farsi)، license:free، category:3،
+        tag:5، technology:2؛ با پیشوند ! یا - نقیض می‌شود.
+        """
+        expression = expression.strip()
+        negate = expression[:1] in ('!', '-')
+        if negate:
+            expression = expression[1:].strip()
+
+        prefix, _, value = expression.partition(':')
+        if not value and prefix in BOOLEAN_FEATURES:
+            key = ('feature', prefix)
+        elif prefix == 'license' and value in dict(Tool.LICENSE_CHOICES):
+            key = ('license', value)
+        elif prefix in RELATIONS and value.isdigit():
+            key = (prefix, int(value))
+        else:
+            raise InvalidFeature(expression)
+
+        bits = self._bitmaps.get(key, 0)
+        return self._all & ~bits if negate else bits
+
+    def match_all(self, expressions):
+        """✅ AND همه عبارت‌ها"""
+        with self._lock:
+            self._ensure_fresh()
+            result = self._all
+            for expression in expressions:
+                result &= self.term(expression)
+            return result
+
+    def match_any(self, expressions):
+        """✅ OR عبارت‌ها"""
+        with self._lock:
+            self._ensure_fresh()
+            result = 0
+            for expression in expressions:
+                result |= self.term(expression)
+            return result
+
+
+def bits_to_ids(bits):
+    """🔢 شناسه‌های بیت‌های روشن (به ترتیب صعودی)"""
+    binary = bin(bits)[:1:-1]
+    return [position for position, digit in enumerate(binary) if digit == '1']
+
+
+def filter_by_ids(queryset, ids):
+    """
+    📥 محدود کردن کوئری‌ست به لیست id؛ لیست‌های بزرگ به‌صورت یک پارامتر
+    (json_each در SQLite، آرایه در PostgreSQL) فرستاده می‌شوند تا به سقف پارامترها نخورند.
+    """
+    if len(ids) <= INLINE_IDS_LIMIT:
+        return queryset.filter(pk__in=ids)
+    if connection.vendor == 'sqlite':
+        return queryset.filter(pk__in=RawSQL('SELECT value FROM json_each(%s)', [json.dumps(ids)]))
+    if connection.vendor == 'postgresql':
+        return queryset.filter(pk__in=RawSQL('SELECT unnest(%s::bigint[])', [ids]))
+    return queryset.filter(pk__in=ids)
+
+
+# 🧠 یک نمونه برای هر پروسه
+tool_index = ToolBitmapIndex()
@@ -0,0 +1,288 @@
+# tools/catalog.py
+# --------------------------------------------------
+# 📦 ورود و خروج گروهی فهرست ابزارها (JSONL / CSV)
+# --------------------------------------------------
+# - ورود: ردیف‌ها به صورت جریانی خوانده و در دسته‌های chunk_size اعتبارسنجی
+#   می‌شوند؛ هر دسته با یک bulk_create(update_conflicts) روی name (یکتا) درج یا
+#   به‌روز می‌شود، نام دسته‌بندی/تکنولوژی/تگ‌ها یک‌جا به شناسه تبدیل و ردیف‌های
+#   جدول‌های واسط گروهی نوشته می‌شوند. حافظه فقط به اندازه یک دسته است.
+# - عملیات گروهی سیگنال save/m2m_changed ندارند؛ داده‌های وابسته (ایندکس
+#   جستجو، بیت‌مپ ویژگی‌ها، رتبه‌بندی، نسخه کش‌ها) بعد از commit هر دسته
+#   صریحاً به‌روز می‌شوند.
+# - خروج: ابزارها به ترتیب شناسه در دسته‌های ثابت خوانده (۴ کوئری در هر دسته)
+#   و خط‌به‌خط تولید می‌شوند.
+
+import csv
+import io
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from core.cache import bump_namespace
+from . import leaderboard, search
+from .bitmap import NAMESPACE as FEATURES_NAMESPACE, tool_index
+from .models import Category, Technology, Tag, Tool
+
+CATALOG_CHUNK_SIZE = getattr(settings, 'TOOL_CATALOG_CHUNK_SIZE', 500)
+MAX_REPORTED_ERRORS = 100
+
+SCALAR_FIELDS = (
+    'name', 'description', 'website', 'license_type', 'supports_farsi', 'is_sanctioned',
+    'is_filtered', 'highlight_feature', 'has_chatbot', 'multi_language_support', 'desktop_version',
+)
+BOOLEAN_FIELDS = tuple(
+    name for name in SCALAR_FIELDS if Tool._meta.get_field(name).get_internal_type() == 'BooleanField'
+)
+NULLABLE_FIELDS = tuple(name for name in SCALAR_FIELDS if Tool._meta.get_field(name).null)
+# فیلد رابطه → (مدل، ستون واسط، نرمال‌سازی نام)
+RELATIONS = {
+    'categories': (Category, 'category_id', str.strip),
+    'technologies': (Technology, 'technology_id', str.strip),
+    'tags': (Tag, 'tag_id', lambda name: name.strip().lower()),  # همان نرمال‌سازی Tag.save
+}
+FIELDS = SCALAR_FIELDS + tuple(RELATIONS)
+CSV_LIST_SEPARATOR = '|'
+FORMATS = ('jsonl', 'csv')
+
+
+class ToolImportSerializer(serializers.ModelSerializer):
+    """✅ اعتبارسنجی یک ردیف ورودی بدون کوئری (یکتایی name با upsert حل می‌شود)"""
+    categories = serializers.ListField(child=serializers.CharField(max_length=50), required=False)
+    technologies = serializers.ListField(child=serializers.CharField(max_length=50), required=False)
+    tags = serializers.ListField(child=serializers.CharField(max_length=30), required=False)
+
+    class Meta:
+        model = Tool
+        fields = list(FIELDS)
+        extra_kwargs = {'name': {'validators': []}}
+
+
+# --------------------------------------------------
+# 📥 خواندن و نوشتن فرمت‌ها
+# --------------------------------------------------
+
+def read_jsonl(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line  # سریالایزر آن را به عنوان ردیف نامعتبر گزارش می‌کند
+
+
+def read_csv(lines):
+    for row in csv.DictReader(lines):
+        for field in RELATIONS:
+            if field in row:
+                value = row[field] or ''
+                row[field] = [name for name in value.split(CSV_LIST_SEPARATOR) if name.strip()]
+        for field in BOOLEAN_FIELDS:
+            if field in row:
+                row[field] = (row[field] or '').strip().lower() in ('1', 'true', 'yes', 'y')
+        for field in NULLABLE_FIELDS:
+            if row.get(field) == '':
+                row[field] = None  # CSV بین خالی و None فرقی نمی‌گذارد
+        yield row
+
+
+def write_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def write_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for row in rows:
+        writer.writerow([
+            CSV_LIST_SEPARATOR.join(row[field]) if field in RELATIONS else row[field]
+            for field in FIELDS
+        ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+WRITERS = {'jsonl': write_jsonl, 'csv': write_csv}
+
+
+# --------------------------------------------------
+# 📤 خروج
+# --------------------------------------------------
+
+def export_rows(queryset=None, chunk_size=CATALOG_CHUNK_SIZE):
+    """📤 ردیف‌های dict به ترتیب شناسه؛ هر دسته: ابزارها + نام‌های سه رابطه"""
+    queryset = (queryset if queryset is not None else Tool.objects.all()).order_by('pk')
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk).values('pk', *SCALAR_FIELDS)[:chunk_size])
+        if not chunk:
+            return
+        ids = [row['pk'] for row in chunk]
+        names = {}
+        for field, (model, column, _) in RELATIONS.items():
+            through = getattr(Tool, field).through
+            pairs = through.objects.filter(tool_id__in=ids).order_by('pk').values_list(
+                'tool_id', f'{column[:-3]}__name',
+            )
+            for tool_id, name in pairs:
+                names.setdefault((tool_id, field), []).append(name)
+        for row in chunk:
+            pk = row.pop('pk')
+            for field in RELATIONS:
+                row[field] = names.get((pk, field), [])
+            yield row
+        last_pk = ids[-1]
+
+
+def export_catalog(fmt, queryset=None):
+    """📄 خطوط خروجی در فرمت داده‌شده (برای فایل یا StreamingHttpResponse)"""
+    return WRITERS[fmt](export_rows(queryset))
+
+
+# --------------------------------------------------
+# 📥 ورود
+# --------------------------------------------------
+
+def resolve_names(model, wanted):
+    """🔤 نام → شناسه؛ نام‌های جدید یک‌جا ساخته می‌شوند (در نام‌های تکراری، قدیمی‌ترین ردیف)"""
+    if not wanted:
+        return {}
+    ids = {}
+    for pk, name in model.objects.filter(name__in=wanted).order_by('-pk').values_list('pk', 'name'):
+        ids[name] = pk
+    missing = [model(name=name) for name in sorted(wanted - ids.keys())]
+    if missing:
+        model.objects.bulk_create(missing, ignore_conflicts=model is Tag)
+        for pk, name in model.objects.filter(name__in=[obj.name for obj in missing]).order_by('-pk').values_list('pk', 'name'):
+            ids[name] = pk
+    return ids
+
+
+def sync_relation(field, targets):
+    """
+    🔗 همگام‌سازی ردیف‌های واسط {tool_id: {target_id}} با حداقل حذف و درج.
+    خروجی: شناسه ابزارهایی که عضویتشان عوض شد.
+    """
+    through = getattr(Tool, field).through
+    column = RELATIONS[field][1]
+    stale, present, changed = [], set(), set()
+    for pk, tool_id, target_id in through.objects.filter(tool_id__in=targets).values_list('pk', 'tool_id', column):
+        if target_id in targets[tool_id]:
+            present.add((tool_id, target_id))
+        else:
+            stale.append(pk)
+            changed.add(tool_id)
+    if stale:
+        through.objects.filter(pk__in=stale).delete()
+    missing = [(tool_id, target_id) for tool_id, target_ids in targets.items()
+               for target_id in target_ids if (tool_id, target_id) not in present]
+    through.objects.bulk_create([through(tool_id=tool_id, **{column: target_id}) for tool_id, target_id in missing])
+    changed.update(tool_id for tool_id, _ in missing)
+    return changed
+
+
+def import_chunk(rows):
+    """
+    💾 درج/به‌روزرسانی یک دسته ردیف معتبر در یک تراکنش.
+    خروجی: (تعداد ایجادشده، تعداد به‌روزشده)
+    """
+    rows = {row['name']: row for row in rows}  # نام تکراری در یک دسته: آخرین ردیف
+    with transaction.atomic():
+        existing = {
+            values['name']: values
+            for values in Tool.objects.filter(name__in=rows).values('pk', *SCALAR_FIELDS)
+        }
+
+        # 🔁 ردیف‌های جدید و تغییرکرده با یک INSERT ... ON CONFLICT(name) DO UPDATE؛ اگر ورود
+        # همزمان دیگری همین نام را بین SELECT بالا و این دستور ساخته باشد، به‌روز می‌شود نه خطا
+        upserts, updated_names = [], set()
+        for name, row in rows.items():
+            scalars = {field: value for field, value in row.items() if field in SCALAR_FIELDS}
+            current = existing.get(name)
+            if current is not None:
+                if all(current[field] == value for field, value in scalars.items()):
+                    continue
+                scalars = {**{field: current[field] for field in SCALAR_FIELDS}, **scalars}
+                updated_names.add(name)
+            upserts.append(Tool(**scalars))
+        if upserts:
+            Tool.objects.bulk_create(
+                upserts, update_conflicts=True, unique_fields=['name'],
+                update_fields=list(SCALAR_FIELDS[1:]) + ['updated_at'],
+            )
+
+        tool_ids = {name: values['pk'] for name, values in existing.items()}
+        if any(tool.pk is None for tool in upserts):  # بک‌اندی که شناسه برنمی‌گرداند
+            tool_ids.update(Tool.objects.filter(name__in=[tool.name for tool in upserts]).values_list('name', 'pk'))
+        else:
+            tool_ids.update((tool.name, tool.pk) for tool in upserts)
+        created = [tool_ids[tool.name] for tool in upserts if tool.name not in updated_names]
+        updated = [tool_ids[name] for name in updated_names]
+        touched = set(created) | set(updated)
+        relations_changed, membership_changed = set(), set()
+        for field, (model, _, normalize) in RELATIONS.items():
+            provided = {name: [normalize(value) for value in row[field] if normalize(value)]
+                        for name, row in rows.items() if field in row}
+            if not provided:
+                continue
+            ids = resolve_names(model, {value for values in provided.values() for value in values})
+            changed = sync_relation(field, {
+                tool_ids[name]: {ids[value] for value in values} for name, values in provided.items()
+            })
+            relations_changed |= changed
+            if field != 'technologies':
+                membership_changed |= changed
+
+        touched |= relations_changed
+        relations_changed -= set(created)  # ابزار تازه نسخه روابط قبلی ندارد
+        if relations_changed:
+            Tool.objects.filter(pk__in=relations_changed).touch(relations=True)
+        transaction.on_commit(lambda: refresh_derived(touched, membership_changed))
+    return len(created), len(updated)
+
+
+def refresh_derived(tool_ids, membership_changed):
+    """🔁 کارهایی که سیگنال‌ها برای ذخیره تکی انجام می‌دهند، یک‌جا برای کل دسته"""
+    if not tool_ids:
+        return
+    search.index_tools(tool_ids)
+    version = bump_namespace('tools', 'taxonomy', FEATURES_NAMESPACE)[FEATURES_NAMESPACE]
+    tool_index.refresh_tools(tool_ids, version)
+    # فقط ابزارهای دارای امتیاز در رتبه‌بندی هستند
+    for tool_id in Tool.objects.filter(pk__in=membership_changed, rating_count__gt=0).values_list('pk', flat=True):
+        leaderboard.sync_tool(tool_id)
+
+
+def import_catalog(lines, fmt, chunk_size=CATALOG_CHUNK_SIZE, dry_run=False):
+    """
+    📥 ورود جریانی از خطوط متن. ردیف‌های نامعتبر رد و گزارش می‌شوند.
+    خروجی: {'rows', 'created', 'updated', 'invalid', 'errors': [{'row', 'errors'}, ...]}
+    """
+    report = {'rows': 0, 'created': 0, 'updated': 0, 'invalid': 0, 'errors': []}
+    records = iter(READERS[fmt](lines))
+    validator = ToolImportSerializer()  # فیلدها یک بار ساخته می‌شوند (مثل child در ListSerializer)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return report
+        valid = []
+        for record in chunk:
+            report['rows'] += 1
+            try:
+                valid.append(validator.run_validation(record))
+            except serializers.ValidationError as exc:
+                report['invalid'] += 1
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    report['errors'].append({'row': report['rows'], 'errors': exc.detail})
+        if valid and not dry_run:
+            created, updated = import_chunk(valid)
+            report['created'] += created
+            report['updated'] += updated
@@ -0,0 +1,161 @@
+# tools/compare.py
+# --------------------------------------------------
+# ⚖️ ماتریس مقایسه ابزارها (ستونی: برای هر ویژگی یک آرایه هم‌ترتیب با ابزارها)
+# --------------------------------------------------
+# ماتریس با یک کوئری values() و یک کوئری برای هر رابطه M2M ساخته می‌شود و
+# زیر مجموعه مرتب شناسه‌ها کش می‌شود؛ کلید کش هش مقدار ستون‌های مقایسه‌ای و
+# نسخه روابط همان ابزارهاست (نه updated_at که هر ری‌اکشن جلو می‌برد)، پس فقط
+# تغییر داده‌ای که در ماتریس دیده می‌شود (یا حذف ابزار) کش‌های شامل آن را باطل می‌کند.
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import ValidationError
+
+from .models import Tool
+
+COMPARE_MAX_TOOLS = getattr(settings, 'TOOL_COMPARE_MAX_TOOLS', 5)
+COMPARE_CACHE_TIMEOUT = getattr(settings, 'TOOL_COMPARE_CACHE_TIMEOUT', 60 * 60 * 24)
+COMPARE_TRACKED_SETS = getattr(settings, 'TOOL_COMPARE_TRACKED_SETS', 200)
+COMPARE_HITS_WINDOW = getattr(settings, 'TOOL_COMPARE_HITS_WINDOW', 60 * 60 * 24)
+HITS_DECAY = 0.5  # وزن درخواست‌های پنجره قبلی
+
+# 🔍 ویژگی‌های مقایسه‌ای (ستون‌های ساده جدول ابزار)
+COMPARISON_FIELDS = [
+    "name", "license_type", "supports_farsi", "has_chatbot",
+    "multi_language_support", "desktop_version",
+    "highlight_feature", "is_sanctioned", "is_filtered",
+    "avg_rating", "rating_count",
+]
+
+# 🔗 روابط چندتایی: (نام در خروجی، مدل واسط، فیلد مقصد)
+RELATION_FIELDS = [
+    ("categories", Tool.categories.through, "category"),
+    ("technologies", Tool.technologies.through, "technology"),
+    ("tags", Tool.tags.through, "tag"),
+]
+
+def parse_ids(raw):
+    """✅ شناسه‌های ?ids=2,1,2 → (1, 2)؛ ترتیب و تکرار روی کلید کش اثری ندارد"""
+    if not raw:
+        raise ValidationError({"ids": "ids parameter is required. e.g. ?ids=1,2"})
+    ids = tuple(sorted({int(pk) for pk in raw.split(',') if pk.strip().isdigit()}))
+    if not ids:
+        raise ValidationError({"ids": "at least one numeric id is required."})
+    if len(ids) > COMPARE_MAX_TOOLS:
+        raise ValidationError({"ids": f"at most {COMPARE_MAX_TOOLS} tools can be compared."})
+    return ids
+
+
+def cache_key(ids):
+    """🔑 کلید کش: شناسه‌ها + مقدار ستون‌های مقایسه‌ای و نسخه روابط هر کدام (یک کوئری روی کلید اصلی)"""
+    versions = list(
+        Tool.objects.filter(pk__in=ids).order_by('pk')
+        .values_list('pk', 'relations_version', *COMPARISON_FIELDS)
+    )
+    digest = hashlib.md5(repr(versions).encode()).hexdigest()
+    return 'tools:compare:{}:{}'.format(','.join(map(str, ids)), digest)
+
+
+def build_matrix(ids):
+    """📊 ماتریس ستونی برای ابزارهای موجود از بین ids (به ترتیب شناسه)"""
+    rows = list(Tool.objects.filter(pk__in=ids).order_by('pk').values('id', *COMPARISON_FIELDS))
+    tool_ids = [row['id'] for row in rows]
+
+    matrix = {field: [row[field] for row in rows] for field in COMPARISON_FIELDS}
+    for name, through, field in RELATION_FIELDS:
+        names = {tool_id: [] for tool_id in tool_ids}
+        links = (
+            through.objects.filter(tool_id__in=tool_ids)
+            .order_by(f'{field}__name')
+            .values_list('tool_id', f'{field}__name')
+        )
+        for tool_id, value in links:
+            names[tool_id].append(value)
+        matrix[name] = [names[tool_id] for tool_id in tool_ids]
+
+    return {
+        "ids": tool_ids,
+        "fields": COMPARISON_FIELDS + [name for name, _through, _field in RELATION_FIELDS],
+        "matrix": matrix,
+    }
+
+
+def get_matrix(ids):
+    """🗃️ ماتریس از کش یا ساخت و ذخیره آن"""
+    key = cache_key(ids)
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = build_matrix(ids)
+        cache.set(key, matrix, COMPARE_CACHE_TIMEOUT)
+    return matrix
+
+
+def _window():
+    """🕒 شماره پنجره زمانی فعلی شمارش درخواست‌ها"""
+    return int(time.time() // COMPARE_HITS_WINDOW)
+
+
+def _hits_key(member, window):
+    return f'tools:compare:hits:{window}:{member}'
+
+
+def _slot_key(member):
+    """🎰 خانه ثابت هر مجموعه در جدول COMPARE_TRACKED_SETS خانه‌ای (بر اساس هش)"""
+    slot = int(hashlib.md5(member.encode()).hexdigest()[:8], 16) % COMPARE_TRACKED_SETS
+    return f'tools:compare:slot:{slot}'
+
+
+def _scores(members):
+    """📉 امتیاز میرا: درخواست‌های پنجره فعلی + نصف درخواست‌های پنجره قبلی"""
+    window = _window()
+    keys = {member: (_hits_key(member, window), _hits_key(member, window - 1)) for member in members}
+    values = cache.get_many([key for pair in keys.values() for key in pair])
+    return {
+        member: values.get(current, 0) + values.get(previous, 0) * HITS_DECAY
+        for member, (current, previous) in keys.items()
+    }
+
+
+def record_request(ids):
+    """
+    📈 شمارش تقریبی درخواست هر مجموعه (برای گرم کردن کش صفحات «X در برابر Y»).
+    هر مجموعه شمارنده خودش را دارد که با add/incr (اتمی در Redis) بالا می‌رود و
+    بعد از دو پنجره بدون درخواست منقضی می‌شود. هر مجموعه یک خانه ثابت در جدول
+    مجموعه‌های پرتکرار دارد و فقط وقتی جای ساکن فعلی را می‌گیرد که امتیاز میرای
+    آن بیشتر شود؛ پس یک مجموعه تازه ولی پرطرفدار هم دیر یا زود وارد فهرست می‌شود.
+    """
+    if len(ids) < 2:
+        return
+    member = ','.join(map(str, ids))
+    key = _hits_key(member, _window())
+    cache.add(key, 0, COMPARE_HITS_WINDOW * 2)
+    try:
+        cache.incr(key)
+    except ValueError:  # بین add و incr منقضی شد
+        cache.set(key, 1, COMPARE_HITS_WINDOW * 2)
+
+    slot = _slot_key(member)
+    occupant = cache.get(slot)
+    if occupant == member:
+        return
+    if occupant is None:
+        cache.add(slot, member, None)
+        return
+    scores = _scores([member, occupant])
+    if scores[member] > scores[occupant]:
+        cache.set(slot, member, None)
+
+
+def popular_sets(limit):
+    """🔝 پرتکرارترین مجموعه‌های مقایسه: [(ids, score), ...]؛ مجموعه‌های کاملاً میراشده حذف می‌شوند"""
+    slots = [f'tools:compare:slot:{slot}' for slot in range(COMPARE_TRACKED_SETS)]
+    members = set(cache.get_many(slots).values())
+    scores = _scores(members)
+    ranked = sorted(
+        ((member, score) for member, score in scores.items() if score > 0),
+        key=lambda item: (-item[1], item[0]),
+    )[:limit]
+    return [(tuple(int(pk) for pk in member.split(',')), score) for member, score in ranked]
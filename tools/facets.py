@@ -0,0 +1,79 @@
+# tools/facets.py
+# --------------------------------------------------
+# 📊 شمارش فیلترها (facet) برای نوار کناری لیست ابزارها
+# --------------------------------------------------
+# همه شمارش‌ها با تعداد ثابتی کوئری گروه‌بندی‌شده روی همان مجموعه
+# فیلترشده محاسبه می‌شوند و نتیجه برای هر امضای فیلتر کش می‌شود.
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from core.cache import versioned_key
+from .bitmap import BOOLEAN_FEATURES  # ✅ ویژگی‌های بولی که شمارش می‌شوند (همان ایندکس بیت‌مپ)
+from .models import Tool
+
+FACETS_CACHE_TIMEOUT = getattr(settings, 'TOOL_FACETS_CACHE_TIMEOUT', 300)
+
+# پارامترهایی که روی مجموعه نتایج اثری ندارند
+IGNORED_PARAMS = {'cursor', 'page_size', 'ordering'}
+
+CACHE_NAMESPACES = ('tools', 'taxonomy')
+
+
+def filter_signature(query_params):
+    """🔑 امضای نرمال‌شده فیلترها: مرتب، بدون مقادیر خالی و پارامترهای صفحه‌بندی"""
+    return tuple(sorted(
+        (key, tuple(sorted(value for value in query_params.getlist(key) if value)))
+        for key in query_params
+        if key not in IGNORED_PARAMS and any(query_params.getlist(key))
+    ))
+
+
+def _relation_counts(through, field, tool_ids):
+    rows = (
+        through.objects.filter(tool_id__in=tool_ids)
+        .values(f'{field}_id', f'{field}__name')
+        .annotate(count=Count('tool_id'))
+        .order_by('-count', f'{field}__name')
+    )
+    return [
+        {'id': row[f'{field}_id'], 'name': row[f'{field}__name'], 'count': row['count']}
+        for row in rows
+    ]
+
+
+def compute_facets(queryset):
+    """
+    📊 شمارش‌ها برای مجموعه فیلترشده (۴ کوئری، مستقل از تعداد ابزارها):
+    لایسنس + ویژگی‌های بولی در یک aggregate، و یک کوئری برای هر رابطه M2M.
+    """
+    # زیرکوئری شناسه‌ها تا join های فیلتر (مثلاً نام دسته) ردیف تکراری نسازند
+    tool_ids = queryset.order_by().values('pk')
+    tools = Tool.objects.filter(pk__in=tool_ids)
+
+    aggregates = {'total': Count('id')}
+    for value, _label in Tool.LICENSE_CHOICES:
+        aggregates[f'license:{value}'] = Count('id', filter=Q(license_type=value))
+    for feature in BOOLEAN_FEATURES:
+        aggregates[f'feature:{feature}'] = Count('id', filter=Q(**{feature: True}))
+    totals = tools.aggregate(**aggregates)
+
+    return {
+        'total': totals['total'],
+        'license_type': {value: totals[f'license:{value}'] for value, _label in Tool.LICENSE_CHOICES},
+        'features': {feature: totals[f'feature:{feature}'] for feature in BOOLEAN_FEATURES},
+        'categories': _relation_counts(Tool.categories.through, 'category', tool_ids),
+        'technologies': _relation_counts(Tool.technologies.through, 'technology', tool_ids),
+        'tags': _relation_counts(Tool.tags.through, 'tag', tool_ids),
+    }
+
+
+def cached_facets(queryset, query_params):
+    """🗃️ شمارش‌ها از کش (کلید = امضای فیلتر + نسخه داده‌های ابزار)"""
+    key = versioned_key('tools:facets', CACHE_NAMESPACES, filter_signature(query_params))
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, FACETS_CACHE_TIMEOUT)
+    return facets
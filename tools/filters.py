@@ -1,8 +1,12 @@
 # tools/filters.py
 
 import django_filters
-from django.db.models import Avg, Q
+from django.db.models import Case, IntegerField, Q, When
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
 from .models import Tool, Tag
+from . import search
+from .bitmap import InvalidFeature, bits_to_ids, filter_by_ids, tool_index
 
 class ToolFilter(django_filters.FilterSet):
     # فیلتر دسته‌بندی بر اساس نام
@@ -22,6 +26,8 @@ class ToolFilter(django_filters.FilterSet):
 
     # 💡 ویژگی ترکیبی OR
     or_features = django_filters.CharFilter(method='filter_or_features')
+    # 💡 ویژگی ترکیبی AND (با ! برای نقیض)، مثلاً: supports_farsi,!is_sanctioned,has_chatbot
+    features = django_filters.CharFilter(method='filter_features')
 
     
     class Meta:
@@ -38,10 +44,11 @@ class ToolFilter(django_filters.FilterSet):
             'tag',
         ]
     def filter_min_rating(self, queryset, name, value):
-        return queryset.annotate(avg_rating=Avg('reviews__rating')).filter(avg_rating__gte=value)
+        # ⭐ میانگین ذخیره‌شده روی ابزار (ستون ایندکس‌دار)
+        return queryset.filter(avg_rating__gte=value)
 
     def filter_max_rating(self, queryset, name, value):
-        return queryset.annotate(avg_rating=Avg('reviews__rating')).filter(avg_rating__lte=value)
+        return queryset.filter(avg_rating__lte=value)
     
     def filter_or_features(self, queryset, name, value):
         """
@@ -49,9 +56,58 @@ class ToolFilter(django_filters.FilterSet):
 
         value باید به صورت comma جدا بشه مثل: supports_farsi,has_chatbot
         یعنی ابزارهایی که یکی از این ویژگی‌ها رو داشته باشن
+        (عبارت‌های license:free، category:3، tag:5، technology:2 و نقیض با ! هم پشتیبانی می‌شن)
+        🧮 محاسبه با ایندکس بیت‌مپ (tools/bitmap.py) بدون کوئری روی شرط‌ها
         """
-        conditions = Q()
-        for feature in value.split(','):
-            if hasattr(Tool, feature):
-                conditions |= Q(**{f"{feature}": True})
-        return queryset.filter(conditions)
\ No newline at end of file
+        terms = [term for term in value.split(',') if self._is_valid_term(term)]
+        if not terms:
+            return queryset
+        return filter_by_ids(queryset, bits_to_ids(tool_index.match_any(terms)))
+
+    def filter_features(self, queryset, name, value):
+        """
+        ✅ ابزارهایی که همه عبارت‌ها رو دارن (AND)، مثلاً:
+        features=supports_farsi,!is_sanctioned,has_chatbot
+        """
+        terms = [term for term in value.split(',') if term.strip()]
+        try:
+            bits = tool_index.match_all(terms)
+        except InvalidFeature as exc:
+            raise ValidationError({name: f"ویژگی نامعتبر: {exc}"})
+        return filter_by_ids(queryset, bits_to_ids(bits))
+
+    @staticmethod
+    def _is_valid_term(term):
+        try:
+            tool_index.term(term)
+        except InvalidFeature:
+            return False
+        return True
+
+
+# 🔎 جستجوی متنی رتبه‌بندی‌شده روی ایندکس ابزارها (?search=)
+class ToolSearchFilter(BaseFilterBackend):
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+
+        # یک نتیجه بیشتر از سقف: فقط برای فهمیدن این‌که نتایج بریده شده‌اند
+        ranked_ids = search.search_tools(query, limit=search.SEARCH_MAX_RESULTS + 1)
+        if ranked_ids is None:
+            # دیتابیس بدون ایندکس متنی: جستجوی ساده
+            return queryset.filter(Q(name__icontains=query) | Q(description__icontains=query))
+        # ✂️ در پاسخ لیست اعلام می‌شود (ToolCursorPagination)
+        view.search_truncated = len(ranked_ids) > search.SEARCH_MAX_RESULTS
+        ranked_ids = ranked_ids[:search.SEARCH_MAX_RESULTS]
+        if not ranked_ids:
+            return queryset.none()
+
+        # 🏅 رتبه هر ابزار (۰ = مرتبط‌ترین) برای مرتب‌سازی و صفحه‌بندی
+        search_rank = Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(ranked_ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=ranked_ids).annotate(search_rank=search_rank)
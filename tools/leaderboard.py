@@ -0,0 +1,161 @@
+# tools/leaderboard.py
+# --------------------------------------------------
+# 🏆 رتبه‌بندی ابزارها با میانگین بیزی (کل، هر دسته، هر تگ)
+# --------------------------------------------------
+# امتیاز = (C·m + مجموع امتیازها) / (C + تعداد نظرات)
+# یعنی هر ابزار با C نظر فرضی با امتیاز m شروع می‌کند؛ یک نظر ۵ ستاره
+# دیگر از ۴۰۰ نظر با میانگین ۴.۸ جلو نمی‌زند.
+# امتیاز فقط به مجموع و تعداد همان ابزار وابسته است، پس با هر نظر فقط
+# ردیف‌های همان ابزار (یکی در هر محدوده) با یک upsert عوض می‌شوند.
+# رتبه ذخیره نمی‌شود: هنگام خواندن از ایندکس (scope, scope_id, -score, tool)
+# به‌دست می‌آید (۱ + تعداد ابزارهای بهتر)، پس نوشتن‌ها رتبه دیگران را جابه‌جا
+# نمی‌کنند و قفلی روی محدوده لازم نیست.
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Tool, ToolRanking
+
+PRIOR_MEAN = getattr(settings, 'LEADERBOARD_PRIOR_MEAN', 3.0)  # m
+PRIOR_WEIGHT = getattr(settings, 'LEADERBOARD_PRIOR_WEIGHT', 10)  # C
+
+ALL = ('all', 0)
+
+
+def bayesian_score(rating_sum, rating_count):
+    """⭐ میانگین بیزی؛ ابزار بدون نظر در رتبه‌بندی نیست (None)"""
+    if not rating_count:
+        return None
+    return (PRIOR_WEIGHT * PRIOR_MEAN + rating_sum) / (PRIOR_WEIGHT + rating_count)
+
+
+def tool_scopes(tool_id):
+    """📦 محدوده‌هایی که ابزار در آن‌ها رتبه دارد"""
+    scopes = [ALL]
+    scopes += [('category', pk) for pk in Tool.categories.through.objects.filter(tool_id=tool_id).values_list('category_id', flat=True)]
+    scopes += [('tag', pk) for pk in Tool.tags.through.objects.filter(tool_id=tool_id).values_list('tag_id', flat=True)]
+    return scopes
+
+
+def _scopes_q(scopes):
+    q = Q(pk__in=[])
+    for scope, scope_id in scopes:
+        q |= Q(scope=scope, scope_id=scope_id)
+    return q
+
+
+def better_q(tool_id, score):
+    """🔝 ردیف‌هایی که جلوتر از ابزار با این امتیاز هستند (امتیاز بیشتر، یا برابر با شناسه کوچک‌تر)"""
+    return Q(score__gt=score) | Q(score=score, tool_id__lt=tool_id)
+
+
+def rank_of(tool_id, scope, scope_id, score):
+    """🔢 رتبه ابزار در یک محدوده (۱ = بهترین)؛ یک شمارش روی ایندکس امتیاز"""
+    return ToolRanking.objects.filter(scope=scope, scope_id=scope_id).filter(better_q(tool_id, score)).count() + 1
+
+
+def _upsert(tool_id, scopes, score):
+    # یک INSERT ... ON CONFLICT DO UPDATE برای همه محدوده‌ها
+    ToolRanking.objects.bulk_create(
+        [ToolRanking(scope=scope, scope_id=scope_id, tool_id=tool_id, score=score) for scope, scope_id in scopes],
+        update_conflicts=True, unique_fields=['scope', 'scope_id', 'tool'], update_fields=['score'],
+    )
+
+
+def place(tool_id, scope, scope_id, score):
+    """✅ ثبت/به‌روزرسانی امتیاز ابزار در یک محدوده"""
+    _upsert(tool_id, [(scope, scope_id)], score)
+
+
+def remove(tool_id, scope, scope_id):
+    """🗑️ حذف ابزار از یک محدوده"""
+    ToolRanking.objects.filter(scope=scope, scope_id=scope_id, tool_id=tool_id).delete()
+
+
+def remove_scopes(tool_id, scope, scope_ids=None):
+    """🗑️ حذف ابزار از چند دسته/تگ (None = همه) با یک DELETE"""
+    rows = ToolRanking.objects.filter(tool_id=tool_id, scope=scope)
+    if scope_ids is not None:
+        rows = rows.filter(scope_id__in=scope_ids)
+    rows.delete()
+
+
+def remove_tools(tool_ids, scope, scope_id):
+    """🗑️ حذف چند ابزار از یک دسته/تگ با یک DELETE"""
+    ToolRanking.objects.filter(scope=scope, scope_id=scope_id, tool_id__in=tool_ids).delete()
+
+
+def place_tools(tool_ids, scope, scope_id):
+    """✅ ثبت چند ابزار در یک دسته/تگ (عضویت از سمت دسته/تگ): یک خواندن و یک upsert"""
+    rows = [
+        ToolRanking(scope=scope, scope_id=scope_id, tool_id=tool_id, score=bayesian_score(rating_sum, rating_count))
+        for tool_id, rating_sum, rating_count in
+        Tool.objects.filter(pk__in=tool_ids, rating_count__gt=0).values_list('id', 'rating_sum', 'rating_count')
+    ]
+    ToolRanking.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['scope', 'scope_id', 'tool'], update_fields=['score'],
+    )
+
+
+def update_tool(tool_id, scopes=None):
+    """🔁 هم‌گام‌سازی امتیاز ابزار با خلاصه امتیاز فعلی‌اش (بعد از ثبت/ویرایش/حذف نظر)"""
+    summary = Tool.objects.filter(pk=tool_id).values_list('rating_sum', 'rating_count').first()
+    score = bayesian_score(*summary) if summary else None
+    scopes = scopes if scopes is not None else tool_scopes(tool_id)
+    if not scopes:
+        return
+    if score is None:
+        ToolRanking.objects.filter(_scopes_q(scopes), tool_id=tool_id).delete()
+    else:
+        _upsert(tool_id, scopes, score)
+
+
+def sync_tool(tool_id):
+    """🔁 بعد از تغییر گروهی عضویت‌ها (بدون سیگنال m2m): حذف از محدوده‌های قبلی و ثبت در محدوده‌های فعلی"""
+    current = tool_scopes(tool_id)
+    with transaction.atomic():
+        ToolRanking.objects.filter(tool_id=tool_id).exclude(_scopes_q(current)).delete()
+        update_tool(tool_id, scopes=current)
+
+
+def remove_tool(tool_id):
+    """🗑️ حذف ابزار از همه محدوده‌ها (بعد از حذف خود ابزار)"""
+    ToolRanking.objects.filter(tool_id=tool_id).delete()
+
+
+def drop_scope(scope, scope_id):
+    """🗑️ حذف کامل رتبه‌بندی یک دسته/تگ حذف‌شده"""
+    ToolRanking.objects.filter(scope=scope, scope_id=scope_id).delete()
+
+
+def rebuild(batch_size=1000):
+    """
+    🏗️ ساخت دوباره کل جدول از روی خلاصه امتیازها (برای راه‌اندازی یا تغییر m و C).
+    تعداد ردیف‌های ساخته‌شده برگردانده می‌شود.
+    """
+    scores = {
+        tool_id: bayesian_score(rating_sum, rating_count)
+        for tool_id, rating_sum, rating_count in
+        Tool.objects.filter(rating_count__gt=0).values_list('id', 'rating_sum', 'rating_count').iterator()
+    }
+
+    members = defaultdict(list)
+    members[ALL] = list(scores)
+    for scope, through, field in (('category', Tool.categories.through, 'category_id'),
+                                  ('tag', Tool.tags.through, 'tag_id')):
+        for tool_id, scope_id in through.objects.filter(tool__rating_count__gt=0).values_list('tool_id', field).iterator():
+            members[(scope, scope_id)].append(tool_id)
+
+    rows = [
+        ToolRanking(scope=scope, scope_id=scope_id, tool_id=tool_id, score=scores[tool_id])
+        for (scope, scope_id), tool_ids in members.items()
+        for tool_id in tool_ids
+    ]
+
+    with transaction.atomic():
+        ToolRanking.objects.all().delete()
+        ToolRanking.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
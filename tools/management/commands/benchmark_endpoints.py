@@ -0,0 +1,67 @@
+# tools/management/commands/benchmark_endpoints.py
+# --------------------------------------------------
+# ⏱️ بنچمارک endpointها روی داده مصنوعی در چند اندازه و مقایسه با baseline
+# --------------------------------------------------
+# هر اجرا یک پایگاه داده تست جدا می‌سازد (پایگاه داده توسعه دست نمی‌خورد)،
+# برای هر اندازه آن را با generate_scale_data پر و سناریوها را اجرا می‌کند.
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.benchmark import (
+    BENCHMARK_BASELINES, BENCHMARK_THRESHOLD, compare, load_baselines, run_suite, save_baselines,
+)
+from tools.scaledata import PRESETS, generate
+
+
+class Command(BaseCommand):
+    help = "اندازه‌گیری p50/p95/p99، تعداد کوئری و حافظه endpointهای اصلی و شکست در صورت پسرفت نسبت به baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', choices=PRESETS, default=['tiny', 'small'])
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--baseline', default=BENCHMARK_BASELINES, help="مسیر فایل baseline")
+        parser.add_argument('--threshold', type=float, default=BENCHMARK_THRESHOLD, help="مثلاً 0.25 یعنی ۲۵٪")
+        parser.add_argument('--save', action='store_true', help="نتیجه این اجرا baseline جدید شود")
+
+    def handle(self, *args, **options):
+        results = {}
+        setup_test_environment(debug=False)  # DEBUG خاموش: مثل محیط واقعی و بدون پر شدن queries_log
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for size in options['sizes']:
+                call_command('flush', interactive=False, verbosity=0)
+                self.stdout.write(f"⏳ ساخت داده {size}...")
+                generate(PRESETS[size], seed=options['seed'])
+                results[size] = run_suite(options['iterations'], options['warmup'])
+                self.report(size, results[size])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['save']:
+            save_baselines(results, options['baseline'])
+            self.stdout.write(self.style.SUCCESS(f"✅ baseline در {options['baseline']} ذخیره شد."))
+            return
+
+        baseline = load_baselines(options['baseline'])
+        if not baseline:
+            self.stdout.write(self.style.WARNING("⚠️ baseline وجود ندارد؛ با --save بسازید."))
+            return
+        regressions = compare(results, baseline, options['threshold'])
+        if regressions:
+            raise CommandError("❌ پسرفت کارایی:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("✅ پسرفتی نسبت به baseline دیده نشد."))
+
+    def report(self, size, endpoints):
+        self.stdout.write(f"\n📊 {size}")
+        self.stdout.write(f"{'endpoint':<18}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'KiB':>10}")
+        for name, metrics in endpoints.items():
+            self.stdout.write(
+                f"{name:<18}{metrics['p50_ms']:>9}{metrics['p95_ms']:>9}{metrics['p99_ms']:>9}"
+                f"{metrics['queries']:>9}{metrics['peak_kib']:>10}"
+            )
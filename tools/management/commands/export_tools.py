@@ -0,0 +1,28 @@
+# tools/management/commands/export_tools.py
+# --------------------------------------------------
+# 📤 خروجی جریانی فهرست ابزارها به JSONL یا CSV
+# --------------------------------------------------
+
+from django.core.management.base import BaseCommand
+
+from tools.catalog import FORMATS, export_catalog
+
+
+class Command(BaseCommand):
+    help = "خروجی همه ابزارها (با نام دسته‌ها، تکنولوژی‌ها و تگ‌ها) به JSONL/CSV، قابل ورود دوباره با import_tools"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="مسیر فایل خروجی؛ پیش‌فرض stdout")
+        parser.add_argument('--format', choices=FORMATS, dest='fmt', help="پیش‌فرض: از پسوند فایل")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['fmt'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        if path == '-':
+            for line in export_catalog(fmt):
+                self.stdout.write(line, ending='')
+            return
+
+        with open(path, 'w', encoding='utf-8', newline='') as target:
+            target.writelines(export_catalog(fmt))
+        self.stdout.write(self.style.SUCCESS(f"✅ خروجی در {path} نوشته شد."))
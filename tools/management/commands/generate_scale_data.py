@@ -0,0 +1,38 @@
+# tools/management/commands/generate_scale_data.py
+# --------------------------------------------------
+# 🏭 تولید داده مصنوعی در مقیاس واقعی برای بارسنجی (tools/scaledata.py)
+# --------------------------------------------------
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tools.scaledata import PRESETS, SIZE_NAMES, already_generated, generate
+
+
+class Command(BaseCommand):
+    help = "تولید قطعی ابزار، تگ، کاربر، نظر (با پاسخ)، ری‌اکشن و کد تأیید با درج گروهی (روی پایگاه داده توسعه)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--preset', choices=PRESETS, default='small', help="اندازه‌های آماده (پیش‌فرض small)")
+        parser.add_argument('--seed', type=int, default=42, help="با seed یکسان همان داده ساخته می‌شود")
+        parser.add_argument('--batch-size', type=int, default=5000, dest='batch_size')
+        for name in SIZE_NAMES:
+            parser.add_argument(f'--{name}', type=int, help=f"تعداد {name} (جایگزین مقدار preset)")
+
+    def handle(self, *args, **options):
+        sizes = dict(PRESETS[options['preset']])
+        sizes.update({name: options[name] for name in SIZE_NAMES if options[name] is not None})
+        if sizes['reviews'] and not (sizes['tools'] and sizes['users']):
+            raise CommandError("❌ برای ساخت نظر، ابزار و کاربر لازم است.")
+        if already_generated():
+            raise CommandError("❌ داده مصنوعی قبلاً در این پایگاه داده ساخته شده است؛ ابتدا flush کنید.")
+
+        started = time.monotonic()
+        counts = generate(
+            sizes, seed=options['seed'], batch_size=options['batch_size'],
+            log=lambda message: self.stdout.write(f"⏳ {message}"),
+        )
+        for label, count in counts.items():
+            self.stdout.write(f"  {label}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"✅ داده مصنوعی در {time.monotonic() - started:.1f} ثانیه ساخته شد."))
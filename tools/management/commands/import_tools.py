@@ -0,0 +1,43 @@
+# tools/management/commands/import_tools.py
+# --------------------------------------------------
+# 📥 ورود گروهی ابزارها از فایل JSONL یا CSV (درج یا به‌روزرسانی بر اساس نام)
+# --------------------------------------------------
+
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tools.catalog import CATALOG_CHUNK_SIZE, FORMATS, import_catalog
+
+
+class Command(BaseCommand):
+    help = "ورود جریانی ابزارها از JSONL/CSV با درج و به‌روزرسانی گروهی (ردیف‌های نامعتبر گزارش می‌شوند)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="مسیر فایل ورودی؛ - برای stdin")
+        parser.add_argument('--format', choices=FORMATS, dest='fmt', help="پیش‌فرض: از پسوند فایل")
+        parser.add_argument('--chunk-size', type=int, default=CATALOG_CHUNK_SIZE, dest='chunk_size')
+        parser.add_argument('--dry-run', action='store_true', dest='dry_run', help="فقط اعتبارسنجی، بدون نوشتن")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['fmt'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        try:
+            source = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        except OSError as exc:
+            raise CommandError(f"❌ خواندن فایل ممکن نیست: {exc}")
+
+        with source:
+            try:
+                report = import_catalog(source, fmt, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+            except (UnicodeDecodeError, csv.Error) as exc:
+                raise CommandError(f"❌ فایل خوانا نیست (UTF-8 {fmt.upper()} لازم است): {exc}")
+
+        for error in report['errors']:
+            self.stderr.write(f"⚠️ ردیف {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {report['rows']} ردیف خوانده شد: {report['created']} ابزار جدید، "
+            f"{report['updated']} به‌روزرسانی، {report['invalid']} نامعتبر."
+        ))
@@ -0,0 +1,27 @@
+# tools/management/commands/process_images.py
+# --------------------------------------------------
+# 🖼️ ساخت نسخه‌های تغییر اندازه‌یافته تصاویر ابزارها و مقالات
+# --------------------------------------------------
+
+from django.core.management.base import BaseCommand
+
+from core.images import prune, sweep
+
+
+class Command(BaseCommand):
+    help = "ساخت نسخه‌های WebP/JPEG برای لوگو، اسکرین‌شات ابزارها و تصویر مقالاتی که نسخه‌شان آماده نیست"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="ساخت دوباره همه نسخه‌ها (مثلاً بعد از تغییر IMAGE_VARIANTS)")
+        parser.add_argument('--prune', action='store_true', help="بعد از ساخت، حذف نسخه‌های بدون ارجاع (تصاویر جایگزین‌شده)")
+        parser.add_argument('--dry-run', action='store_true', dest='dry_run', help="با --prune: فقط فهرست فایل‌های قابل حذف")
+
+    def handle(self, *args, **options):
+        processed = sweep(force=options['force'])
+        self.stdout.write(self.style.SUCCESS(f"✅ نسخه‌های {processed} تصویر ساخته شد."))
+        if options['prune']:
+            removed = prune(dry_run=options['dry_run'])
+            for path in removed:
+                self.stdout.write(f"🗑️ {path}")
+            verb = "قابل حذف است" if options['dry_run'] else "حذف شد"
+            self.stdout.write(self.style.SUCCESS(f"✅ {len(removed)} فایل مشتق بدون ارجاع {verb}."))
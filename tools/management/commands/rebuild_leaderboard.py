@@ -0,0 +1,16 @@
+# tools/management/commands/rebuild_leaderboard.py
+# --------------------------------------------------
+# 🏆 ساخت دوباره جدول رتبه‌بندی ابزارها (میانگین بیزی)
+# --------------------------------------------------
+
+from django.core.management.base import BaseCommand
+
+from tools.leaderboard import rebuild
+
+
+class Command(BaseCommand):
+    help = "ساخت دوباره رتبه‌بندی کل، دسته‌ها و تگ‌ها از روی خلاصه امتیاز ابزارها"
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"✅ {rows} ردیف رتبه‌بندی ساخته شد."))
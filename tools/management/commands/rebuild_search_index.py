@@ -0,0 +1,19 @@
+# tools/management/commands/rebuild_search_index.py
+# --------------------------------------------------
+# 🔎 ساخت مجدد کامل ایندکس جستجوی ابزارها
+# --------------------------------------------------
+
+from django.core.management.base import BaseCommand
+
+from tools.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "ساخت مجدد ایندکس جستجوی متنی ابزارها"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} ابزار ایندکس شد."))
@@ -0,0 +1,22 @@
+# tools/management/commands/recompute_ratings.py
+# --------------------------------------------------
+# 🔁 بازسازی خلاصه امتیاز ابزارها از روی جدول نظرات
+# --------------------------------------------------
+
+from django.core.management.base import BaseCommand
+
+from tools.ratings import recompute_ratings
+
+
+class Command(BaseCommand):
+    help = "محاسبه مجدد مجموع، تعداد و میانگین امتیاز ابزارها (رفع ناهماهنگی)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tool', type=int, action='append', dest='tool_ids',
+            help="فقط این ابزار(ها) بازسازی شوند (قابل تکرار)",
+        )
+
+    def handle(self, *args, **options):
+        changed = recompute_ratings(options['tool_ids'])
+        self.stdout.write(self.style.SUCCESS(f"✅ {changed} ابزار اصلاح شد."))
@@ -0,0 +1,52 @@
+# tools/management/commands/warm_compare_cache.py
+# --------------------------------------------------
+# 🔥 گرم کردن کش ماتریس مقایسه (صفحات «X در برابر Y»)
+# --------------------------------------------------
+
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from tools import compare
+from tools.models import Tool
+
+
+class Command(BaseCommand):
+    help = "ساخت و کش ماتریس مقایسه برای پرتکرارترین مجموعه‌ها و جفت‌های ابزارهای محبوب"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=50,
+            help="تعداد مجموعه‌های پرتکرار درخواست‌شده که گرم شوند (پیش‌فرض ۵۰)",
+        )
+        parser.add_argument(
+            '--pairs-of-top', type=int, default=0, dest='pairs_of_top',
+            help="همه جفت‌های N ابزار دارای بیشترین نظر هم گرم شوند",
+        )
+        parser.add_argument(
+            '--ids', action='append', default=[],
+            help="مجموعه مشخص، مثلاً --ids 1,2 (قابل تکرار)",
+        )
+
+    def handle(self, *args, **options):
+        sets = set()
+        for raw in options['ids']:
+            try:
+                sets.add(compare.parse_ids(raw))
+            except ValidationError as exc:
+                raise CommandError(f"❌ مجموعه نامعتبر {raw!r}: {exc}")
+
+        sets.update(ids for ids, _hits in compare.popular_sets(options['top']))
+
+        if options['pairs_of_top']:
+            top_ids = sorted(
+                Tool.objects.order_by('-rating_count', '-id')
+                .values_list('id', flat=True)[:options['pairs_of_top']]
+            )
+            sets.update(combinations(top_ids, 2))
+
+        for ids in sets:
+            compare.get_matrix(ids)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {len(sets)} ماتریس مقایسه در کش آماده شد."))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 16:04
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating_summary(apps, schema_editor):
+    Tool = apps.get_model('tools', 'Tool')
+    ToolReview = apps.get_model('tools', 'ToolReview')
+    rows = ToolReview.objects.values('tool_id').annotate(total=Sum('rating'), count=Count('id')).order_by()
+    for row in rows:
+        Tool.objects.filter(pk=row['tool_id']).update(
+            rating_sum=row['total'],
+            rating_count=row['count'],
+            avg_rating=row['total'] / row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0006_reviewreaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tool',
+            name='avg_rating',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tool',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tool',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_rating_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 16:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0007_tool_rating_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tool',
+            name='avg_rating',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tool',
+            index=models.Index(fields=['-created_at', '-id'], name='tool_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tool',
+            index=models.Index(fields=['-avg_rating', '-id'], name='tool_avg_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='toolreview',
+            index=models.Index(fields=['-created_at', '-id'], name='review_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='toolreview',
+            index=models.Index(fields=['tool', '-created_at', '-id'], name='review_tool_created_idx'),
+        ),
+    ]
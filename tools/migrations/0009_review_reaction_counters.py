@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-18 16:07
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_reaction_counters(apps, schema_editor):
+    ToolReview = apps.get_model('tools', 'ToolReview')
+    counts = ToolReview.objects.annotate(
+        likes=Count('reactions', filter=Q(reactions__type='like')),
+        dislikes=Count('reactions', filter=Q(reactions__type='dislike')),
+    ).filter(Q(likes__gt=0) | Q(dislikes__gt=0)).values_list('id', 'likes', 'dislikes')
+    for pk, likes, dislikes in counts:
+        ToolReview.objects.filter(pk=pk).update(like_count=likes, dislike_count=dislikes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0008_cursor_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='toolreview',
+            name='dislike_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='toolreview',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_reaction_counters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='toolreview',
+            index=models.Index(fields=['-like_count', '-id'], name='review_likes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='toolreview',
+            index=models.Index(fields=['tool', '-like_count', '-id'], name='review_tool_likes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='toolreview',
+            index=models.Index(fields=['-dislike_count', '-id'], name='review_dislikes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='toolreview',
+            index=models.Index(fields=['tool', '-dislike_count', '-id'], name='review_tool_dislikes_idx'),
+        ),
+    ]
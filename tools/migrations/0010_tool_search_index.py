@@ -0,0 +1,72 @@
+# 🔎 جدول ایندکس جستجوی متنی ابزارها (وابسته به نوع دیتابیس)
+
+from django.db import migrations
+
+from tools.text import normalize_text
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tools_tool_fts USING fts5("
+    "name, description, highlight_feature, tags, tokenize = 'unicode61 remove_diacritics 2')"
+)
+SQLITE_DROP = "DROP TABLE IF EXISTS tools_tool_fts"
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS tools_tool_search ("
+    "tool_id bigint PRIMARY KEY REFERENCES tools_tool (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS tools_tool_search_document_idx ON tools_tool_search USING GIN (document)",
+]
+POSTGRES_DROP = "DROP TABLE IF EXISTS tools_tool_search"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE)
+    elif vendor == 'postgresql':
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+    else:
+        return
+
+    # 📥 ایندکس ابزارهای موجود
+    Tool = apps.get_model('tools', 'Tool')
+    for tool in Tool.objects.prefetch_related('tags').iterator(chunk_size=500):
+        values = [
+            tool.id,
+            normalize_text(tool.name),
+            normalize_text(tool.description),
+            normalize_text(tool.highlight_feature),
+            normalize_text(' '.join(tag.name for tag in tool.tags.all())),
+        ]
+        if vendor == 'sqlite':
+            schema_editor.execute(
+                'INSERT INTO tools_tool_fts (rowid, name, description, highlight_feature, tags) '
+                'VALUES (%s, %s, %s, %s, %s)', values,
+            )
+        else:
+            schema_editor.execute(
+                'INSERT INTO tools_tool_search (tool_id, document) VALUES (%s, '
+                "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'D') || "
+                "setweight(to_tsvector('simple', %s), 'C') || setweight(to_tsvector('simple', %s), 'B'))",
+                values,
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_DROP)
+    elif vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0009_review_reaction_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
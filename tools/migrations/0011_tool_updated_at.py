@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 19:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def fill_updated_at(apps, schema_editor):
+    Tool = apps.get_model('tools', 'Tool')
+    Tool.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0010_tool_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tool',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
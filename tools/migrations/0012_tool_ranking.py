@@ -0,0 +1,63 @@
+# Generated by Django 5.2 on 2026-10-18 16:17
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# مقادیر پیش‌فرض LEADERBOARD_PRIOR_MEAN / LEADERBOARD_PRIOR_WEIGHT؛
+# با مقادیر دیگر بعد از مهاجرت rebuild_leaderboard را اجرا کنید
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 10
+
+
+def fill_rankings(apps, schema_editor):
+    Tool = apps.get_model('tools', 'Tool')
+    ToolRanking = apps.get_model('tools', 'ToolRanking')
+
+    scores = {
+        tool_id: (PRIOR_WEIGHT * PRIOR_MEAN + rating_sum) / (PRIOR_WEIGHT + rating_count)
+        for tool_id, rating_sum, rating_count in
+        Tool.objects.filter(rating_count__gt=0).values_list('id', 'rating_sum', 'rating_count')
+    }
+    members = defaultdict(list)
+    members[('all', 0)] = list(scores)
+    for scope, through, field in (('category', Tool.categories.through, 'category_id'),
+                                  ('tag', Tool.tags.through, 'tag_id')):
+        for tool_id, scope_id in through.objects.filter(tool__rating_count__gt=0).values_list('tool_id', field):
+            members[(scope, scope_id)].append(tool_id)
+
+    rows = []
+    for (scope, scope_id), tool_ids in members.items():
+        tool_ids.sort(key=lambda tool_id: (-scores[tool_id], tool_id))
+        rows += [
+            ToolRanking(scope=scope, scope_id=scope_id, tool_id=tool_id, score=scores[tool_id], rank=rank)
+            for rank, tool_id in enumerate(tool_ids, start=1)
+        ]
+    ToolRanking.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0011_tool_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ToolRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', 'همه ابزارها'), ('category', 'دسته\u200cبندی'), ('tag', 'تگ')], max_length=10)),
+                ('scope_id', models.PositiveIntegerField(default=0)),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveIntegerField()),
+                ('tool', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='rankings', to='tools.tool')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['scope', 'scope_id', 'rank'], name='ranking_rank_idx'), models.Index(fields=['scope', 'scope_id', '-score', 'tool'], name='ranking_score_idx')],
+                'unique_together': {('scope', 'scope_id', 'tool')},
+            },
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 16:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0012_tool_ranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tool',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tool',
+            name='screenshot_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
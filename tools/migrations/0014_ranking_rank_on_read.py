@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 17:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0013_image_variants'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='toolranking',
+            name='ranking_rank_idx',
+        ),
+        migrations.RemoveField(
+            model_name='toolranking',
+            name='rank',
+        ),
+    ]
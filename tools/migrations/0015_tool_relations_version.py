@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 17:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0014_ranking_rank_on_read'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tool',
+            name='relations_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,5 +1,7 @@
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.auth import get_user_model  # ✅ گرفتن مدل کاربر سفارشی
 
 User = get_user_model()  # ✅ استفاده از مدل کاربر تعریف‌شده در settings.py
@@ -31,8 +33,37 @@ class Tag(models.Model):
         return self.name
     
 
+# 🔢 مدل‌هایی که شمارنده‌های ذخیره‌شده دارند (فقط با UPDATE اتمی در سیگنال‌ها تغییر می‌کنند)
+class CounterFieldsMixin:
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        # ⚠️ در ویرایش معمولی، شمارنده‌ها بازنویسی نشوند تا مقدار قدیمی حافظه روی مقدار واقعی DB ننشیند
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+# 📋 کوئری‌ست ابزارها با برنامه‌ی prefetch ثابت برای هر نوع نمایش
+class ToolQuerySet(models.QuerySet):
+    def for_list(self):
+        # ✅ نمایش لیستی: فیلدهای ساده + نام تگ/دسته/تکنولوژی (هر کدام یک کوئری، مستقل از تعداد ردیف‌ها)
+        return self.prefetch_related('tags', 'categories', 'technologies')
+
+    def touch(self, relations=False):
+        # 🕒 ثبت تغییر در داده‌های وابسته (نظر، ری‌اکشن، تگ و...) بدون اجرای سیگنال‌های save
+        # relations=True: دسته/تکنولوژی/تگ یا نامشان عوض شده (نسخه روابط برای کلید کش مقایسه)
+        if relations:
+            return self.update(updated_at=timezone.now(), relations_version=F('relations_version') + 1)
+        return self.update(updated_at=timezone.now())
+
+
 # مدل اصلی ابزارهای هوش مصنوعی
-class Tool(models.Model):
+class Tool(CounterFieldsMixin, models.Model):
     # انتخاب بین رایگان، پولی، یا فریمیوم
     LICENSE_CHOICES = [
         ('free', 'رایگان'),
@@ -52,19 +83,39 @@ class Tool(models.Model):
     technologies = models.ManyToManyField(Technology)     # تکنولوژی‌های استفاده‌شده
     logo = models.ImageField(upload_to='logos/', blank=True, null=True)  # آپلود لوگو
     homepage_screenshot = models.ImageField(upload_to='screenshots/', blank=True, null=True)  # اسکرین‌شات
+    # 🖼️ نسخه‌های WebP/JPEG تغییر اندازه‌یافته (core/images.py، در پس‌زمینه ساخته می‌شوند)
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
+    screenshot_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)  # زمان ثبت خودکار
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # 🕒 آخرین تغییر خود ابزار یا داده‌های وابسته (برای ETag)
     has_chatbot = models.BooleanField(default=False)      # پشتیبانی از چت بات
     multi_language_support = models.BooleanField(default=False) # چند زبانه بودن
     desktop_version = models.BooleanField(default=False)    # پشتیبانی از نسخه ویندوز
     tags = models.ManyToManyField(Tag, blank=True)  # برچسب‌های ابزار (چندتایی و اختیاری)
 
+    # ⭐ خلاصه امتیازها (به‌صورت افزایشی با هر ثبت/ویرایش/حذف نظر به‌روز می‌شود)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)  # مجموع امتیازها
+    rating_count = models.PositiveIntegerField(default=0, editable=False)  # تعداد نظرات
+    avg_rating = models.FloatField(null=True, blank=True, editable=False)  # میانگین امتیاز
+    # 🔗 با هر تغییر عضویت یا نام دسته/تکنولوژی/تگ ابزار یکی زیاد می‌شود (tools/compare.py)
+    relations_version = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ToolQuerySet.as_manager()
+    counter_fields = ('rating_sum', 'rating_count', 'avg_rating', 'relations_version')
+
+    class Meta:
+        indexes = [
+            # 📄 هم‌خوان با ترتیب صفحه‌بندی cursor لیست‌ها
+            models.Index(fields=['-created_at', '-id'], name='tool_created_idx'),
+            models.Index(fields=['-avg_rating', '-id'], name='tool_avg_rating_idx'),
+        ]
 
     def __str__(self):
         return self.name
     
 
 # مدل نظردهی و امتیازدهی کاربران
-class ToolReview(models.Model):
+class ToolReview(CounterFieldsMixin, models.Model):
     tool = models.ForeignKey('Tool', on_delete=models.CASCADE, related_name='reviews')  # ابزار مربوطه
     user = models.ForeignKey(User, on_delete=models.CASCADE)  # کاربری که نظر داده
     rating = models.PositiveSmallIntegerField()  # امتیاز از 1 تا 5
@@ -80,8 +131,27 @@ class ToolReview(models.Model):
     )
     updated_at = models.DateTimeField(auto_now=True)  # 🕒 زمان آخرین ویرایش
 
+    # 👍👎 شمارنده ری‌اکشن‌ها (همراه با ثبت/حذف ReviewReaction به‌روز می‌شوند)
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    dislike_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('like_count', 'dislike_count')
+
     class Meta:
         unique_together = ['tool', 'user']  # ✅ فقط یک نظر برای هر ابزار از هر کاربر
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='review_created_idx'),
+            models.Index(fields=['tool', '-created_at', '-id'], name='review_tool_created_idx'),
+            models.Index(fields=['-like_count', '-id'], name='review_likes_idx'),
+            models.Index(fields=['tool', '-like_count', '-id'], name='review_tool_likes_idx'),
+            models.Index(fields=['-dislike_count', '-id'], name='review_dislikes_idx'),
+            models.Index(fields=['tool', '-dislike_count', '-id'], name='review_tool_dislikes_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # 🔒 ذخیره نظر و به‌روزرسانی خلاصه امتیاز ابزار (در سیگنال‌ها) در یک تراکنش
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f'{self.user} - {self.tool.name} - {self.rating}⭐️'
@@ -102,5 +172,35 @@ class ReviewReaction(models.Model):
     class Meta:
         unique_together = ['review', 'user']  # ✅ هر کاربر فقط یک ری‌اکشن برای هر نظر
 
+    def save(self, *args, **kwargs):
+        # 🔒 ری‌اکشن و شمارنده‌های نظر (در سیگنال‌ها) در یک تراکنش ذخیره می‌شوند
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.user} - {self.review} - {self.type}"
+
+
+# 🏆 جدول رتبه‌بندی ابزارها (امتیاز بیزی) در هر محدوده: کل، هر دسته و هر تگ
+class ToolRanking(models.Model):
+    SCOPE_CHOICES = [
+        ('all', 'همه ابزارها'),
+        ('category', 'دسته‌بندی'),
+        ('tag', 'تگ'),
+    ]
+
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    scope_id = models.PositiveIntegerField(default=0)  # شناسه دسته/تگ (برای «همه» صفر)
+    # ⚠️ بدون قید FK: ردیف‌ها بعد از حذف کامل ابزار (post_delete) پاک می‌شوند
+    tool = models.ForeignKey(Tool, on_delete=models.DO_NOTHING, db_constraint=False, related_name='rankings')
+    score = models.FloatField()  # میانگین بیزی امتیازها؛ رتبه هنگام خواندن از ترتیب امتیاز
+
+    class Meta:
+        unique_together = ['scope', 'scope_id', 'tool']
+        indexes = [
+            # 📄 خواندن N ابزار برتر = پیمایش بازه‌ای روی امتیاز؛ رتبه یک ابزار = شمارش ردیف‌های بهتر
+            models.Index(fields=['scope', 'scope_id', '-score', 'tool'], name='ranking_score_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.scope}:{self.scope_id} {self.score:.3f} {self.tool_id}'
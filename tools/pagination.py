@@ -0,0 +1,45 @@
+# tools/pagination.py
+# --------------------------------------------------
+# 📄 صفحه‌بندی‌های اختصاصی اپ ابزارها
+# --------------------------------------------------
+
+from core.pagination import DefaultCursorPagination
+from . import search
+
+
+# 🧰 لیست ابزارها: در حالت جستجو، به ترتیب ارتباط (search_rank از ToolSearchFilter)
+class ToolCursorPagination(DefaultCursorPagination):
+    def get_ordering(self, request, queryset, view):
+        if 'search_rank' in queryset.query.annotations:
+            return ('search_rank', 'id')
+        return super().get_ordering(request, queryset, view)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.search_truncated = getattr(view, 'search_truncated', None)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.search_truncated is not None:
+            # 🔎 جستجو فقط مرتبط‌ترین SEARCH_MAX_RESULTS ابزار را صفحه‌بندی می‌کند؛ بقیه با عبارت دقیق‌تر
+            response.data['search'] = {
+                'max_results': search.SEARCH_MAX_RESULTS,
+                'truncated': self.search_truncated,
+            }
+        return response
+
+
+# 🌟 ابزارهای برتر: مرتب‌سازی روی امتیاز جدول رتبه‌بندی؛ امتیاز برابر: شناسه کوچک‌تر جلوتر
+class TopRatedCursorPagination(DefaultCursorPagination):
+    ordering = ('-leaderboard_score', 'id')
+
+
+# 💬 نظرات: ترتیب بر اساس ?ordering= (جدیدترین، محبوب‌ترین، ...)
+class ReviewCursorPagination(DefaultCursorPagination):
+    ORDERINGS = {
+        'likes': ('-like_count', '-id'),
+        'dislikes': ('-dislike_count', '-id'),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        return self.ORDERINGS.get(request.query_params.get('ordering'), self.ordering)
@@ -13,8 +13,8 @@ class IsOwnerOrAdminOrReadOnly(permissions.BasePermission):
         # اجازه GET، HEAD یا OPTIONS همیشه هست
         if request.method in permissions.SAFE_METHODS:
             return True
-        # فقط اگر صاحب یا مدیر باشه
-        return obj.user == request.user or request.user.is_staff
+        # فقط اگر صاحب یا مدیر باشه (مقایسه شناسه‌ها، بدون بارگذاری obj.user)
+        return obj.user_id == request.user.id or request.user.is_staff
     
 class IsAdminUserRole(BasePermission):
     """
@@ -0,0 +1,60 @@
+# tools/ratings.py
+# --------------------------------------------------
+# ⭐ نگهداری خلاصه امتیاز ابزارها (مجموع، تعداد، میانگین)
+# --------------------------------------------------
+
+from django.db.models import Case, Count, F, FloatField, Sum, When
+from django.db.models.functions import Cast
+
+from .models import Tool, ToolReview
+
+
+def apply_rating_delta(tool_id, sum_delta, count_delta):
+    """
+    ✅ اعمال تغییر امتیاز روی ستون‌های ذخیره‌شده ابزار با یک UPDATE اتمی.
+    مقادیر سمت راست SET به مقدار قبلی ستون‌ها اشاره می‌کنند، پس میانگین
+    جدید بدون خواندن ردیف (و بدون race condition) محاسبه می‌شود.
+    """
+    if not sum_delta and not count_delta:
+        return
+
+    new_sum = F('rating_sum') + sum_delta
+    new_count = F('rating_count') + count_delta
+
+    Tool.objects.filter(pk=tool_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        avg_rating=Case(
+            When(rating_count__gt=-count_delta, then=Cast(new_sum, FloatField()) / new_count),
+            default=None,
+            output_field=FloatField(),
+        ),
+    )
+
+
+def recompute_ratings(tool_ids=None):
+    """
+    🔁 محاسبه مجدد خلاصه امتیازها از روی جدول نظرات (برای رفع ناهماهنگی).
+    تعداد ابزارهایی که مقدارشان اصلاح شد برگردانده می‌شود.
+    """
+    reviews = ToolReview.objects.all()
+    tools = Tool.objects.all()
+    if tool_ids is not None:
+        reviews = reviews.filter(tool_id__in=tool_ids)
+        tools = tools.filter(pk__in=tool_ids)
+
+    totals = {
+        row['tool_id']: (row['total'], row['count'])
+        for row in reviews.values('tool_id').annotate(total=Sum('rating'), count=Count('id')).order_by()
+    }
+
+    changed = []
+    for tool in tools.only('id', 'rating_sum', 'rating_count', 'avg_rating').iterator():
+        total, count = totals.get(tool.id, (0, 0))
+        avg = total / count if count else None
+        if (tool.rating_sum, tool.rating_count, tool.avg_rating) != (total, count, avg):
+            tool.rating_sum, tool.rating_count, tool.avg_rating = total, count, avg
+            changed.append(tool)
+
+    Tool.objects.bulk_update(changed, ['rating_sum', 'rating_count', 'avg_rating'], batch_size=500)
+    return len(changed)
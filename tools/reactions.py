@@ -0,0 +1,65 @@
+# tools/reactions.py
+# --------------------------------------------------
+# 👍👎 نگهداری شمارنده‌های لایک/دیس‌لایک نظرات
+# --------------------------------------------------
+
+from django.db.models import Count, F, Q
+
+from .models import ReviewReaction, ToolReview
+
+COUNTER_FIELDS = {
+    'like': 'like_count',
+    'dislike': 'dislike_count',
+}
+
+
+def apply_reaction_delta(review_id, removed=None, added=None):
+    """
+    ✅ یک ری‌اکشن از نوع removed کم و از نوع added اضافه می‌شود (هر کدام می‌تواند None باشد).
+    به‌روزرسانی با یک UPDATE اتمی روی ردیف نظر انجام می‌شود.
+    """
+    if removed == added:
+        return
+    changes = {}
+    if removed in COUNTER_FIELDS:
+        changes[COUNTER_FIELDS[removed]] = F(COUNTER_FIELDS[removed]) - 1
+    if added in COUNTER_FIELDS:
+        changes[COUNTER_FIELDS[added]] = F(COUNTER_FIELDS[added]) + 1
+    if changes:
+        ToolReview.objects.filter(pk=review_id).update(**changes)
+
+
+def user_reactions(user, review_ids):
+    """
+    🔍 ری‌اکشن‌های یک کاربر برای مجموعه‌ای از نظرات با یک کوئری.
+    خروجی: {review_id: type یا None}
+    """
+    reactions = dict.fromkeys(review_ids)
+    if user is not None and user.is_authenticated and reactions:
+        reactions.update(
+            ReviewReaction.objects.filter(user=user, review_id__in=list(reactions)).values_list('review_id', 'type')
+        )
+    return reactions
+
+
+def recompute_reaction_counts(review_ids=None):
+    """
+    🔁 محاسبه مجدد شمارنده‌ها از جدول ری‌اکشن‌ها (رفع ناهماهنگی).
+    تعداد نظرهایی که اصلاح شد برگردانده می‌شود.
+    """
+    reviews = ToolReview.objects.all()
+    if review_ids is not None:
+        reviews = reviews.filter(pk__in=review_ids)
+
+    counts = reviews.annotate(
+        likes=Count('reactions', filter=Q(reactions__type='like')),
+        dislikes=Count('reactions', filter=Q(reactions__type='dislike')),
+    ).values_list('id', 'like_count', 'dislike_count', 'likes', 'dislikes')
+
+    changed = [
+        ToolReview(id=pk, like_count=likes, dislike_count=dislikes)
+        for pk, like_count, dislike_count, likes, dislikes in counts.iterator()
+        if (like_count, dislike_count) != (likes, dislikes)
+    ]
+    ToolReview.objects.bulk_update(changed, ['like_count', 'dislike_count'], batch_size=500)
+    return len(changed)
@@ -0,0 +1,310 @@
+# tools/scaledata.py
+# --------------------------------------------------
+# 🏭 تولید داده مصنوعی در مقیاس واقعی (برای بارسنجی و بنچمارک)
+# --------------------------------------------------
+# - قطعی: با seed یکسان همیشه همان داده (متن، زمان‌ها، روابط) ساخته می‌شود.
+# - همه درج‌ها با bulk_create و شناسه صریح انجام می‌شوند تا پاسخ‌ها و
+#   ری‌اکشن‌ها بدون خواندن دوباره به ردیف والد اشاره کنند؛ حافظه در حد یک بافر.
+# - توزیع‌ها شکل داده واقعی را دارند: چند ابزار پرطرفدار بیشتر نظرها را
+#   می‌گیرند، بخشی از نظرها پاسخ (با عمق چندسطحی) هستند و ری‌اکشن‌ها
+#   توزیع نمایی دارند.
+# - داده‌های وابسته (خلاصه امتیاز، شمارنده ری‌اکشن‌ها) هنگام تولید حساب
+#   می‌شوند؛ ایندکس جستجو، رتبه‌بندی و نسخه کش‌ها در پایان بازسازی می‌شوند.
+
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from accounts.models import OTP, CustomUser
+from core.cache import bump_namespace
+from . import leaderboard, search
+from .bitmap import NAMESPACE as FEATURES_NAMESPACE, tool_index
+from .models import Category, ReviewReaction, Tag, Technology, Tool, ToolReview
+
+# 📏 اندازه‌های آماده؛ production همان شکل داده‌ای است که در عمل کند می‌شود
+PRESETS = {
+    'tiny': {'tools': 50, 'tags': 20, 'categories': 8, 'technologies': 10,
+             'users': 300, 'reviews': 1_000, 'reactions': 3_000, 'otps': 100},
+    'small': {'tools': 2_000, 'tags': 100, 'categories': 20, 'technologies': 30,
+              'users': 20_000, 'reviews': 40_000, 'reactions': 200_000, 'otps': 2_000},
+    'medium': {'tools': 10_000, 'tags': 300, 'categories': 30, 'technologies': 50,
+               'users': 200_000, 'reviews': 400_000, 'reactions': 2_000_000, 'otps': 20_000},
+    'production': {'tools': 50_000, 'tags': 500, 'categories': 40, 'technologies': 60,
+                   'users': 1_000_000, 'reviews': 2_000_000, 'reactions': 10_000_000, 'otps': 100_000},
+}
+SIZE_NAMES = tuple(PRESETS['tiny'])
+
+# نشانه داده تولیدشده (برای جلوگیری از تولید دوباره روی همان پایگاه داده)
+MOBILE_PREFIX = '099'               # ۰۹۹ + هشت رقم: تا ۱۰۰ میلیون شماره یکتا
+WEBSITE_PREFIX = 'https://scale.hooshmetr.test/'
+# همه زمان‌ها نسبت به یک لحظه ثابت ساخته می‌شوند (نه now) تا خروجی قطعی باشد
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+HISTORY_DAYS = 3 * 365
+
+REPLY_RATIO = 0.3       # سهم پاسخ‌ها از کل نظرها
+POPULARITY_SKEW = 0.8   # توان توزیع زیپف تعداد نظر ابزارها
+LIKE_RATIO = 0.75
+
+FA_WORDS = (
+    'ابزار', 'هوش', 'مصنوعی', 'عالی', 'سریع', 'دقیق', 'متن', 'تصویر', 'ترجمه', 'کیفیت', 'رایگان',
+    'پشتیبانی', 'فارسی', 'خوب', 'ضعیف', 'کند', 'ساده', 'کاربردی', 'پیشنهاد', 'می‌کنم', 'برای', 'کار',
+    'تولید', 'محتوا', 'برنامه‌نویسی', 'ویدیو', 'صدا', 'خلاصه', 'نتیجه', 'قیمت', 'مناسب', 'تحریم', 'فیلتر',
+    'نسخه', 'دسکتاپ', 'چت', 'پاسخ', 'دانشجو', 'پروژه', 'طراحی', 'سرعت', 'دقت', 'رابط', 'کاربری', 'واقعاً',
+)
+EN_WORDS = (
+    'ai', 'tool', 'fast', 'accurate', 'text', 'image', 'translation', 'quality', 'free', 'support', 'great',
+    'slow', 'simple', 'useful', 'recommend', 'content', 'code', 'video', 'audio', 'summary', 'price', 'model',
+    'writing', 'design', 'chat', 'assistant', 'workflow', 'api', 'desktop', 'results', 'prompt', 'agent',
+)
+TOOL_NOUNS = ('Writer', 'Vision', 'Coder', 'Studio', 'Chat', 'Voice', 'Lens', 'Mind', 'Flow', 'Forge', 'Pilot', 'Sense')
+TOOL_ADJECTIVES = ('Smart', 'Deep', 'Quick', 'Neo', 'Open', 'Hyper', 'Nova', 'Bright', 'Meta', 'Auto', 'Pixel', 'Echo')
+LICENSES = ('free', 'paid', 'freemium')
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """🕒 غیرفعال کردن موقت auto_now/auto_now_add تا زمان‌های تولیدشده ذخیره شوند"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class BulkBuffer:
+    """📦 بافر درج گروهی برای هر مدل؛ با پر شدن خالی می‌شود"""
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.rows = {}
+        self.counts = {}
+
+    def add(self, obj):
+        rows = self.rows.setdefault(type(obj), [])
+        rows.append(obj)
+        if len(rows) >= self.batch_size:
+            self.flush(type(obj))
+
+    def flush(self, model=None):
+        for current in ([model] if model else list(self.rows)):
+            rows = self.rows.pop(current, [])
+            if rows:
+                current.objects.bulk_create(rows, batch_size=self.batch_size)
+                self.counts[current] = self.counts.get(current, 0) + len(rows)
+
+
+class ScaleDataGenerator:
+    def __init__(self, sizes, seed=42, batch_size=5000, log=None):
+        self.sizes = sizes
+        self.rng = random.Random(seed)
+        self.buffer = BulkBuffer(batch_size)
+        self.log = log or (lambda message: None)
+
+    # ---------- متن و زمان ----------
+
+    def sentence(self, low, high):
+        words = FA_WORDS if self.rng.random() < 0.7 else EN_WORDS
+        return ' '.join(self.rng.choice(words) for _ in range(self.rng.randint(low, high)))
+
+    def moment(self, after=None):
+        start = after or EPOCH - timedelta(days=HISTORY_DAYS)
+        span = max((EPOCH - start).total_seconds(), 1)
+        return start + timedelta(seconds=self.rng.random() * span)
+
+    @staticmethod
+    def next_id(model):
+        return (model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+
+    # ---------- مراحل ----------
+
+    def create_taxonomy(self):
+        """🏷️ دسته‌ها، تکنولوژی‌ها و تگ‌ها با نام‌های یکتا"""
+        ids = {}
+        for model, size, make in (
+            (Category, self.sizes['categories'], lambda i: f"{self.rng.choice(FA_WORDS)} {i}"),
+            (Technology, self.sizes['technologies'], lambda i: f"{self.rng.choice(TOOL_NOUNS)}-{i}"),
+            (Tag, self.sizes['tags'], lambda i: f"{self.rng.choice(EN_WORDS + FA_WORDS)}-{i}".lower()),
+        ):
+            existing = set(model.objects.values_list('name', flat=True))
+            names = [name for name in (make(i) for i in range(size)) if name not in existing]
+            start = self.next_id(model)
+            model.objects.bulk_create(
+                [model(pk=start + i, name=name) for i, name in enumerate(names)], batch_size=self.buffer.batch_size,
+            )
+            ids[model] = list(range(start, start + len(names)))
+            self.buffer.counts[model] = len(names)
+        return ids
+
+    def create_users(self):
+        """👥 کاربران با شماره یکتای 099xxxxxxxx و رمز غیرقابل استفاده"""
+        start = self.next_id(CustomUser)
+        for i in range(self.sizes['users']):
+            self.buffer.add(CustomUser(
+                pk=start + i, mobile=f'{MOBILE_PREFIX}{i:08d}', password=f'{UNUSABLE_PASSWORD_PREFIX}scale',
+                role='admin' if i == 0 else 'user',
+            ))
+        self.buffer.flush()
+        return list(range(start, start + self.sizes['users']))
+
+    def review_counts(self):
+        """📊 تعداد نظر هر ابزار با توزیع زیپف (ابزارهای محبوب به ترتیب تصادفی)"""
+        tools, users = self.sizes['tools'], self.sizes['users']
+        weights = [1 / (rank + 1) ** POPULARITY_SKEW for rank in range(tools)]
+        self.rng.shuffle(weights)
+        total = sum(weights)
+        return [min(users, round(self.sizes['reviews'] * weight / total)) for weight in weights]
+
+    def create_catalog(self, taxonomy, user_ids):
+        """🧰 ابزارها + روابط + نظرها (با پاسخ) + ری‌اکشن‌ها، دسته‌به‌دسته در تراکنش"""
+        tool_id, review_id = self.next_id(Tool), self.next_id(ToolReview)
+        reactions_per_review = self.sizes['reactions'] / max(self.sizes['reviews'], 1)
+        categories, technologies, tags = taxonomy[Category], taxonomy[Technology], taxonomy[Tag]
+        tag_weights = [1 / (rank + 1) for rank in range(len(tags))]
+        counts = self.review_counts()
+
+        for offset in range(0, len(counts), 500):
+            with transaction.atomic():
+                for count in counts[offset:offset + 500]:
+                    tool = self.make_tool(tool_id)
+                    review_id = self.add_reviews(tool, count, review_id, user_ids, reactions_per_review)
+                    self.buffer.add(tool)
+                    self.add_relations(tool_id, categories, technologies, tags, tag_weights)
+                    tool_id += 1
+                self.buffer.flush()
+            self.log(f"{min(offset + 500, len(counts))}/{len(counts)} ابزار")
+
+    def make_tool(self, pk):
+        rng = self.rng
+        created = self.moment()
+        return Tool(
+            pk=pk,
+            name=f"{rng.choice(TOOL_ADJECTIVES)} {rng.choice(TOOL_NOUNS)} {pk}",
+            description=self.sentence(15, 60),
+            website=f'{WEBSITE_PREFIX}{pk}',
+            license_type=rng.choice(LICENSES),
+            supports_farsi=rng.random() < 0.4,
+            is_sanctioned=rng.random() < 0.2,
+            is_filtered=rng.random() < 0.15,
+            highlight_feature=self.sentence(3, 10) if rng.random() < 0.5 else None,
+            has_chatbot=rng.random() < 0.5,
+            multi_language_support=rng.random() < 0.6,
+            desktop_version=rng.random() < 0.25,
+            created_at=created,
+            updated_at=created,
+        )
+
+    def add_relations(self, pk, categories, technologies, tags, tag_weights):
+        rng = self.rng
+        for category_id in rng.sample(categories, min(len(categories), rng.randint(1, 3))):
+            self.buffer.add(Tool.categories.through(tool_id=pk, category_id=category_id))
+        for technology_id in rng.sample(technologies, min(len(technologies), rng.randint(1, 2))):
+            self.buffer.add(Tool.technologies.through(tool_id=pk, technology_id=technology_id))
+        if tags:
+            chosen = set(rng.choices(tags, weights=tag_weights, k=rng.randint(0, 6)))
+            for tag_id in chosen:
+                self.buffer.add(Tool.tags.through(tool_id=pk, tag_id=tag_id))
+
+    def add_reviews(self, tool, count, next_id, user_ids, reactions_per_review):
+        """
+        💬 نظرهای یک ابزار به ترتیب زمان؛ هر کاربر حداکثر یک نظر (unique tool/user).
+        پاسخ‌ها بیشتر به نظرهای تازه‌تر جواب می‌دهند که زنجیره‌های چندسطحی می‌سازد.
+        """
+        rng = self.rng
+        quality = rng.uniform(2.3, 4.8)
+        moments = sorted(self.moment(tool.created_at) for _ in range(count))
+        ids = list(range(next_id, next_id + count))
+        rating_sum = 0
+        for index, (pk, user_id, created) in enumerate(zip(ids, rng.sample(user_ids, count), moments)):
+            parent = None
+            if index and rng.random() < REPLY_RATIO:
+                parent = ids[max(0, index - 1 - int(rng.expovariate(0.5)))]
+            rating = min(5, max(1, round(rng.gauss(quality, 1))))
+            rating_sum += rating
+            review = ToolReview(
+                pk=pk, tool_id=tool.pk, user_id=user_id, parent_id=parent, rating=rating,
+                comment=self.sentence(4, 40) if rng.random() < 0.85 else '',
+                created_at=created, updated_at=created,
+            )
+            self.add_reactions(review, user_ids, reactions_per_review)
+            self.buffer.add(review)
+
+        tool.rating_sum, tool.rating_count = rating_sum, count
+        tool.avg_rating = rating_sum / count if count else None
+        if moments:
+            tool.updated_at = moments[-1]
+        return next_id + count
+
+    def add_reactions(self, review, user_ids, mean):
+        rng = self.rng
+        count = min(len(user_ids), int(rng.expovariate(1 / mean))) if mean else 0
+        for user_id in rng.sample(user_ids, count):
+            kind = 'like' if rng.random() < LIKE_RATIO else 'dislike'
+            if kind == 'like':
+                review.like_count += 1
+            else:
+                review.dislike_count += 1
+            self.buffer.add(ReviewReaction(
+                review_id=review.pk, user_id=user_id, type=kind, created_at=self.moment(review.created_at),
+            ))
+
+    def create_otps(self, user_ids):
+        """🔐 صف کدهای تأیید؛ بیشترشان منقضی (برای prune_otps)"""
+        phones = self.rng.sample(range(len(user_ids)), min(len(user_ids), self.sizes['otps']))
+        for number in phones:
+            self.buffer.add(OTP(
+                phone=f'{MOBILE_PREFIX}{number:08d}', code=f'{self.rng.randint(0, 99999):05d}',
+                created_at=self.moment(EPOCH - timedelta(days=7)), attempts=self.rng.randint(0, 5),
+            ))
+        self.buffer.flush()
+
+    def refresh_derived(self):
+        """🔁 داده‌هایی که درج گروهی (بدون سیگنال) به‌روز نکرده است"""
+        self.log("بازسازی ایندکس جستجو")
+        search.rebuild_index()
+        self.log("بازسازی رتبه‌بندی")
+        leaderboard.rebuild()
+        bump_namespace('tools', 'reviews', 'taxonomy', FEATURES_NAMESPACE)
+        tool_index.invalidate()
+
+    def run(self):
+        models = (Category, Technology, Tag, CustomUser, Tool, ToolReview, ReviewReaction, OTP)
+        with explicit_timestamps(Tool, ToolReview, ReviewReaction, OTP):
+            self.log("دسته‌ها، تکنولوژی‌ها و تگ‌ها")
+            taxonomy = self.create_taxonomy()
+            self.log("کاربران")
+            user_ids = self.create_users()
+            self.log("ابزارها، نظرها و ری‌اکشن‌ها")
+            self.create_catalog(taxonomy, user_ids)
+            self.log("کدهای تأیید")
+            self.create_otps(user_ids)
+
+        # شناسه‌های صریح: sequence پستگرس باید جلو برود (SQLite نیازی ندارد)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+        self.refresh_derived()
+        return {model._meta.label: count for model, count in self.buffer.counts.items()}
+
+
+def already_generated():
+    return (
+        CustomUser.objects.filter(mobile__startswith=MOBILE_PREFIX).exists()
+        or Tool.objects.filter(website__startswith=WEBSITE_PREFIX).exists()
+    )
+
+
+def generate(sizes, seed=42, batch_size=5000, log=None):
+    """🏭 تولید کامل داده؛ خروجی: تعداد ردیف‌های ساخته‌شده برای هر مدل"""
+    return ScaleDataGenerator(sizes, seed=seed, batch_size=batch_size, log=log).run()
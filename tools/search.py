@@ -0,0 +1,154 @@
+# tools/search.py
+# --------------------------------------------------
+# 🔎 ایندکس جستجوی متنی ابزارها (SQLite FTS5 / PostgreSQL tsvector)
+# --------------------------------------------------
+# ایندکس روی نام، توضیحات، ویژگی شاخص و نام تگ‌های ابزار ساخته می‌شود.
+# متن قبل از ایندکس و در زمان جستجو با tools.text نرمال می‌شود و
+# با هر ذخیره ابزار/تگ (سیگنال‌ها) به‌صورت افزایشی به‌روز می‌شود.
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Tool
+from .text import normalize_text, tokenize
+
+SEARCH_MAX_RESULTS = getattr(settings, 'TOOL_SEARCH_MAX_RESULTS', 200)
+
+SQLITE_TABLE = 'tools_tool_fts'
+POSTGRES_TABLE = 'tools_tool_search'
+
+
+def _documents(tool_ids):
+    """📄 متن نرمال‌شده هر ابزار به تفکیک ستون: (id, name, description, highlight, tags)"""
+    tools = Tool.objects.filter(pk__in=tool_ids).prefetch_related('tags').only(
+        'id', 'name', 'description', 'highlight_feature'
+    )
+    for tool in tools:
+        yield (
+            tool.id,
+            normalize_text(tool.name),
+            normalize_text(tool.description),
+            normalize_text(tool.highlight_feature),
+            normalize_text(' '.join(tag.name for tag in tool.tags.all())),
+        )
+
+
+class SqliteSearchBackend:
+    """🪶 FTS5 با رتبه‌بندی BM25 (وزن ستون‌ها: نام > تگ > ویژگی > توضیحات)"""
+
+    weights = (10.0, 1.0, 4.0, 6.0)
+
+    def index(self, tool_ids):
+        rows = list(_documents(tool_ids))
+        with connection.cursor() as cursor:
+            self._delete(cursor, tool_ids)
+            cursor.executemany(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, name, description, highlight_feature, tags) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                rows,
+            )
+
+    def remove(self, tool_ids):
+        with connection.cursor() as cursor:
+            self._delete(cursor, tool_ids)
+
+    def _delete(self, cursor, tool_ids):
+        cursor.executemany(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [(pk,) for pk in tool_ids])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+
+    def search(self, tokens, limit):
+        # هر کلمه داخل "" (بدون تفسیر عملگرها) و با تطبیق پیشوندی
+        match = ' '.join('"%s"*' % token.replace('"', '""') for token in tokens)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s '
+                f'ORDER BY bm25({SQLITE_TABLE}, {", ".join(map(str, self.weights))}) LIMIT %s',
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    """🐘 tsvector با پیکربندی simple (متن از قبل نرمال شده) و رتبه‌بندی ts_rank_cd"""
+
+    def index(self, tool_ids):
+        rows = list(_documents(tool_ids))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {POSTGRES_TABLE} (tool_id, document) VALUES (%s, '
+                "setweight(to_tsvector('simple', %s), 'A') || "
+                "setweight(to_tsvector('simple', %s), 'D') || "
+                "setweight(to_tsvector('simple', %s), 'C') || "
+                "setweight(to_tsvector('simple', %s), 'B')) "
+                'ON CONFLICT (tool_id) DO UPDATE SET document = EXCLUDED.document',
+                rows,
+            )
+
+    def remove(self, tool_ids):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {POSTGRES_TABLE} WHERE tool_id = ANY(%s)', [list(tool_ids)])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {POSTGRES_TABLE}')
+
+    def search(self, tokens, limit):
+        query = ' & '.join(f'{token}:*' for token in tokens)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tool_id FROM {POSTGRES_TABLE}, to_tsquery('simple', %s) query "
+                'WHERE document @@ query ORDER BY ts_rank_cd(document, query) DESC, tool_id LIMIT %s',
+                [query, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+BACKENDS = {
+    'sqlite': SqliteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_backend():
+    backend = BACKENDS.get(connection.vendor)
+    return backend() if backend else None
+
+
+def index_tools(tool_ids):
+    """✅ (باز)ایندکس ابزارهای داده‌شده"""
+    backend = get_backend()
+    if backend and tool_ids:
+        backend.index(list(tool_ids))
+
+
+def remove_tools(tool_ids):
+    backend = get_backend()
+    if backend and tool_ids:
+        backend.remove(list(tool_ids))
+
+
+def rebuild_index(batch_size=500):
+    """🔁 ساخت کامل ایندکس؛ تعداد ابزارهای ایندکس‌شده برگردانده می‌شود"""
+    backend = get_backend()
+    if backend is None:
+        return 0
+    backend.clear()
+    ids = list(Tool.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), batch_size):
+        backend.index(ids[start:start + batch_size])
+    return len(ids)
+
+
+def search_tools(query, limit=SEARCH_MAX_RESULTS):
+    """
+    🔎 شناسه ابزارهای منطبق با query به ترتیب ارتباط (بهترین اول).
+    روی دیتابیس‌های بدون پشتیبانی، None برمی‌گردد.
+    """
+    backend = get_backend()
+    tokens = tokenize(query)
+    if backend is None or not tokens:
+        return None
+    return backend.search(tokens, limit)
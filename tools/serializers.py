@@ -3,39 +3,67 @@
 # سریالایزرها برای تبدیل مدل‌ها به JSON (برای API)
 # -----------------------------------
 
-from django.db.models import Avg
+from django.db import models
 from rest_framework import serializers
+
+from core.images import srcset
+from core.profiling import ProfiledSerializerMixin
+from .reactions import user_reactions
+from .threads import iter_thread, load_tool_reviews, thread_limits
 from .models import Tool, Category, Technology, ToolReview, Tag, ReviewReaction  # 📌 همه مدل‌ها رو با هم ایمپورت کن
       
+# 📦 لیست نظرات: ری‌اکشن‌های کاربر جاری برای کل صفحه با یک کوئری خوانده می‌شود
+class ToolReviewListSerializer(ProfiledSerializerMixin, serializers.ListSerializer):
+    def to_representation(self, data):
+        reviews = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        # 🧵 اگر درخت پاسخ‌ها از قبل بارگذاری شده، ری‌اکشن‌های کل درخت هم همین‌جا خوانده می‌شود
+        limits = {**thread_limits(), **self.context}
+        self.child.load_my_reactions(list(iter_thread(reviews, limits['max_reply_depth'], limits['max_replies'])))
+        return super().to_representation(reviews)
+
+
 # ✅ Serializer برای ثبت نظرات کاربران
-class ToolReviewSerializer(serializers.ModelSerializer):
+class ToolReviewSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     tool_name = serializers.CharField(source="tool.name", read_only=True)
     replies = serializers.SerializerMethodField()
-    like_count = serializers.SerializerMethodField()
-    dislike_count = serializers.SerializerMethodField()
     my_reaction = serializers.SerializerMethodField()
 
-    def get_my_reaction(self, obj):
-        user = self.context["request"].user
-        if user.is_authenticated:
-            reaction = obj.reactions.filter(user=user).first()
-            return reaction.type if reaction else None
-        return None
+    def load_my_reactions(self, reviews):
+        """
+        🔍 ری‌اکشن‌های کاربر جاری برای نظرات داده‌شده را یکجا در context ذخیره می‌کند
+        (context بین سریالایزر لیست، فرزند و ریپلای‌ها مشترک است).
+        """
+        request = self.context.get("request")
+        cache = self.context.setdefault("my_reactions", {})
+        missing = [review.pk for review in reviews if review.pk not in cache]
+        if request is not None and missing:
+            cache.update(user_reactions(request.user, missing))
 
+    def get_my_reaction(self, obj):
+        cache = self.context.get("my_reactions", {})
+        if obj.pk not in cache:
+            self.load_my_reactions([obj])
+        return self.context.get("my_reactions", {}).get(obj.pk)
 
-    def get_like_count(self, obj):
-        return obj.reactions.filter(type='like').count()
+    def get_replies(self, obj):
+        limits = {**thread_limits(), **self.context}
+        depth = self.context.get("reply_depth", 0) + 1
+        if depth > limits["max_reply_depth"]:
+            return []
 
-    def get_dislike_count(self, obj):
-        return obj.reactions.filter(type='dislike').count()
+        # 🧵 پاسخ‌های از پیش بارگذاری‌شده (threads.py)؛ در غیر این صورت یک کوئری برای همین نظر
+        children = getattr(obj, "thread_replies", None)
+        if children is None:
+            children = obj.replies.select_related("user", "tool").order_by("created_at")
+        children = children[:limits["max_replies"]]
 
-    def get_replies(self, obj):
-        children = obj.replies.all().order_by("created_at")
-        return ToolReviewSerializer(children, many=True, context=self.context).data
+        context = {**self.context, "reply_depth": depth}
+        return ToolReviewSerializer(children, many=True, context=context).data
 
     class Meta:
         model = ToolReview
+        list_serializer_class = ToolReviewListSerializer
         fields = [
             "id", "tool", "tool_name", "user", "rating", "comment",
             "created_at", "updated_at", "replies", "parent", "like_count", "dislike_count", 
@@ -43,7 +71,7 @@ class ToolReviewSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = [
             "id", "user", "created_at", "updated_at",
-            "tool_name", "tool", "parent"
+            "tool_name", "tool", "parent", "like_count", "dislike_count",
         ]
 
 
@@ -61,9 +89,9 @@ class TagSerializer(serializers.ModelSerializer):
         return cleaned
 
 # ✅ سریالایزر ابزارها
-class ToolSerializer(serializers.ModelSerializer):
+class ToolSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     average_rating = serializers.SerializerMethodField()  # ⭐ فیلد محاسبه‌شونده
-    reviews = ToolReviewSerializer(many=True, read_only=True)  # 👈 نمایش همه نظرات ابزار
+    reviews = serializers.SerializerMethodField()  # 👈 نمایش همه نظرات ابزار (با درخت پاسخ‌ها)
     tags = TagSerializer(many=True, read_only=True)  # نمایش تگ‌ها
     tag_ids = serializers.PrimaryKeyRelatedField(
         queryset=Tag.objects.all(),
@@ -71,10 +99,13 @@ class ToolSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False
     )  # 🔹 این فقط برای ورودی استفاده میشه، نه نمایش
+    logo_srcset = serializers.SerializerMethodField()  # 🖼️ نسخه‌های WebP/JPEG با ابعاد
+    screenshot_srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = Tool
-        fields = '__all__'  # تمام فیلدهای مدل + average_rating
+        exclude = ['logo_variants', 'screenshot_variants', 'relations_version']  # تمام فیلدهای مدل + average_rating (نسخه‌ها در *_srcset)
+        read_only_fields = ['rating_sum', 'rating_count', 'avg_rating']
 
     
     def create(self, validated_data):
@@ -84,16 +115,78 @@ class ToolSerializer(serializers.ModelSerializer):
         return tool
 
     def update(self, instance, validated_data):
-        tag_ids = validated_data.pop('tag_ids', None)
+        # 🔗 عضویت‌ها با clear + add: تعداد کوئری ثابت، مستقل از این‌که چند عضویت عوض شده
+        relations = {'tags': validated_data.pop('tag_ids', None)}
+        for name in ('categories', 'technologies'):
+            relations[name] = validated_data.pop(name, None)
         tool = super().update(instance, validated_data)
-        if tag_ids is not None:
-            tool.tags.set(tag_ids)
+        for name, values in relations.items():
+            if values is not None:
+                getattr(tool, name).set(values, clear=True)
         return tool
 
+    def get_reviews(self, obj):
+        # 🧵 همه نظرات و پاسخ‌های ابزار با یک کوئری؛ درخت در حافظه ساخته می‌شود
+        reviews = load_tool_reviews(obj.pk)
+        return ToolReviewSerializer(reviews, many=True, context=self.context).data
+
     def get_average_rating(self, obj):
-        avg = obj.reviews.aggregate(Avg('rating'))['rating__avg']
+        # ⭐ از ستون ذخیره‌شده خوانده می‌شود (بدون کوئری اضافه)
+        avg = obj.avg_rating
         return round(avg, 1) if avg else None  # مثلاً 4.5
 
+    def get_logo_srcset(self, obj):
+        return srcset(obj.logo_variants, self.context.get('request'))
+
+    def get_screenshot_srcset(self, obj):
+        return srcset(obj.screenshot_variants, self.context.get('request'))
+
+# 📋 سریالایزر سبک برای لیست ابزارها (بدون نظرات؛ با کوئری‌ست Tool.objects.for_list())
+class ToolListSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
+    average_rating = serializers.SerializerMethodField()
+    # 🔢 شناسه‌ها (مثل ToolSerializer)؛ فرم ویرایش مدیر با همین شناسه‌ها چک‌باکس‌ها را پر می‌کند
+    tags = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    categories = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    technologies = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    logo_srcset = serializers.SerializerMethodField()
+    screenshot_srcset = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Tool
+        fields = [
+            "id", "name", "description", "website", "license_type",
+            "supports_farsi", "is_sanctioned", "is_filtered", "highlight_feature",
+            "has_chatbot", "multi_language_support", "desktop_version",
+            "logo", "homepage_screenshot", "logo_srcset", "screenshot_srcset", "created_at",
+            "categories", "technologies", "tags",
+            "average_rating", "rating_count",
+        ]
+        read_only_fields = fields
+
+    def get_average_rating(self, obj):
+        avg = obj.avg_rating
+        return round(avg, 1) if avg else None
+
+    def get_logo_srcset(self, obj):
+        return srcset(obj.logo_variants, self.context.get('request'))
+
+    def get_screenshot_srcset(self, obj):
+        return srcset(obj.screenshot_variants, self.context.get('request'))
+
+
+# 🏆 ابزار در جدول رتبه‌بندی: همان نمایش لیستی + رتبه و امتیاز بیزی
+class LeaderboardToolSerializer(ToolListSerializer):
+    rank = serializers.IntegerField(source='leaderboard_rank', read_only=True)
+    score = serializers.SerializerMethodField()
+
+    class Meta(ToolListSerializer.Meta):
+        fields = ToolListSerializer.Meta.fields + ["rank", "score"]
+        read_only_fields = fields
+
+    def get_score(self, obj):
+        return round(obj.leaderboard_score, 3)
+
+
 # ✅ سریالایزر دسته‌بندی‌ها
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -110,22 +203,14 @@ class TechnologySerializer(serializers.ModelSerializer):
 # ✅ Serializer برای ری‌اکشن نظرات
 class ReviewReactionSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
-    # ✅ فیلدهای شمارنده ری‌اکشن‌ها
-    like_count = serializers.SerializerMethodField()
-    dislike_count = serializers.SerializerMethodField()
+    # ✅ شمارنده‌های ذخیره‌شده روی نظر (بدون COUNT جداگانه)
+    like_count = serializers.IntegerField(source="review.like_count", read_only=True)
+    dislike_count = serializers.IntegerField(source="review.dislike_count", read_only=True)
 
-    def get_like_count(self, obj):
-        return obj.reactions.filter(type='like').count()
-    
-    def get_dislike_count(self, obj):
-        return obj.reactions.filter(type='dislike').count()
-    
     class Meta:
         model = ReviewReaction
         fields = [
-            "id", "tool", "tool_name", "user", "rating", "comment",
-            "created_at", "updated_at", "replies", "parent",
-            "like_count", "dislike_count",  # 🔥 اینا جدیدن
+            "id", "review", "type", "user", "created_at",
+            "like_count", "dislike_count",
         ]
         read_only_fields = ['id', 'user', 'created_at']
-
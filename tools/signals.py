@@ -0,0 +1,362 @@
+# tools/signals.py
+# --------------------------------------------------
+# 📡 سیگنال‌های اپ ابزارها برای نگهداری داده‌های ذخیره‌شده (denormalized)
+# --------------------------------------------------
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from core import images
+from core.cache import bump_namespace
+from .models import Tool, Category, Technology, Tag, ToolReview, ReviewReaction
+from .bitmap import NAMESPACE as FEATURES_NAMESPACE, tool_index
+from .ratings import apply_rating_delta
+from .reactions import COUNTER_FIELDS, apply_reaction_delta
+from .batch import current_batch
+from . import leaderboard, search
+
+
+@receiver(pre_save, sender=ToolReview)
+def remember_previous_rating(sender, instance, raw=False, **kwargs):
+    # 🧠 نگه داشتن امتیاز و ابزار قبلی برای محاسبه تغییرات بعد از ذخیره
+    instance._previous_rating = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._previous_rating = (
+        ToolReview.objects.filter(pk=instance.pk).values_list('tool_id', 'rating').first()
+    )
+
+
+@receiver(post_save, sender=ToolReview)
+def update_tool_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    previous = getattr(instance, '_previous_rating', None)
+    if created or previous is None:
+        apply_rating_delta(instance.tool_id, instance.rating, 1)
+        return
+
+    old_tool_id, old_rating = previous
+    if old_tool_id != instance.tool_id:
+        # 🔀 نظر به ابزار دیگری منتقل شده
+        apply_rating_delta(old_tool_id, -old_rating, -1)
+        apply_rating_delta(instance.tool_id, instance.rating, 1)
+    else:
+        apply_rating_delta(instance.tool_id, instance.rating - old_rating, 0)
+
+
+@receiver(post_delete, sender=ToolReview)
+def update_tool_rating_on_delete(sender, instance, **kwargs):
+    # 🗑️ شامل حذف‌های آبشاری (حذف ابزار، کاربر یا نظر والد) هم می‌شود
+    batch = current_batch()
+    if batch is not None:
+        batch.rating_deltas[instance.tool_id][0] -= instance.rating
+        batch.rating_deltas[instance.tool_id][1] -= 1
+        return
+    apply_rating_delta(instance.tool_id, -instance.rating, -1)
+
+
+@receiver(pre_save, sender=ReviewReaction)
+def remember_previous_reaction(sender, instance, raw=False, **kwargs):
+    # 🧠 نوع و نظر قبلی ری‌اکشن برای به‌روزرسانی شمارنده‌ها
+    instance._previous_reaction = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._previous_reaction = (
+        ReviewReaction.objects.filter(pk=instance.pk).values_list('review_id', 'type').first()
+    )
+
+
+@receiver(post_save, sender=ReviewReaction)
+def update_reaction_counts_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    previous = getattr(instance, '_previous_reaction', None)
+    if created or previous is None:
+        apply_reaction_delta(instance.review_id, added=instance.type)
+        return
+
+    old_review_id, old_type = previous
+    if old_review_id != instance.review_id:
+        apply_reaction_delta(old_review_id, removed=old_type)
+        apply_reaction_delta(instance.review_id, added=instance.type)
+    else:
+        apply_reaction_delta(instance.review_id, removed=old_type, added=instance.type)
+
+
+@receiver(post_delete, sender=ReviewReaction)
+def update_reaction_counts_on_delete(sender, instance, **kwargs):
+    batch = current_batch()
+    if batch is not None:
+        if instance.type in COUNTER_FIELDS:
+            batch.reaction_deltas[instance.review_id][COUNTER_FIELDS[instance.type]] -= 1
+        return
+    apply_reaction_delta(instance.review_id, removed=instance.type)
+
+
+# --------------------------------------------------
+# 🏆 جدول رتبه‌بندی (tools/leaderboard.py)
+# --------------------------------------------------
+
+@receiver([post_save, post_delete], sender=ToolReview)
+def update_leaderboard_on_review_change(sender, instance, raw=False, **kwargs):
+    # بعد از به‌روزرسانی خلاصه امتیاز (گیرنده‌های بالا) اجرا می‌شود
+    if raw:
+        return
+    batch = current_batch()
+    if batch is not None and kwargs['signal'] is post_delete:
+        batch.tools.add(instance.tool_id)
+        return
+    leaderboard.update_tool(instance.tool_id)
+    previous = getattr(instance, '_previous_rating', None)
+    if previous is not None and previous[0] != instance.tool_id:
+        leaderboard.update_tool(previous[0])
+
+
+@receiver(m2m_changed, sender=Tool.categories.through)
+@receiver(m2m_changed, sender=Tool.tags.through)
+def update_leaderboard_on_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    # هر رویداد با تعداد ثابتی کوئری، مستقل از تعداد عضویت‌های تغییرکرده
+    scope = 'category' if sender is Tool.categories.through else 'tag'
+    if action == 'post_clear':
+        if reverse:
+            leaderboard.drop_scope(scope, instance.pk)
+        else:
+            leaderboard.remove_scopes(instance.pk, scope)
+    elif action == 'post_add':
+        if reverse:
+            leaderboard.place_tools(pk_set, scope, instance.pk)
+        else:
+            leaderboard.update_tool(instance.pk, scopes=[(scope, pk) for pk in pk_set])
+    elif action == 'post_remove':
+        if reverse:
+            leaderboard.remove_tools(pk_set, scope, instance.pk)
+        else:
+            leaderboard.remove_scopes(instance.pk, scope, pk_set)
+
+
+@receiver(post_delete, sender=Tool)
+def remove_tool_from_leaderboard(sender, instance, **kwargs):
+    leaderboard.remove_tool(instance.pk)
+
+
+@receiver(post_delete, sender=Category)
+def drop_category_leaderboard(sender, instance, **kwargs):
+    leaderboard.drop_scope('category', instance.pk)
+
+
+@receiver(post_delete, sender=Tag)
+def drop_tag_leaderboard(sender, instance, **kwargs):
+    leaderboard.drop_scope('tag', instance.pk)
+
+
+# --------------------------------------------------
+# 🔎 ایندکس جستجو
+# --------------------------------------------------
+
+@receiver(post_save, sender=Tool)
+def index_tool_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_tools([instance.pk])
+
+
+@receiver(post_delete, sender=Tool)
+def remove_tool_from_index(sender, instance, **kwargs):
+    search.remove_tools([instance.pk])
+
+
+@receiver(m2m_changed, sender=Tool.tags.through)
+def index_tools_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        search.index_tools([instance.pk])
+    elif action == 'post_clear':
+        # تگ از همه ابزارها جدا شد؛ ابزارهای قبلی در pre_clear ذخیره شده‌اند
+        search.index_tools(getattr(instance, '_search_tool_ids', []))
+    else:
+        search.index_tools(pk_set)
+
+
+@receiver(m2m_changed, sender=Tool.tags.through)
+def remember_tag_tools_before_clear(sender, instance, action, reverse, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._search_tool_ids = list(instance.tool_set.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Tag)
+def index_tools_on_tag_rename(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        search.index_tools(list(instance.tool_set.values_list('id', flat=True)))
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tag_tools_before_delete(sender, instance, **kwargs):
+    instance._search_tool_ids = list(instance.tool_set.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def index_tools_on_tag_delete(sender, instance, **kwargs):
+    search.index_tools(getattr(instance, '_search_tool_ids', []))
+
+
+# --------------------------------------------------
+# 🕒 زمان آخرین تغییر ابزار (اعتبارسنج ETag / Last-Modified)
+# --------------------------------------------------
+
+@receiver([post_save, post_delete], sender=ToolReview)
+def touch_tool_on_review_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    batch = current_batch()
+    if batch is not None and kwargs['signal'] is post_delete:
+        batch.tools.add(instance.tool_id)
+        return
+    tool_ids = {instance.tool_id}
+    previous = getattr(instance, '_previous_rating', None)
+    if previous is not None:
+        tool_ids.add(previous[0])  # نظر منتقل‌شده: ابزار قبلی هم تغییر کرده
+    Tool.objects.filter(pk__in=tool_ids).touch()
+
+
+@receiver([post_save, post_delete], sender=ReviewReaction)
+def touch_tool_on_reaction_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    batch = current_batch()
+    if batch is not None and kwargs['signal'] is post_delete:
+        batch.reviews.add(instance.review_id)
+        return
+    Tool.objects.filter(reviews=instance.review_id).touch()
+
+
+@receiver(m2m_changed, sender=Tool.categories.through)
+@receiver(m2m_changed, sender=Tool.technologies.through)
+@receiver(m2m_changed, sender=Tool.tags.through)
+def touch_tools_on_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._touched_tool_ids = list(instance.tool_set.values_list('id', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            tool_ids = [instance.pk]
+        elif action == 'post_clear':
+            tool_ids = getattr(instance, '_touched_tool_ids', [])
+        else:
+            tool_ids = pk_set
+        Tool.objects.filter(pk__in=tool_ids).touch(relations=True)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Technology)
+@receiver(post_save, sender=Tag)
+def touch_tools_on_taxonomy_rename(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        instance.tool_set.all().touch(relations=True)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Technology)
+@receiver(pre_delete, sender=Tag)
+def remember_taxonomy_tools_before_delete(sender, instance, **kwargs):
+    instance._touched_tool_ids = list(instance.tool_set.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Technology)
+@receiver(post_delete, sender=Tag)
+def touch_tools_on_taxonomy_delete(sender, instance, **kwargs):
+    Tool.objects.filter(pk__in=getattr(instance, '_touched_tool_ids', [])).touch(relations=True)
+
+
+# --------------------------------------------------
+# 🗃️ بی‌اعتبارسازی کش‌ها (نسخه فضای نام بعد از commit بالا می‌رود)
+# --------------------------------------------------
+
+def bump_on_commit(*namespaces):
+    batch = current_batch()
+    if batch is not None:
+        batch.namespaces.update(namespaces)  # یک بار در پایان دسته
+        return
+    transaction.on_commit(lambda: bump_namespace(*namespaces))
+
+
+@receiver([post_save, post_delete], sender=Tool)
+def invalidate_tools_cache(sender, **kwargs):
+    bump_on_commit('tools')
+
+
+@receiver([post_save, post_delete], sender=ToolReview)
+def invalidate_reviews_cache(sender, **kwargs):
+    # خلاصه امتیاز ابزار هم تغییر می‌کند
+    bump_on_commit('reviews', 'tools')
+
+
+@receiver([post_save, post_delete], sender=ReviewReaction)
+def invalidate_reactions_cache(sender, **kwargs):
+    bump_on_commit('reviews')
+
+
+@receiver(m2m_changed, sender=Tool.categories.through)
+@receiver(m2m_changed, sender=Tool.technologies.through)
+@receiver(m2m_changed, sender=Tool.tags.through)
+def invalidate_tools_cache_on_relations(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_on_commit('tools')
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Technology)
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_taxonomy_cache(sender, **kwargs):
+    bump_on_commit('taxonomy', 'tools')
+
+
+# --------------------------------------------------
+# 🧮 ایندکس بیت‌مپ ویژگی‌ها (tools/bitmap.py)
+# --------------------------------------------------
+
+def refresh_bitmap_on_commit(tool_ids):
+    def refresh():
+        version = bump_namespace(FEATURES_NAMESPACE)[FEATURES_NAMESPACE]
+        tool_index.refresh_tools(tool_ids, version)
+    transaction.on_commit(refresh)
+
+
+@receiver([post_save, post_delete], sender=Tool)
+def refresh_bitmap_on_tool_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_bitmap_on_commit([instance.pk])
+
+
+@receiver(m2m_changed, sender=Tool.categories.through)
+@receiver(m2m_changed, sender=Tool.technologies.through)
+@receiver(m2m_changed, sender=Tool.tags.through)
+def refresh_bitmap_on_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        refresh_bitmap_on_commit([instance.pk])
+    else:
+        # تغییر از سمت دسته/تگ/تکنولوژی (pk_set در clear خالی است): ساخت مجدد
+        transaction.on_commit(lambda: (bump_namespace(FEATURES_NAMESPACE), tool_index.invalidate()))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Technology)
+@receiver(post_delete, sender=Tag)
+def rebuild_bitmap_on_taxonomy_delete(sender, **kwargs):
+    # ردیف‌های واسط بدون سیگنال m2m حذف می‌شوند
+    transaction.on_commit(lambda: (bump_namespace(FEATURES_NAMESPACE), tool_index.invalidate()))
+
+
+# --------------------------------------------------
+# 🖼️ نسخه‌های تغییر اندازه‌یافته لوگو و اسکرین‌شات
+# --------------------------------------------------
+
+@receiver(post_save, sender=Tool)
+def process_tool_images(sender, instance, raw=False, **kwargs):
+    if not raw:
+        images.schedule(instance)
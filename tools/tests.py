@@ -1,3 +1,955 @@
-from django.test import TestCase
+import json
+import tempfile
+import time
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from core.benchmark import SCENARIOS, compare, run_suite
+from core.pagination import DefaultCursorPagination
+from . import bitmap, compare as tool_compare, leaderboard
+from .batch import deferred_deletes, delete_tool
+from .bitmap import BOOLEAN_FEATURES, RELATIONS, bits_to_ids, tool_index
+from .catalog import export_catalog, import_catalog
+from .facets import filter_signature
+from .models import Category, ReviewReaction, Tag, Technology, Tool, ToolRanking, ToolReview
+from .ratings import recompute_ratings
+from .reactions import recompute_reaction_counts
+from .scaledata import PRESETS, generate
+from .search import search_tools
+from .text import normalize_text, tokenize
+from .threads import MAX_REPLY_DEPTH
+
+
+class _Rollback(Exception):
+    pass
+
+
+def make_tools(count, prefix="tool"):
+    # 🧪 ساخت دسته‌جمعی ابزار همراه با دسته، تکنولوژی و تگ
+    category = Category.objects.create(name=f"{prefix}-category")
+    technology = Technology.objects.create(name=f"{prefix}-technology")
+    tag = Tag.objects.create(name=f"{prefix}-tag")
+    tools = Tool.objects.bulk_create([
+        Tool(name=f"{prefix}-{i}", description="توضیحات", website="https://example.com", license_type="free")
+        for i in range(count)
+    ])
+    Tool.categories.through.objects.bulk_create(
+        [Tool.categories.through(tool_id=t.id, category_id=category.id) for t in tools]
+    )
+    Tool.technologies.through.objects.bulk_create(
+        [Tool.technologies.through(tool_id=t.id, technology_id=technology.id) for t in tools]
+    )
+    Tool.tags.through.objects.bulk_create([Tool.tags.through(tool_id=t.id, tag_id=tag.id) for t in tools])
+    return tools
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': False})
+class ToolListQueryCountTests(TestCase):
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('tool-list-create'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        make_tools(10, prefix="small")
+        small = self.count_list_queries()
+
+        make_tools(990, prefix="large")
+        large = self.count_list_queries()
+
+        self.assertEqual(small, large)
+
+    def test_relations_are_ids_for_admin_edit_form(self):
+        # 🛠️ AdminToolForm چک‌باکس‌ها را با شناسه‌ها مقایسه می‌کند و همان‌ها را در PUT می‌فرستد
+        tool = make_tools(1, prefix="ids")[0]
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create(mobile='09120000000', role='admin'))
+        row = client.get(reverse('admin-dashboard')).json()['results'][0]
+        self.assertEqual(row['categories'], [tool.categories.get().pk])
+        self.assertEqual(row['technologies'], [tool.technologies.get().pk])
+        self.assertEqual(row['tags'], [tool.tags.get().pk])
+
+
+# 🏷️ درخواست‌های شرطی لیست‌ها و جلو رفتن updated_at ابزار
+@override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        generate({'tools': 3, 'tags': 3, 'categories': 2, 'technologies': 2,
+                  'users': 5, 'reviews': 6, 'reactions': 0, 'otps': 0}, seed=5)
+        self.tool = Tool.objects.order_by('pk').first()
+
+    def assert_revalidates(self, url, change):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('Last-Modified', first)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        change()
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+    def assert_touches_tool(self, change):
+        before = Tool.objects.get(pk=self.tool.pk).updated_at
+        change()
+        self.assertGreater(Tool.objects.get(pk=self.tool.pk).updated_at, before)
+
+    def test_tool_list(self):
+        tag = Tag.objects.create(name='تگ تازه')
+        self.assert_revalidates(reverse('tool-list-create'), lambda: self.tool.tags.add(tag))
+        self.assert_revalidates(reverse('tool-list-create'), lambda: Tool.objects.filter(pk=self.tool.pk).delete())
+
+    def test_review_list(self):
+        url = reverse('tool-review-list-create') + f'?tool={self.tool.pk}'
+        user, other = CustomUser.objects.exclude(toolreview__tool=self.tool)[:2]
+        review = ToolReview.objects.create(tool=self.tool, user=user, rating=3, comment='c')
+        self.assert_revalidates(url, lambda: ReviewReaction.objects.create(review=review, user=other, type='like'))
+
+    def test_tool_updated_at_follows_related_writes(self):
+        user, other = CustomUser.objects.exclude(toolreview__tool=self.tool)[:2]
+        self.assert_touches_tool(lambda: self.tool.tags.add(Tag.objects.create(name='دیگر')))
+        self.assert_touches_tool(lambda: self.tool.categories.clear())
+        review = ToolReview.objects.create(tool=self.tool, user=user, rating=5, comment='c')
+        self.assert_touches_tool(lambda: ReviewReaction.objects.create(review=review, user=other, type='like'))
+        self.assert_touches_tool(lambda: ReviewReaction.objects.filter(review=review).delete())
+        self.assert_touches_tool(lambda: ToolReview.objects.create(tool=self.tool, user=other, rating=1, comment='c'))
+        self.assert_touches_tool(review.delete)
+
+
+# 📦 ورود/خروج گروهی فهرست ابزارها
+class ToolCatalogTests(TestCase):
+    def row(self, name, **extra):
+        return {"name": name, "description": "توضیحات", "website": "https://example.com",
+                "license_type": "free", **extra}
+
+    def test_import_upserts_by_name_and_round_trips(self):
+        make_tools(1, prefix="old")
+        lines = [json.dumps(row, ensure_ascii=False) for row in (
+            self.row("old-0", supports_farsi=True, tags=["New ", "new"], categories=["متن"]),
+            self.row("fresh", technologies=["GPT"]),
+            {"name": "broken"},
+        )]
+        with self.captureOnCommitCallbacks(execute=True):
+            report = import_catalog(lines, 'jsonl', chunk_size=2)
+        self.assertEqual((report['created'], report['updated'], report['invalid']), (1, 1, 1))
+        self.assertEqual(report['errors'][0]['row'], 3)
+
+        tool = Tool.objects.get(name="old-0")
+        self.assertTrue(tool.supports_farsi)
+        self.assertEqual(tool.relations_version, 1)  # کلید کش مقایسه عوض می‌شود
+        self.assertEqual(list(tool.tags.values_list('name', flat=True)), ["new"])  # تگ قبلی جایگزین شد
+        self.assertEqual(list(tool.categories.values_list('name', flat=True)), ["متن"])
+        self.assertEqual(list(tool.technologies.values_list('name', flat=True)), ["old-technology"])  # ارسال نشده: دست‌نخورده
+
+        csv_text = ''.join(export_catalog('csv'))
+        self.assertIn('fresh,توضیحات', csv_text)
+        report = import_catalog(StringIO(csv_text), 'csv')
+        self.assertEqual((report['rows'], report['created'], report['updated'], report['invalid']), (2, 0, 0, 0))
+
+    def test_upsert_keeps_counters_and_unsent_fields(self):
+        tool = make_tools(1, prefix="kept")[0]
+        Tool.objects.filter(pk=tool.pk).update(rating_sum=9, rating_count=2, highlight_feature="ویژه")
+        created_at = Tool.objects.get(pk=tool.pk).created_at
+        with self.captureOnCommitCallbacks(execute=True):
+            report = import_catalog([json.dumps(self.row("kept-0", description="تازه"), ensure_ascii=False)], 'jsonl')
+        self.assertEqual((report['created'], report['updated']), (0, 1))
+        tool = Tool.objects.get(pk=tool.pk)
+        self.assertEqual(
+            (tool.description, tool.highlight_feature, tool.rating_sum, tool.rating_count, tool.created_at),
+            ("تازه", "ویژه", 9, 2, created_at),
+        )
+
+    def test_unreadable_upload_is_rejected(self):
+        admin = CustomUser.objects.create_user('09120000009')
+        admin.role = 'admin'
+        admin.save()
+        client = APIClient()
+        client.force_authenticate(admin)
+        url = reverse('admin-tool-catalog')
+        uploads = (
+            ('tools.jsonl', 'name,\n'.encode('utf-16')),  # UnicodeDecodeError
+            ('tools.csv', b'name\n"' + b'a' * 200_000 + b'"\n'),  # csv.Error: فیلد بزرگ‌تر از حد
+        )
+        for name, content in uploads:
+            response = client.post(url, {'file': SimpleUploadedFile(name, content)}, format='multipart')
+            self.assertEqual(response.status_code, 400, name)
+            self.assertIn('file', response.data)
+
+    def test_commands(self):
+        make_tools(3, prefix="cmd")
+        out = StringIO()
+        call_command('export_tools', stdout=out)
+        Tool.objects.filter(name="cmd-1").delete()
+        path = self.enterContext(tempfile.TemporaryDirectory()) + '/tools.jsonl'
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(out.getvalue())
+        call_command('import_tools', path, stdout=StringIO())
+        self.assertEqual(Tool.objects.get(name="cmd-1").tags.get().name, "cmd-tag")
+
+
+# ⏱️ بنچمارک endpointها روی داده مصنوعی کوچک
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_suite_runs_and_detects_regressions(self):
+        generate(PRESETS['tiny'], seed=1)
+        results = {'tiny': run_suite(iterations=2, warmup=0)}
+        self.assertEqual(set(results['tiny']), {scenario.name for scenario in SCENARIOS})
+        self.assertEqual(compare(results, results), [])
+
+        slower = {'tiny': {name: dict(metrics) for name, metrics in results['tiny'].items()}}
+        slower['tiny']['tools-list']['queries'] += 1
+        slower['tiny']['tools-list']['p95_ms'] = results['tiny']['tools-list']['p95_ms'] * 2 + 10
+        self.assertEqual(len(compare(slower, results, threshold=0.25)), 2)
+
+
+# 🗑️ حذف آبشاری با کارهای وابسته یک‌جا (tools/batch.py)
+class DeferredDeletesTests(TestCase):
+    LONG_AGO = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        generate({'tools': 5, 'tags': 4, 'categories': 3, 'technologies': 3,
+                  'users': 40, 'reviews': 80, 'reactions': 200, 'otps': 0}, seed=3)
+
+    def derived_state(self):
+        return {
+            'tools': list(Tool.objects.order_by('pk').values_list('pk', 'rating_sum', 'rating_count', 'avg_rating')),
+            'reviews': list(ToolReview.objects.order_by('pk').values_list('pk', 'like_count', 'dislike_count')),
+            'rankings': list(ToolRanking.objects.order_by('scope', 'scope_id', 'tool_id')
+                             .values_list('scope', 'scope_id', 'tool_id', 'score')),
+            'touched': set(Tool.objects.filter(updated_at__gt=self.LONG_AGO).values_list('pk', flat=True)),
+        }
+
+    def state_after(self, delete):
+        # 🔁 اجرای حذف روی همان داده و برگرداندن وضعیت، سپس rollback برای اجرای بعدی
+        state = None
+        try:
+            with transaction.atomic():
+                Tool.objects.update(updated_at=self.LONG_AGO)
+                delete()
+                state = self.derived_state()
+                raise _Rollback
+        except _Rollback:
+            pass
+        return state
+
+    def assert_batched_matches_per_row(self, per_row, batched):
+        expected = self.state_after(per_row)
+        self.assertEqual(self.state_after(batched), expected)
+        return expected
+
+    def batched(self, delete):
+        def run():
+            with deferred_deletes():
+                delete()
+        return run
+
+    def test_review_delete_matches_per_row_path(self):
+        pk = ToolReview.objects.filter(parent=None, replies__isnull=False, replies__reactions__isnull=False).first().pk
+        delete = lambda: ToolReview.objects.get(pk=pk).delete()  # noqa: E731
+        state = self.assert_batched_matches_per_row(delete, self.batched(delete))
+        self.assertTrue(state['touched'])
+
+    def test_user_delete_matches_per_row_path(self):
+        # کاربری که نظرش روی چند ابزار است: حذف آبشاری نظرها و ری‌اکشن‌های همه آن ابزارها
+        user = CustomUser.objects.annotate(tools=Count('toolreview__tool', distinct=True)).order_by('-tools').first()
+        delete = lambda: CustomUser.objects.get(pk=user.pk).delete()  # noqa: E731
+        state = self.assert_batched_matches_per_row(delete, self.batched(delete))
+        self.assertGreater(len(state['touched']), 1)
+
+    def test_tool_delete_matches_per_row_path(self):
+        pk = Tool.objects.order_by('-rating_count').first().pk
+        state = self.assert_batched_matches_per_row(
+            lambda: Tool.objects.get(pk=pk).delete(),
+            lambda: delete_tool(Tool.objects.get(pk=pk)),
+        )
+        self.assertNotIn(pk, [tool_id for _, _, tool_id, _ in state['rankings']])
+
+    def test_derived_data_stays_consistent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            review = ToolReview.objects.filter(parent=None, replies__isnull=False).first()
+            with deferred_deletes():
+                review.delete()
+            tool = Tool.objects.order_by('-rating_count').first()
+            with deferred_deletes():
+                tool.delete()
+
+        self.assertEqual((recompute_ratings(), recompute_reaction_counts()), (0, 0))
+        self.assertFalse(ToolRanking.objects.filter(tool_id=tool.pk).exists())
+
+
+# ⭐ خلاصه امتیاز ابزار (tools/ratings.py) در هر مسیر نوشتن نظر
+class RatingSummaryTests(TestCase):
+    def setUp(self):
+        self.tool, self.other = make_tools(2, prefix="rating")
+        self.users = CustomUser.objects.bulk_create(CustomUser(mobile=f'0914{index:07d}') for index in range(3))
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def assert_summary(self, tool, rating_sum, rating_count, avg_rating):
+        tool.refresh_from_db()
+        self.assertEqual((tool.rating_sum, tool.rating_count, tool.avg_rating), (rating_sum, rating_count, avg_rating))
+        self.assertEqual(recompute_ratings([tool.pk]), 0)
+
+    def review(self, user, rating, tool=None):
+        return ToolReview.objects.create(tool=tool or self.tool, user=user, rating=rating, comment='c')
+
+    def test_api_create_update_delete(self):
+        response = self.client.post(reverse('tool-review-create', args=[self.tool.pk]), {'rating': 4, 'comment': 'c'})
+        self.assertEqual(response.status_code, 201)
+        self.assert_summary(self.tool, 4, 1, 4.0)
+
+        response = self.client.post(reverse('tool-review-list-create'), {'tool': self.other.pk, 'rating': 2})
+        self.assertEqual(response.status_code, 201)
+        self.review(self.users[1], 5, tool=self.other)
+        self.assert_summary(self.other, 7, 2, 3.5)
+        self.assert_summary(self.tool, 4, 1, 4.0)
+
+        review_id = ToolReview.objects.get(tool=self.tool, user=self.users[0]).pk
+        url = reverse('review-detail', args=[review_id])
+        self.assertEqual(self.client.patch(url, {'rating': 1}).status_code, 200)
+        self.assert_summary(self.tool, 1, 1, 1.0)
+        self.assertEqual(self.client.put(url, {'rating': 3, 'comment': 'd'}).status_code, 200)
+        self.assert_summary(self.tool, 3, 1, 3.0)
+
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assert_summary(self.tool, 0, 0, None)  # آخرین نظر حذف شد
+        self.assert_summary(self.other, 7, 2, 3.5)
+
+    def test_orm_update_and_move_to_other_tool(self):
+        first = self.review(self.users[0], 4)
+        self.review(self.users[1], 2)
+        self.assert_summary(self.tool, 6, 2, 3.0)
+
+        first.rating = 5
+        first.save()
+        self.assert_summary(self.tool, 7, 2, 3.5)
+
+        first.tool = self.other
+        first.rating = 1
+        first.save()
+        self.assert_summary(self.tool, 2, 1, 2.0)
+        self.assert_summary(self.other, 1, 1, 1.0)
+
+    def test_orm_delete_including_cascades(self):
+        root = self.review(self.users[0], 5)
+        reply = ToolReview.objects.create(tool=self.tool, user=self.users[1], parent=root, rating=2, comment='r')
+        self.review(self.users[2], 3, tool=self.other)
+        self.assert_summary(self.tool, 7, 2, 3.5)
+
+        reply.delete()
+        self.assert_summary(self.tool, 5, 1, 5.0)
+        ToolReview.objects.create(tool=self.tool, user=self.users[1], parent=root, rating=1, comment='r')
+        root.delete()  # پاسخ هم آبشاری حذف می‌شود
+        self.assert_summary(self.tool, 0, 0, None)
+
+        self.users[2].delete()
+        self.assert_summary(self.other, 0, 0, None)
+
+
+# 👍 شمارنده‌های ری‌اکشن نظر (tools/reactions.py) در هر مسیر نوشتن ری‌اکشن
+class ReactionCounterTests(TestCase):
+    def setUp(self):
+        self.tool = make_tools(1, prefix="reaction")[0]
+        self.users = CustomUser.objects.bulk_create(CustomUser(mobile=f'0915{index:07d}') for index in range(3))
+        self.review = ToolReview.objects.create(tool=self.tool, user=self.users[0], rating=4, comment='c')
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[1])
+
+    def assert_counts(self, review, like_count, dislike_count):
+        review.refresh_from_db()
+        self.assertEqual((review.like_count, review.dislike_count), (like_count, dislike_count))
+        self.assertEqual(recompute_reaction_counts(), 0)
+
+    def toggle(self, reaction_type):
+        return self.client.post(reverse('toggle_reaction', args=[self.review.pk]), {'type': reaction_type})
+
+    def test_create_and_switch_type(self):
+        response = self.client.post(reverse('reaction-create'), {'review': self.review.pk, 'type': 'like'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['like_count'], response.data['dislike_count']), (1, 0))
+        self.assert_counts(self.review, 1, 0)
+
+        # تغییر نوع با همان مسیر: ری‌اکشن قبلی به‌روز می‌شود (پاسخ ۴۰۰ با پیام)
+        response = self.client.post(reverse('reaction-create'), {'review': self.review.pk, 'type': 'dislike'})
+        self.assertEqual(response.status_code, 400)
+        self.assert_counts(self.review, 0, 1)
+
+        ReviewReaction.objects.create(review=self.review, user=self.users[2], type='like')
+        self.assert_counts(self.review, 1, 1)
+
+    def test_toggle_create_switch_and_off(self):
+        self.assertEqual(self.toggle('like').status_code, 201)
+        self.assert_counts(self.review, 1, 0)
+        self.assertEqual(self.toggle('dislike').status_code, 200)  # like → dislike
+        self.assert_counts(self.review, 0, 1)
+        self.assertEqual(self.toggle('dislike').status_code, 200)  # همان نوع دوباره: حذف
+        self.assert_counts(self.review, 0, 0)
+        self.assertFalse(ReviewReaction.objects.exists())
+
+    def test_orm_switch_and_delete(self):
+        reaction = ReviewReaction.objects.create(review=self.review, user=self.users[1], type='dislike')
+        self.assert_counts(self.review, 0, 1)
+        reaction.type = 'like'
+        reaction.save()
+        self.assert_counts(self.review, 1, 0)
+        reaction.delete()
+        self.assert_counts(self.review, 0, 0)
+
+    def test_review_delete_cascades_reactions(self):
+        reply = ToolReview.objects.create(tool=self.tool, user=self.users[1], parent=self.review, rating=3, comment='r')
+        for user, reaction_type in zip(self.users, ('like', 'like', 'dislike')):
+            ReviewReaction.objects.create(review=reply, user=user, type=reaction_type)
+            ReviewReaction.objects.create(review=self.review, user=user, type=reaction_type)
+        self.assert_counts(reply, 2, 1)
+
+        reply.delete()
+        self.assertFalse(ReviewReaction.objects.filter(review_id=reply.pk).exists())
+        self.assert_counts(self.review, 2, 1)
+        self.users[2].delete()  # ری‌اکشن‌های کاربر روی نظرهای دیگران هم آبشاری حذف می‌شوند
+        self.assert_counts(self.review, 2, 0)
+
+        self.client.force_authenticate(self.users[0])
+        self.assertEqual(self.client.delete(reverse('review-detail', args=[self.review.pk])).status_code, 204)
+        self.assertFalse(ReviewReaction.objects.exists())
+        self.assertEqual(recompute_reaction_counts(), 0)
+
+
+# ⚖️ شمارش مجموعه‌های پرتکرار مقایسه (tools/compare.py)
+class CompareTrackingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def record(self, ids, times):
+        for _ in range(times):
+            tool_compare.record_request(ids)
+
+    def test_counts_each_set(self):
+        self.record((1, 2), 3)
+        self.record((2, 3), 1)
+        self.record((4,), 5)
+        self.assertEqual(tool_compare.popular_sets(10), [((1, 2), 3), ((2, 3), 1)])
+        self.assertEqual(tool_compare.popular_sets(1), [((1, 2), 3)])
+
+    def test_newcomer_displaces_colliding_set_by_decayed_score(self):
+        with mock.patch.object(tool_compare, 'COMPARE_TRACKED_SETS', 1), \
+                mock.patch.object(tool_compare, '_window', return_value=10) as window:
+            self.record((1, 2), 3)
+            self.record((3, 4), 3)
+            self.assertEqual(tool_compare.popular_sets(5), [((1, 2), 3)])
+            self.record((3, 4), 1)
+            self.assertEqual(tool_compare.popular_sets(5), [((3, 4), 4)])
+
+            # پنجره بعد: شمارش قبلی نصف حساب می‌شود؛ دو پنجره بعد کاملاً میرا شده
+            window.return_value = 11
+            self.assertEqual(tool_compare.popular_sets(5), [((3, 4), 2)])
+            window.return_value = 12
+            self.assertEqual(tool_compare.popular_sets(5), [])
+            self.record((1, 2), 1)
+            self.assertEqual(tool_compare.popular_sets(5), [((1, 2), 1)])
+
+
+# 🗃️ کلید کش ماتریس مقایسه: فقط داده‌های دیده‌شده در ماتریس
+class CompareCacheKeyTests(TestCase):
+    def setUp(self):
+        self.tools = make_tools(2, prefix="cmp")
+        self.ids = tuple(tool.pk for tool in self.tools)
+        self.users = CustomUser.objects.bulk_create(CustomUser(mobile=f'0916{index:07d}') for index in range(2))
+        self.review = ToolReview.objects.create(tool=self.tools[0], user=self.users[0], rating=4, comment='c')
+
+    def assert_key(self, change, evicts):
+        before = tool_compare.cache_key(self.ids)
+        change()
+        (self.assertNotEqual if evicts else self.assertEqual)(tool_compare.cache_key(self.ids), before)
+
+    def test_reactions_keep_the_entry(self):
+        reaction = ReviewReaction.objects.create(review=self.review, user=self.users[1], type='like')
+        self.assert_key(lambda: ReviewReaction.objects.create(review=self.review, user=self.users[0]), evicts=False)
+        self.assert_key(reaction.delete, evicts=False)
+        self.assert_key(lambda: self.tools[0].save(), evicts=False)  # ذخیره بدون تغییر
+
+    def test_compared_data_changes_evict_the_entry(self):
+        tool = self.tools[1]
+        tag = Tag.objects.create(name="cmp-extra")
+        self.assert_key(lambda: ToolReview.objects.create(tool=tool, user=self.users[1], rating=2), evicts=True)
+        self.assert_key(lambda: Tool.objects.filter(pk=tool.pk).update(supports_farsi=True), evicts=True)
+        self.assert_key(lambda: tool.tags.add(tag), evicts=True)
+        tag.name = "cmp-renamed"
+        self.assert_key(tag.save, evicts=True)
+        self.assert_key(lambda: tool.technologies.clear(), evicts=True)
+        self.assert_key(tag.delete, evicts=True)
+
+    def test_cached_matrix_follows_rename(self):
+        category = self.tools[0].categories.get()
+        first = tool_compare.get_matrix(self.ids)
+        category.name = "cmp-renamed"
+        category.save()
+        self.assertNotEqual(tool_compare.get_matrix(self.ids), first)
+        self.assertEqual(tool_compare.get_matrix(self.ids)['matrix']['categories'][0], ["cmp-renamed"])
+
+
+# 🏆 رتبه‌بندی بیزی (tools/leaderboard.py)
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.tools = make_tools(4, prefix="lb")
+
+    def ranking(self, scope='all', scope_id=0):
+        return list(
+            (tool_id, rank) for rank, tool_id in enumerate(
+                ToolRanking.objects.filter(scope=scope, scope_id=scope_id)
+                .order_by('-score', 'tool_id').values_list('tool_id', flat=True), start=1,
+            )
+        )
+
+    def test_bayesian_score_prefers_many_reviews(self):
+        self.assertIsNone(leaderboard.bayesian_score(0, 0))
+        one_perfect = leaderboard.bayesian_score(5, 1)
+        many_good = leaderboard.bayesian_score(4.8 * 400, 400)
+        self.assertLess(one_perfect, many_good)
+        self.assertAlmostEqual(leaderboard.bayesian_score(3 * 7, 7), leaderboard.PRIOR_MEAN)
+
+    def rank_of(self, tool_id, scope='all', scope_id=0):
+        score = ToolRanking.objects.get(scope=scope, scope_id=scope_id, tool_id=tool_id).score
+        return leaderboard.rank_of(tool_id, scope, scope_id, score)
+
+    def test_place_and_remove_rank_on_read(self):
+        a, b, c, d = (tool.pk for tool in self.tools)
+        leaderboard.place(a, 'all', 0, 3.0)
+        leaderboard.place(b, 'all', 0, 4.0)
+        leaderboard.place(c, 'all', 0, 3.0)  # امتیاز برابر: شناسه کوچک‌تر جلوتر
+        self.assertEqual(self.ranking(), [(b, 1), (a, 2), (c, 3)])
+
+        # هر نوشتن فقط ردیف همان ابزار را عوض می‌کند (بدون جابه‌جایی رتبه دیگران)
+        with self.assertNumQueries(1):
+            leaderboard.place(c, 'all', 0, 4.5)  # بالا رفتن
+        leaderboard.place(b, 'all', 0, 1.0)  # پایین رفتن
+        leaderboard.place(d, 'all', 0, 3.5)
+        self.assertEqual(self.ranking(), [(c, 1), (d, 2), (a, 3), (b, 4)])
+        self.assertEqual([self.rank_of(tool_id) for tool_id in (c, d, a, b)], [1, 2, 3, 4])
+
+        leaderboard.remove(d, 'all', 0)
+        leaderboard.remove(d, 'all', 0)  # دوباره: بی‌اثر
+        self.assertEqual(self.ranking(), [(c, 1), (a, 2), (b, 3)])
+        self.assertEqual(self.rank_of(b), 3)
+
+    @override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+    def test_top_rated_pages_carry_ranks(self):
+        tools = make_tools(9, prefix="ranked")
+        for index, tool in enumerate(tools):
+            leaderboard.place(tool.pk, 'all', 0, float(index % 4))  # امتیازهای تکراری
+        expected = self.ranking()
+        rows, url = [], reverse('top-rated-tools') + '?page_size=4'
+        while url:
+            data = self.client.get(url).json()
+            rows += [(row['id'], row['rank']) for row in data['results']]
+            url = data['next']
+        self.assertEqual(rows, expected)
+
+    def test_incremental_updates_match_rebuild(self):
+        users = CustomUser.objects.bulk_create([CustomUser(mobile=f'0912000000{i}') for i in range(6)])
+        ratings = {self.tools[0]: [5], self.tools[1]: [4, 4, 5, 4, 5, 4], self.tools[2]: [2, 3], self.tools[3]: []}
+        with self.captureOnCommitCallbacks(execute=True):
+            for tool, values in ratings.items():
+                for user, rating in zip(users, values):
+                    ToolReview.objects.create(tool=tool, user=user, rating=rating, comment='c')
+            ToolReview.objects.filter(tool=self.tools[2], user=users[0]).delete()
+            self.tools[0].tags.clear()
+
+        category = self.tools[0].categories.get()
+        incremental = {scope: self.ranking(*scope) for scope in (('all', 0), ('category', category.pk))}
+        tag = Tag.objects.get(name='lb-tag')
+        incremental_tag = self.ranking('tag', tag.pk)
+
+        self.assertEqual(incremental[('all', 0)][0][0], self.tools[1].pk)
+        self.assertNotIn(self.tools[3].pk, [tool_id for tool_id, _rank in incremental[('all', 0)]])
+        self.assertNotIn(self.tools[0].pk, [tool_id for tool_id, _rank in incremental_tag])
+
+        self.assertEqual(leaderboard.rebuild(), 3 + 3 + 2)
+        self.assertEqual({scope: self.ranking(*scope) for scope in incremental}, incremental)
+        self.assertEqual(self.ranking('tag', tag.pk), incremental_tag)
+
+    @override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+    def test_top_rated_etag_follows_rankings(self):
+        url = reverse('top-rated-tools')
+        leaderboard.place(self.tools[0].pk, 'all', 0, 3.0)
+        leaderboard.place(self.tools[1].pk, 'all', 0, 4.0)
+        first = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        # جابه‌جایی رتبه بدون هیچ touch ابزار (مثل rebuild بعد از تغییر m و C) هم ETag را عوض می‌کند
+        leaderboard.place(self.tools[0].pk, 'all', 0, 4.5)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+
+# 🧮 ایندکس بیت‌مپ ویژگی‌ها در برابر ORM (tools/bitmap.py)
+class BitmapIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        generate({'tools': 12, 'tags': 4, 'categories': 3, 'technologies': 3,
+                  'users': 2, 'reviews': 0, 'reactions': 0, 'otps': 0}, seed=11)
+        tool_index.rebuild()
+
+    def term_q(self, expression):
+        negate = expression.startswith('!')
+        prefix, _, value = expression.lstrip('!').partition(':')
+        if prefix in BOOLEAN_FEATURES:
+            q = Q(**{prefix: True})
+        elif prefix == 'license':
+            q = Q(license_type=value)
+        else:
+            through, column = RELATIONS[prefix]
+            q = Q(pk__in=through.objects.filter(**{column: int(value)}).values('tool_id'))
+        return ~q if negate else q
+
+    def expressions(self):
+        terms = list(BOOLEAN_FEATURES) + [f'license:{value}' for value, _label in Tool.LICENSE_CHOICES]
+        for prefix, model in (('category', Category), ('tag', Tag), ('technology', Technology)):
+            terms += [f'{prefix}:{pk}' for pk in model.objects.values_list('pk', flat=True)]
+        return terms + ['!' + term for term in terms]
+
+    def assert_matches_orm(self):
+        terms = self.expressions()
+        combinations = [[term] for term in terms] + [terms[i:i + 3] for i in range(0, len(terms), 2)]
+        for combination in combinations:
+            with self.subTest(terms=combination):
+                every, either = Q(), Q(pk__in=[])
+                for term in combination:
+                    every &= self.term_q(term)
+                    either |= self.term_q(term)
+                self.assertEqual(
+                    bits_to_ids(tool_index.match_all(combination)),
+                    list(Tool.objects.filter(every).order_by('pk').values_list('pk', flat=True)),
+                )
+                self.assertEqual(
+                    bits_to_ids(tool_index.match_any(combination)),
+                    list(Tool.objects.filter(either).order_by('pk').values_list('pk', flat=True)),
+                )
+
+    def mutate(self, change):
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assert_matches_orm()
+
+    def test_matches_orm_after_mutations(self):
+        self.assert_matches_orm()
+        first, second, third = Tool.objects.order_by('pk')[:3]
+        tag = Tag.objects.order_by('pk').first()
+
+        def save_flags():
+            first.supports_farsi = not first.supports_farsi
+            first.license_type = 'paid' if first.license_type != 'paid' else 'free'
+            first.save()
+
+        self.mutate(save_flags)
+        self.mutate(lambda: second.tags.add(tag))
+        self.mutate(lambda: second.categories.clear())
+        self.mutate(lambda: first.technologies.remove(*first.technologies.all()))
+        self.mutate(lambda: tag.tool_set.add(third))  # از سمت تگ: ساخت مجدد
+        self.mutate(lambda: Tool.objects.filter(pk=third.pk).delete())
+        self.mutate(lambda: Category.objects.order_by('pk').first().delete())
+        self.mutate(lambda: Tool.objects.create(name='تازه', description='d', website='https://t.ir',
+                                                license_type='free', has_chatbot=True))
+
+    def test_other_process_changes_seen_after_max_age(self):
+        # 🧵 تغییر در پروسه‌ای دیگر: نه سیگنالی در این پروسه، نه نسخه‌ای در کش مشترک
+        tool = Tool.objects.filter(has_chatbot=False).order_by('pk').first()
+        Tool.objects.filter(pk=tool.pk).update(has_chatbot=True)
+        self.assertNotIn(tool.pk, bits_to_ids(tool_index.match_all(['has_chatbot'])))
+
+        later = time.monotonic() + bitmap.MAX_AGE + 1
+        with mock.patch('tools.bitmap.is_shared_cache', return_value=True), \
+                mock.patch('tools.bitmap.time.monotonic', return_value=later):
+            self.assertNotIn(tool.pk, bits_to_ids(tool_index.match_all(['has_chatbot'])))
+        with mock.patch('tools.bitmap.time.monotonic', return_value=later):
+            self.assertIn(tool.pk, bits_to_ids(tool_index.match_all(['has_chatbot'])))
+
+
+# 🔎 نرمال‌سازی فارسی و ایندکس جستجو (tools/text.py، tools/search.py)
+class SearchTests(TestCase):
+    def tool(self, name, description="ابزار", highlight=None):
+        return Tool.objects.create(
+            name=name, description=description, highlight_feature=highlight,
+            website="https://example.com", license_type="free",
+        )
+
+    def test_normalize_text(self):
+        cases = {
+            "يادگيري ماشين": "یادگیری ماشین",  # ي عربی
+            "كتابخانه": "کتابخانه",  # ك عربی
+            "می\u200cنویسد": "می نویسد",  # نیم‌فاصله
+            "مُتَرْجِمٌ": "مترجم",  # اعراب
+            "کـــتاب": "کتاب",  # کشیده
+            "نسخه ۴ و ٥": "نسخه 4 و 5",  # ارقام فارسی و عربی
+            "  GPT\tChat  ": "gpt chat",
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(normalize_text(text), expected)
+        self.assertEqual(tokenize("هوش‌مصنوعی، GPT-4!"), ["هوش", "مصنوعی", "gpt", "4"])
+
+    def test_query_and_document_are_normalized_alike(self):
+        arabic = self.tool("مترجم ذكي", description="ترجمه متن با هوش\u200cمصنوعی نسخه ۳")
+        self.assertEqual(search_tools("ذکی"), [arabic.pk])
+        self.assertEqual(search_tools("هوش مصنوعي"), [arabic.pk])
+        self.assertEqual(search_tools("نسخه 3"), [arabic.pk])
+        self.assertEqual(search_tools("مُتَرجم"), [arabic.pk])
+        self.assertEqual(search_tools("متر"), [arabic.pk])  # پیشوندی
+        self.assertIsNone(search_tools("!!"))
+
+    def test_bm25_ordering(self):
+        in_description = self.tool("ابزار اول", description="نوشتن متن تبلیغاتی")
+        in_name = self.tool("نویسنده تبلیغاتی")
+        in_highlight = self.tool("ابزار دوم", highlight="تبلیغاتی")
+        self.assertEqual(search_tools("تبلیغاتی"), [in_name.pk, in_highlight.pk, in_description.pk])
+        self.assertEqual(search_tools("تبلیغاتی", limit=1), [in_name.pk])
+
+    def test_incremental_reindex(self):
+        tool = self.tool("نقاش")
+        other = self.tool("طراح")
+        tool.name = "تصویرساز"
+        tool.save()
+        self.assertEqual((search_tools("نقاش"), search_tools("تصویرساز")), ([], [tool.pk]))
+
+        tag = Tag.objects.create(name="Design")
+        tool.tags.add(tag)
+        tag.tool_set.add(other)
+        self.assertEqual(sorted(search_tools("design")), sorted([tool.pk, other.pk]))
+
+        tag.name = "Graphic"
+        tag.save()
+        self.assertEqual((search_tools("design"), sorted(search_tools("graphic"))), ([], sorted([tool.pk, other.pk])))
+
+        tool.tags.remove(tag)
+        self.assertEqual(search_tools("graphic"), [other.pk])
+        tag.tool_set.clear()
+        self.assertEqual(search_tools("graphic"), [])
+
+        tool.tags.add(tag)
+        tag.delete()
+        self.assertEqual(search_tools("graphic"), [])
+        tool.delete()
+        self.assertEqual(search_tools("تصویرساز"), [])
+
+    @override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+    def test_list_reports_capped_results(self):
+        tools = [self.tool(f"مترجم {index}") for index in range(3)]
+        url = reverse('tool-list-create')
+        with mock.patch('tools.search.SEARCH_MAX_RESULTS', 2):
+            response = self.client.get(url, {'search': 'مترجم', 'page_size': 1})
+            self.assertEqual(response.data['search'], {'max_results': 2, 'truncated': True})
+            ids = [row['id'] for row in response.data['results']]
+            ids += [row['id'] for row in self.client.get(response.data['next']).data['results']]
+            self.assertIsNone(self.client.get(response.data['next']).data['next'])  # فقط ۲ نتیجه صفحه‌بندی می‌شود
+            self.assertEqual(len(set(ids) & {tool.pk for tool in tools}), 2)
+
+            tools[0].delete()
+            response = self.client.get(url, {'search': 'مترجم'})
+            self.assertEqual(response.data['search'], {'max_results': 2, 'truncated': False})
+            self.assertEqual(len(response.data['results']), 2)
+        self.assertNotIn('search', self.client.get(url).data)
+
+
+# 🧵 درخت نظرات با تعداد کوئری ثابت (tools/threads.py)
+@override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+class ReviewThreadTests(TestCase):
+    def setUp(self):
+        self.tool = make_tools(1, prefix="thread")[0]
+        self.users = iter(CustomUser.objects.bulk_create(
+            CustomUser(mobile=f'0913{index:07d}') for index in range(200)
+        ))
+        self.client = APIClient()
+        self.client.force_authenticate(next(self.users))
+
+    def review(self, parent=None):
+        return ToolReview.objects.create(tool=self.tool, user=next(self.users), parent=parent, rating=4, comment='c')
+
+    def grow(self, roots, fanout):
+        """🌱 هر ریشه یک زنجیره عمیق‌تر از سقف عمق دارد و اولین پاسخش fanout پاسخ مستقیم"""
+        for _ in range(roots):
+            parent = root = self.review()
+            for _ in range(MAX_REPLY_DEPTH + 2):
+                parent = self.review(parent)
+            first_reply = root.replies.order_by('pk').first()
+            for _ in range(fanout):
+                self.review(first_reply)
+
+    def urls(self, query=''):
+        return (
+            reverse('tool-detail', args=[self.tool.pk]) + query,
+            reverse('tool-review-list-create') + f'?tool={self.tool.pk}' + query.replace('?', '&'),
+        )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data
+
+    def depth(self, reviews):
+        return max((1 + self.depth(review['replies']) for review in reviews), default=0)
+
+    def widest(self, reviews):
+        return max((max(len(review['replies']), self.widest(review['replies'])) for review in reviews), default=0)
+
+    def test_query_count_is_independent_of_thread_size(self):
+        self.grow(roots=1, fanout=2)
+        small = [self.count_queries(url)[0] for url in self.urls()]
+        self.grow(roots=4, fanout=8)
+        large = [self.count_queries(url)[0] for url in self.urls()]
+        self.assertEqual(small, large)
+
+    def test_depth_limit_and_reply_cap(self):
+        self.grow(roots=2, fanout=6)
+        detail_url, list_url = self.urls()
+        detail = self.count_queries(detail_url)[1]['reviews']
+        roots = [review for review in detail if review['parent'] is None]
+        self.assertEqual(self.depth(roots), MAX_REPLY_DEPTH + 1)  # ریشه + حداکثر عمق پاسخ
+        self.assertEqual(self.widest(roots), 7)  # زنجیره + ۶ پاسخ
+
+        for url in self.urls('?depth=2&replies=3'):
+            data = self.count_queries(url)[1]
+            reviews = data['reviews'] if 'reviews' in data else data['results']
+            roots = [review for review in reviews if review['parent'] is None]
+            self.assertEqual((self.depth(roots), self.widest(roots)), (3, 3), url)
+
+
+# 📊 شمارش فیلترها (tools/facets.py)
+class FacetsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        generate({'tools': 25, 'tags': 5, 'categories': 4, 'technologies': 3,
+                  'users': 2, 'reviews': 0, 'reactions': 0, 'otps': 0}, seed=13)
+        # ابزارهای چنددسته‌ای، تا join فیلتر نام دسته ردیف تکراری بسازد اگر شمارش درست نباشد
+        categories = list(Category.objects.order_by('pk'))
+        for tool in Tool.objects.order_by('pk')[:10]:
+            tool.categories.add(*categories[:2])
+
+    def expected(self, tools):
+        tool_ids = list(tools.values_list('pk', flat=True).distinct())
+        tools = Tool.objects.filter(pk__in=tool_ids)
+
+        def relation(through, column):
+            counts = {}
+            for target_id in through.objects.filter(tool_id__in=tool_ids).values_list(column, flat=True):
+                counts[target_id] = counts.get(target_id, 0) + 1
+            return counts
+
+        return {
+            'total': len(tool_ids),
+            'license_type': {value: tools.filter(license_type=value).count() for value, _label in Tool.LICENSE_CHOICES},
+            'features': {feature: tools.filter(**{feature: True}).count() for feature in BOOLEAN_FEATURES},
+            'categories': relation(Tool.categories.through, 'category_id'),
+            'technologies': relation(Tool.technologies.through, 'technology_id'),
+            'tags': relation(Tool.tags.through, 'tag_id'),
+        }
+
+    def facets(self, query=''):
+        response = self.client.get(reverse('tool-facets') + query)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        for relation in ('categories', 'technologies', 'tags'):
+            data[relation] = {row['id']: row['count'] for row in data[relation]}
+        return data
+
+    def test_counts_under_filters(self):
+        category = Category.objects.order_by('pk').first()
+        cases = {
+            '': Tool.objects.all(),
+            '?license_type=free': Tool.objects.filter(license_type='free'),
+            '?has_chatbot=true&license_type=paid': Tool.objects.filter(has_chatbot=True, license_type='paid'),
+            f'?category_name={category.name}': Tool.objects.filter(categories__name__icontains=category.name),
+            '?features=supports_farsi,!is_sanctioned': Tool.objects.filter(supports_farsi=True, is_sanctioned=False),
+        }
+        for query, tools in cases.items():
+            with self.subTest(query=query):
+                self.assertEqual(self.facets(query), self.expected(tools))
+
+    def test_cache_reused_per_normalized_signature(self):
+        self.assertEqual(
+            filter_signature(QueryDict('tag=3&license_type=free&cursor=abc&ordering=name&has_chatbot=')),
+            filter_signature(QueryDict('license_type=free&tag=3&page_size=5')),
+        )
+        tool_index.rebuild()
+        with self.assertNumQueries(4):
+            first = self.facets('?license_type=free&has_chatbot=true')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.facets('?has_chatbot=true&license_type=free&cursor=x&desktop_version='), first)
+        with self.assertNumQueries(4):
+            self.facets('?license_type=paid&has_chatbot=true')
+
+        # تغییر ابزار (بعد از commit) نسخه فضای نام و در نتیجه کلید کش را عوض می‌کند
+        with self.captureOnCommitCallbacks(execute=True):
+            Tool.objects.filter(license_type='free', has_chatbot=True).first().delete()
+        with self.assertNumQueries(4):
+            self.assertEqual(self.facets('?license_type=free&has_chatbot=true')['total'], first['total'] - 1)
+
+
+# 📄 صفحه‌بندی cursor (core/pagination.py، tools/pagination.py)
+@override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+class CursorPaginationTests(TestCase):
+    def walk(self, url, page_size=7):
+        # 🚶 پیمایش همه صفحه‌ها با لینک next؛ شناسه‌ها به ترتیب دریافت
+        ids, url = [], f"{url}{'&' if '?' in url else '?'}page_size={page_size}"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertLessEqual(len(data['results']), page_size)
+            ids += [row['id'] for row in data['results']]
+            url = data['next']
+        return ids
+
+    def test_tool_list_ties_on_created_at(self):
+        tools = make_tools(20, prefix="page")
+        Tool.objects.update(created_at=tools[0].created_at)  # همه هم‌زمان: فقط id ترتیب را می‌شکند
+        ids = self.walk(reverse('tool-list-create'))
+        self.assertEqual(ids, sorted((tool.pk for tool in tools), reverse=True))
+
+    def test_top_rated_ties_on_score(self):
+        tools = make_tools(15, prefix="top")
+        for tool in tools:
+            leaderboard.place(tool.pk, 'all', 0, 4.0)  # امتیاز برابر (avg_rating یکسان)
+        self.assertEqual(self.walk(reverse('top-rated-tools'), page_size=4), [tool.pk for tool in tools])
+
+    def test_review_likes_ties(self):
+        tool = make_tools(1, prefix="likes")[0]
+        users = CustomUser.objects.bulk_create([CustomUser(mobile=f'091300000{i:02d}') for i in range(17)])
+        reviews = [ToolReview.objects.create(tool=tool, user=user, rating=4, comment='c') for user in users]
+        ToolReview.objects.filter(pk__in=[review.pk for review in reviews[::2]]).update(like_count=3)
+        ToolReview.objects.filter(pk__in=[review.pk for review in reviews[1::2]]).update(like_count=1)
+
+        ids = self.walk(reverse('tool-review-list-create') + f'?tool={tool.pk}&ordering=likes', page_size=3)
+        expected = list(ToolReview.objects.filter(tool=tool).order_by('-like_count', '-id').values_list('pk', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_cursor_stable_under_inserts(self):
+        tools = make_tools(12, prefix="stable")
+        first = self.client.get(reverse('tool-list-create') + '?page_size=5').json()
+        make_tools(3, prefix="newer")  # ردیف‌های جدید جلوی cursor صفحه بعد را جابه‌جا نمی‌کنند
+        seen = [row['id'] for row in first['results']]
+        url = first['next']
+        while url:
+            data = self.client.get(url).json()
+            seen += [row['id'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(seen, sorted((tool.pk for tool in tools), reverse=True))
+
+    def test_page_size_capped(self):
+        make_tools(DefaultCursorPagination.max_page_size + 5, prefix="cap")
+        response = self.client.get(reverse('tool-list-create') + '?page_size=1000')
+        self.assertEqual(len(response.json()['results']), DefaultCursorPagination.max_page_size)
+        self.assertIsNotNone(response.json()['next'])
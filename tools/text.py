@@ -0,0 +1,46 @@
+# tools/text.py
+# --------------------------------------------------
+# 🔤 نرمال‌سازی متن فارسی برای ایندکس و جستجو
+# --------------------------------------------------
+
+import re
+
+# ي/ك عربی ← ی/ک فارسی و چند حرف هم‌ارز دیگر
+_CHARACTER_MAP = str.maketrans({
+    'ي': 'ی',
+    'ى': 'ی',
+    'ئ': 'ی',
+    'ك': 'ک',
+    'ة': 'ه',
+    'ۀ': 'ه',
+    'أ': 'ا',
+    'إ': 'ا',
+    'ٱ': 'ا',
+    'ؤ': 'و',
+    # 🔢 ارقام فارسی و عربی ← لاتین
+    **{persian: str(digit) for digit, persian in enumerate('۰۱۲۳۴۵۶۷۸۹')},
+    **{arabic: str(digit) for digit, arabic in enumerate('٠١٢٣٤٥٦٧٨٩')},
+    # نیم‌فاصله (ZWNJ) و علائم جهت ← فاصله
+    '\u200c': ' ',
+    '\u200d': ' ',
+    '\u200e': ' ',
+    '\u200f': ' ',
+})
+
+# اعراب (فتحه، کسره، تنوین، تشدید، ...) و کشیده (ـ)
+_DIACRITICS = re.compile('[\u064B-\u065F\u0670\u0640]')
+
+_TOKENS = re.compile(r'\w+')
+
+
+def normalize_text(text):
+    """✅ متن یکسان‌شده برای ایندکس و جستجو (حروف، ارقام، نیم‌فاصله، اعراب، حروف کوچک)."""
+    if not text:
+        return ''
+    text = _DIACRITICS.sub('', text.translate(_CHARACTER_MAP))
+    return ' '.join(text.lower().split())
+
+
+def tokenize(text):
+    """🔪 کلمات متن نرمال‌شده."""
+    return _TOKENS.findall(normalize_text(text))
@@ -0,0 +1,92 @@
+# tools/threads.py
+# --------------------------------------------------
+# 🧵 بارگذاری درخت نظرات و پاسخ‌ها با تعداد کوئری ثابت
+# --------------------------------------------------
+
+from collections import defaultdict
+
+from django.conf import settings
+
+from .models import ToolReview
+
+# ⚙️ سقف‌های سمت سرور (با ?depth= و ?replies= فقط می‌شود کمترشان کرد)
+MAX_REPLY_DEPTH = getattr(settings, 'REVIEW_THREAD_MAX_DEPTH', 5)
+MAX_REPLIES_PER_NODE = getattr(settings, 'REVIEW_THREAD_MAX_REPLIES', 50)
+
+
+def thread_limits(request=None):
+    """
+    ✅ محدودیت عمق و تعداد پاسخ هر گره، از پارامترهای درخواست با سقف تنظیمات.
+    خروجی مستقیماً در context سریالایزر نظرات قرار می‌گیرد.
+    """
+    limits = {'max_reply_depth': MAX_REPLY_DEPTH, 'max_replies': MAX_REPLIES_PER_NODE}
+    if request is None:
+        return limits
+
+    for param, key in (('depth', 'max_reply_depth'), ('replies', 'max_replies')):
+        value = request.query_params.get(param, '')
+        if value.isdigit():
+            limits[key] = min(int(value), limits[key])
+    return limits
+
+
+def _thread_queryset():
+    return ToolReview.objects.select_related('user', 'tool').order_by('created_at', 'id')
+
+
+def build_review_threads(reviews):
+    """
+    🌳 ساخت درخت در حافظه از روی لیستی که همه نظرات ابزار را دارد.
+    به هر نظر لیست thread_replies (پاسخ‌های مستقیم، به ترتیب زمان) اضافه می‌شود.
+    """
+    children = defaultdict(list)
+    for review in reviews:
+        if review.parent_id is not None:
+            children[review.parent_id].append(review)
+    for review in reviews:
+        review.thread_replies = children.get(review.id, [])
+    return reviews
+
+
+def load_tool_reviews(tool_id):
+    """🧵 همه نظرات و پاسخ‌های یک ابزار با یک کوئری مرتب، همراه با درخت پاسخ‌ها."""
+    return build_review_threads(list(_thread_queryset().filter(tool_id=tool_id)))
+
+
+def attach_reply_threads(reviews, max_depth=MAX_REPLY_DEPTH):
+    """
+    🧵 پاسخ‌های یک صفحه از نظرات، سطح به سطح (هر سطح یک کوئری، حداکثر max_depth کوئری)
+    مستقل از تعداد کل نظرات ابزار.
+    """
+    nodes = {review.id: review for review in reviews}
+    frontier = list(nodes)
+    for review in reviews:
+        review.thread_replies = []
+
+    for _ in range(max_depth):
+        if not frontier:
+            break
+        replies = list(_thread_queryset().filter(parent_id__in=frontier))
+        frontier = []
+        for reply in replies:
+            # ♻️ اگر پاسخ خودش در همین صفحه هست، همان نمونه استفاده شود
+            reply = nodes.setdefault(reply.id, reply)
+            if not hasattr(reply, 'thread_replies'):
+                reply.thread_replies = []
+                frontier.append(reply.id)
+            nodes[reply.parent_id].thread_replies.append(reply)
+    return reviews
+
+
+def iter_thread(reviews, max_depth=MAX_REPLY_DEPTH, max_replies=MAX_REPLIES_PER_NODE):
+    """🔁 پیمایش نظرات و پاسخ‌های بارگذاری‌شده تا همان عمق و سقفی که نمایش داده می‌شود."""
+    stack = [(review, 0) for review in reviews]
+    seen = set()
+    while stack:
+        review, depth = stack.pop()
+        if review.id in seen:
+            continue
+        seen.add(review.id)
+        yield review
+        if depth < max_depth:
+            stack.extend((child, depth + 1) for child in getattr(review, 'thread_replies', ())[:max_replies])
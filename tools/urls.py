@@ -8,6 +8,7 @@ from django.urls import path
 # 🧠 ایمپورت ویوهای اصلی
 from .views import (
     ToolListCreateView,
+    ToolFacetsView,
     ToolDetailView,
     CategoryListCreateView,
     TechnologyListCreateView,
@@ -20,15 +21,21 @@ from .views import (
     ReviewReactionView,
     toggle_reaction,
     my_reviews,
+    my_reactions,
     ToolDeleteView,
     AdminDashboardAPIView,
     ToolAdminDetailView,
+    CacheStatsView,
+    ToolCatalogView,
 )
 
 urlpatterns = [
     # 🔹 لیست ابزارها + افزودن ابزار جدید
     path('tools/', ToolListCreateView.as_view(), name='tool-list-create'),
 
+    # 📊 شمارش فیلترها برای نوار کناری (با همان پارامترهای فیلتر لیست)
+    path('tools/facets/', ToolFacetsView.as_view(), name='tool-facets'),
+
     # 🔹 نمایش اطلاعات ابزار خاص
     path('tools/<int:pk>/', ToolDetailView.as_view(), name='tool-detail'),
 
@@ -50,6 +57,9 @@ urlpatterns = [
     # 🔸 فقط لیست نظرات ثبت‌شده توسط کاربر فعلی
     path("reviews/my/", my_reviews, name="my-reviews"),
 
+    # 🔸 ری‌اکشن‌های کاربر فعلی ({شناسه نظر: نوع})
+    path("reactions/my/", my_reactions, name="my-reactions"),
+
     # 🧩 مقایسه ابزارها با آیدی‌های دلخواه
     path('tools/compare/', ToolCompareView.as_view(), name='tool-compare'),
 
@@ -73,4 +83,10 @@ urlpatterns = [
 
     path("admin/tools/<int:pk>/", ToolAdminDetailView.as_view(), name="admin-tool-edit"),
 
+    # 📦 ورود/خروج گروهی ابزارها (JSONL/CSV)
+    path("admin/tools/catalog/", ToolCatalogView.as_view(), name="admin-tool-catalog"),
+
+    # 📈 آمار کش پاسخ‌ها
+    path("admin/cache-stats/", CacheStatsView.as_view(), name="admin-cache-stats"),
+
 ]
@@ -3,6 +3,9 @@
 # ویوهای API برای ابزار، دسته‌بندی و تکنولوژی
 # --------------------------------------------------
 
+import codecs
+import csv
+
 # 🧩 ماژول‌های خارجی نصب‌شده
 from rest_framework import generics, permissions, filters, status
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
@@ -11,75 +14,158 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Avg, Count, Q
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum
+from django.http import StreamingHttpResponse
 
 # 🧩 ماژول‌های داخلی پروژه
-from .models import Tool, Category, Technology, ToolReview, Tag, ReviewReaction
-from .serializers import ToolSerializer, CategorySerializer, TechnologySerializer, ToolReviewSerializer, TagSerializer, ReviewReactionSerializer
-from .filters import ToolFilter
+from core.cache import CachedResponseMixin, response_cache
+from core.conditional import ConditionalGetMixin
+from core.query_budget import query_budget
+from .batch import deferred_deletes, delete_tool
+from .models import Tool, Category, Technology, ToolReview, Tag, ReviewReaction, ToolRanking
+from .serializers import ToolSerializer, ToolListSerializer, LeaderboardToolSerializer, CategorySerializer, TechnologySerializer, ToolReviewSerializer, TagSerializer, ReviewReactionSerializer
+from .filters import ToolFilter, ToolSearchFilter
 from .permissions import IsOwnerOrAdminOrReadOnly, IsAdminUserRole
+from .pagination import ToolCursorPagination, TopRatedCursorPagination, ReviewCursorPagination
+from .threads import attach_reply_threads, thread_limits
+from .facets import cached_facets
+from . import catalog, compare, leaderboard
 
 
 
 # ✅ لیست ابزارها + ساخت ابزار جدید (GET + POST)
-class ToolListCreateView(generics.ListCreateAPIView):
-    queryset = Tool.objects.all()
+@query_budget(GET=5, POST=38)
+class ToolListCreateView(ConditionalGetMixin, CachedResponseMixin, generics.ListCreateAPIView):
+    cache_namespaces = ('tools', 'taxonomy')  # 📦 کش GET ناشناس
+    queryset = Tool.objects.for_list()
     serializer_class = ToolSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, ToolSearchFilter, filters.OrderingFilter]
     filterset_class = ToolFilter  # 🔥 فیلتر اختصاصی ما
-    search_fields = ['name', 'description']  # فیلدهایی که جستجو توشون انجام میشه
-    ordering_fields = ['name', 'id']  # 👈 مرتب‌سازی فقط روی این فیلدها مجازه
+    # 🔎 ?search= روی ایندکس متنی نام، توضیحات، ویژگی شاخص و تگ‌ها (tools/search.py)
+    ordering_fields = ['name', 'id', 'created_at']  # 👈 مرتب‌سازی فقط روی این فیلدها مجازه (همه ایندکس‌دار)
+    ordering = ('-created_at', '-id')  # پیش‌فرض: جدیدترین‌ها
+    pagination_class = ToolCursorPagination  # در حالت جستجو: به ترتیب ارتباط
     permission_classes = [IsAuthenticatedOrReadOnly]  # 👈 اینو اضافه کن
 
-    # ✅ نمایش اطلاعات یک ابزار خاص + نظراتش + میانگین امتیاز
-class ToolDetailView(generics.RetrieveAPIView):
+    def get_serializer_class(self):
+        # 📋 لیست با سریالایزر سبک؛ ساخت ابزار با سریالایزر کامل
+        if self.request.method == 'GET':
+            return ToolListSerializer
+        return ToolSerializer
+
+    def filter_queryset(self, queryset):
+        # ♻️ اعتبارسنج و لیست از یک نتیجه فیلتر استفاده می‌کنند (جستجوی متنی و بیت‌مپ یک بار)
+        if getattr(self, '_filtered_queryset', None) is None:
+            self._filtered_queryset = super().filter_queryset(queryset)
+        return self._filtered_queryset
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        # 🏷️ آخرین تغییر و تعداد ابزارهای همین فیلتر (حذف ابزار هم ETag را عوض می‌کند)
+        state = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last=Max('updated_at'), count=Count('id'),
+        )
+        return (state['last'], state['count']), state['last']
+
+# 📊 شمارش هر فیلتر (لایسنس، ویژگی‌ها، دسته، تکنولوژی، تگ) زیر همان فیلترهای لیست ابزارها
+@query_budget(GET=4)
+class ToolFacetsView(generics.GenericAPIView):
     queryset = Tool.objects.all()
+    filter_backends = [DjangoFilterBackend, ToolSearchFilter]
+    filterset_class = ToolFilter
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        return Response(cached_facets(self.filter_queryset(self.get_queryset()), request.query_params))
+
+
+    # ✅ نمایش اطلاعات یک ابزار خاص + نظراتش + میانگین امتیاز
+@query_budget(GET=8)
+class ToolDetailView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_namespaces = ('tools', 'reviews', 'taxonomy')
+    queryset = Tool.objects.for_list()
     serializer_class = ToolSerializer
     permission_classes = [permissions.AllowAny]  # همه بتونن ببینن
 
+    def get_serializer_context(self):
+        # 🧵 محدودیت عمق و تعداد پاسخ‌های درخت نظرات (?depth= و ?replies=)
+        return {**super().get_serializer_context(), **thread_limits(self.request)}
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        # 🕒 updated_at ابزار با هر تغییر نظر، ری‌اکشن، تگ و دسته هم جلو می‌رود
+        updated_at = Tool.objects.filter(pk=kwargs['pk']).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None
+        return updated_at, updated_at
+
 
 # ✅ لیست دسته‌بندی‌ها + ساخت دسته‌بندی جدید
-class CategoryListCreateView(generics.ListCreateAPIView):
+@query_budget(GET=1, POST=2)
+class CategoryListCreateView(CachedResponseMixin, generics.ListCreateAPIView):
+    cache_namespaces = ('taxonomy',)
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    pagination_class = None  # لیست کوچک؛ یکجا برگردانده می‌شود
 
 # ✅ لیست تکنولوژی‌ها + ساخت تکنولوژی جدید
-class TechnologyListCreateView(generics.ListCreateAPIView):
+@query_budget(GET=1, POST=2)
+class TechnologyListCreateView(CachedResponseMixin, generics.ListCreateAPIView):
+    cache_namespaces = ('taxonomy',)
     queryset = Technology.objects.all()
     serializer_class = TechnologySerializer
+    pagination_class = None
 
 
 # 🔽 نمایش و ثبت نظرات کاربران
-class ToolReviewListCreateView(generics.ListCreateAPIView):
+@query_budget(GET=5, POST=13)
+class ToolReviewListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = ToolReview.objects.all()
     serializer_class = ToolReviewSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = ReviewCursorPagination  # ترتیب نهایی را صفحه‌بندی اعمال می‌کند
 
     def perform_create(self, serializer):
-        # 🔒 کاربر جاری به عنوان نویسنده ثبت می‌شود
-        serializer.save(user=self.request.user)
+        # 🔒 کاربر جاری به عنوان نویسنده ثبت می‌شود؛ ابزار (در سریالایزر فقط‌خواندنی) از بدنه درخواست
+        tool_id = str(self.request.data.get("tool", ""))
+        tool = Tool.objects.filter(pk=tool_id).first() if tool_id.isdigit() else None
+        if tool is None:
+            raise ValidationError({"tool": "ابزار معتبر نیست."})
+        serializer.save(user=self.request.user, tool=tool)
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), **thread_limits(self.request)}
+
+    def paginate_queryset(self, queryset):
+        # 🧵 پاسخ‌های نظرات همین صفحه سطح به سطح (تعداد کوئری محدود به عمق درخت)
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            attach_reply_threads(page, thread_limits(self.request)["max_reply_depth"])
+        return page
 
     def get_queryset(self):
-        queryset = ToolReview.objects.all()
+        queryset = ToolReview.objects.select_related("user", "tool")
 
         # 📌 فیلتر بر اساس ابزار
         tool_id = self.request.query_params.get("tool")
         if tool_id:
             queryset = queryset.filter(tool_id=tool_id)
 
-        # 🆕 مرتب‌سازی بر اساس محبوبیت
-        ordering = self.request.query_params.get("ordering")
-        if ordering == "likes":
-            queryset = queryset.annotate(likes=Count("reactions", filter=Q(reactions__type="like"))).order_by("-likes")
-        elif ordering == "dislikes":
-            queryset = queryset.annotate(dislikes=Count("reactions", filter=Q(reactions__type="dislike"))).order_by("-dislikes")
-        else:
-            queryset = queryset.order_by("-created_at")  # پیش‌فرض: جدیدترین‌ها
-
+        # 🆕 مرتب‌سازی بر اساس محبوبیت روی شمارنده‌های ذخیره‌شده
+        # (ترتیب ?ordering=likes|dislikes در ReviewCursorPagination اعمال می‌شود)
         return queryset
 
+    def get_conditional_validators(self, request, *args, **kwargs):
+        # 🕒 هر ثبت/ویرایش/حذف نظر یا ری‌اکشن updated_at ابزار مربوطه را جلو می‌برد
+        tools = Tool.objects.all()
+        tool_id = request.query_params.get("tool")
+        if tool_id:
+            tools = tools.filter(pk=tool_id)
+        state = tools.aggregate(last=Max('updated_at'), count=Count('id'))
+        return (state['last'], state['count']), state['last']
+
 
 # ✅ ثبت نظر فقط برای یک ابزار خاص توسط کاربر لاگین‌شده
+@query_budget(POST=13)
 class ToolReviewCreateView(generics.CreateAPIView):
     serializer_class = ToolReviewSerializer
     permission_classes = [IsAuthenticated]  # فقط کاربر لاگین‌شده اجازه داره نظر بده
@@ -93,37 +179,88 @@ class ToolReviewCreateView(generics.CreateAPIView):
         serializer.save(user=self.request.user, tool=tool)
 
 # ✏️ مشاهده، ویرایش و حذف نظر (فقط توسط صاحبش)
+@query_budget(GET=9, PUT=19, PATCH=19, DELETE=28)
 class ToolReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = ToolReview.objects.all()
+    queryset = ToolReview.objects.select_related("user", "tool")
     serializer_class = ToolReviewSerializer
     permission_classes = [IsOwnerOrAdminOrReadOnly, IsAuthenticated]  # فقط صاحب اجازه ویرایش/حذف داره
 
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), **thread_limits(self.request)}
 
-    # 📊 لیست ابزارهایی که امتیاز دارن، مرتب‌شده بر اساس میانگین امتیاز
-class TopRatedToolsView(generics.ListAPIView):
-    serializer_class = ToolSerializer
+    def get_object(self):
+        review = super().get_object()
+        if self.request.method != "DELETE":
+            # 🧵 پاسخ‌ها سطح به سطح (هر سطح یک کوئری، نه یک کوئری برای هر پاسخ)
+            attach_reply_threads([review], thread_limits(self.request)["max_reply_depth"])
+        return review
+
+    def perform_destroy(self, instance):
+        # 🗑️ پاسخ‌ها و ری‌اکشن‌ها آبشاری حذف می‌شوند؛ شمارنده‌ها و رتبه‌بندی یک بار به‌روز می‌شوند
+        with deferred_deletes():
+            instance.delete()
+
+
+    # 🏆 ابزارهای برتر بر اساس جدول رتبه‌بندی بیزی (کل، ?category=<id> یا ?tag=<id>)
+@query_budget(GET=6)
+class TopRatedToolsView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_namespaces = ('tools', 'taxonomy')
+    serializer_class = LeaderboardToolSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = TopRatedCursorPagination
+
+    def get_leaderboard_scope(self):
+        for scope in ('category', 'tag'):
+            value = self.request.query_params.get(scope)
+            if value:
+                if not value.isdigit():
+                    raise ValidationError({scope: "یک شناسه عددی لازم است."})
+                return scope, int(value)
+        return 'all', 0
 
     def get_queryset(self):
-        return Tool.objects.annotate(
-            avg_rating=Avg('reviews__rating')  # محاسبه میانگین
-        ).filter(
-            avg_rating__isnull=False  # فقط ابزارهایی که امتیاز دارن
-        ).order_by('-avg_rating')  # مرتب‌سازی نزولی
+        scope, scope_id = self.get_leaderboard_scope()
+        # 📄 پیمایش بازه‌ای روی ایندکس (scope, scope_id, -score, tool)؛ هزینه مستقل از تعداد ابزارها
+        return Tool.objects.for_list().filter(
+            rankings__scope=scope, rankings__scope_id=scope_id,
+        ).annotate(leaderboard_score=F('rankings__score'))
+
+    def paginate_queryset(self, queryset):
+        # 🔢 رتبه اولین ابزار صفحه با یک شمارش؛ بقیه پشت سر هم
+        page = super().paginate_queryset(queryset)
+        if page:
+            first = leaderboard.rank_of(page[0].pk, *self.get_leaderboard_scope(), page[0].leaderboard_score)
+            for offset, tool in enumerate(page):
+                tool.leaderboard_rank = first + offset
+        return page
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        # 🏷️ از خود جدول رتبه‌بندی (نه نسخه فضای نام که با کش locmem در هر پروسه فرق دارد):
+        # جابه‌جایی رتبه با تغییر امتیاز، و تغییر هر نظر/تگ/دسته با updated_at ابزار دیده می‌شود
+        scope, scope_id = self.get_leaderboard_scope()
+        state = ToolRanking.objects.filter(scope=scope, scope_id=scope_id).aggregate(
+            last=Max('tool__updated_at'), count=Count('id'), ranked=Sum(F('score') * F('tool_id')),
+        )
+        return (state['last'], state['count'], state['ranked']), state['last']
 
 
 # 📦 لیست و ساخت تگ جدید
-class TagListCreateView(generics.ListCreateAPIView):
+@query_budget(GET=1, POST=4)
+class TagListCreateView(CachedResponseMixin, generics.ListCreateAPIView):
+    cache_namespaces = ('taxonomy',)
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
+    pagination_class = None
 
 # ✅ ایجاد یا آپدیت ری‌اکشن
+@query_budget(POST=9)
 class ReviewReactionView(generics.CreateAPIView):
     serializer_class = ReviewReactionSerializer
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
         # 🧩 دریافت داده‌ها از درخواست
+        # (هر ذخیره ری‌اکشن همراه با شمارنده‌هایش اتمی است؛ ValidationError زیر نباید آپدیت را برگرداند)
         review = serializer.validated_data['review']
         type = serializer.validated_data['type']
         user = self.request.user
@@ -142,10 +279,13 @@ class ReviewReactionView(generics.CreateAPIView):
                 raise ValidationError("ری‌اکشن قبلی آپدیت شد.")
 
         # ✅ ری‌اکشن جدید ثبت بشه
-        serializer.save(user=user)
+        reaction = serializer.save(user=user)
+        # 🔄 شمارنده‌های به‌روزشده نظر برای پاسخ
+        reaction.review.refresh_from_db(fields=['like_count', 'dislike_count'])
 
 
 # ✅ آپدیت یا حذف ری‌اکشن برای یک نظر خاص
+@query_budget(POST=10)
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def toggle_reaction(request, review_id):
@@ -166,64 +306,59 @@ def toggle_reaction(request, review_id):
         return Response({"error": "نوع ری‌اکشن معتبر نیست"}, status=400)
 
     user = request.user
-    existing = ReviewReaction.objects.filter(user=user, review=review).first()
-
-    if existing:
-        if existing.type == reaction_type:
-            existing.delete()
-            return Response({"message": "ری‌اکشن حذف شد"}, status=200)
-        else:
-            existing.type = reaction_type
-            existing.save()
-            return Response({"message": "ری‌اکشن آپدیت شد"}, status=200)
-
-    # ایجاد جدید
-    ReviewReaction.objects.create(user=user, review=review, type=reaction_type)
+    # 🔒 ری‌اکشن و شمارنده‌های نظر با هم تغییر می‌کنند
+    with transaction.atomic():
+        existing = ReviewReaction.objects.select_for_update().filter(user=user, review=review).first()
+
+        if existing:
+            if existing.type == reaction_type:
+                existing.delete()
+                return Response({"message": "ری‌اکشن حذف شد"}, status=200)
+            else:
+                existing.type = reaction_type
+                existing.save()
+                return Response({"message": "ری‌اکشن آپدیت شد"}, status=200)
+
+        # ایجاد جدید
+        ReviewReaction.objects.create(user=user, review=review, type=reaction_type)
     return Response({"message": "ری‌اکشن ثبت شد"}, status=201)
 
 
     # 🎯 API مقایسه چند ابزار
+@query_budget(GET=5)
 class ToolCompareView(APIView):
+    # ⚖️ ماتریس ستونی و کش‌شده (tools/compare.py)؛ ?ids=1,2 و ?ids=2,1 یک ورودی کش دارند
+    permission_classes = [permissions.AllowAny]
+
     def get(self, request):
-        ids = request.query_params.get('ids')
-        if not ids:
-            return Response({"error": "ids parameter is required. e.g. ?ids=1,2"}, status=400)
-
-        id_list = [int(pk) for pk in ids.split(',') if pk.isdigit()]
-        tools = Tool.objects.filter(id__in=id_list)
-
-        serializer = ToolSerializer(tools, many=True)
-
-        # 🔍 لیست ویژگی‌های مقایسه‌ای که فرانت می‌تونه نشون بده
-        comparison_fields = [
-            "name", "license_type", "supports_farsi", "has_chatbot",
-            "multi_language_support", "desktop_version",
-            "highlight_feature", "is_sanctioned", "is_filtered",
-        ]
-
-        return Response({
-            "tools": serializer.data,
-            "fields": comparison_fields
-        })
+        ids = compare.parse_ids(request.query_params.get('ids'))
+        compare.record_request(ids)
+        return Response(compare.get_matrix(ids))
     
 # ✅ فقط مدیرها می‌تونن ابزارها رو ببینن/مدیریت کنن (مثلاً داشبورد ادمین)
+@query_budget(GET=5)
 class AdminDashboardAPIView(generics.ListAPIView):
     queryset = Tool.objects.all()
-    serializer_class = ToolSerializer
+    serializer_class = ToolListSerializer
     permission_classes = [IsAuthenticated, IsAdminUserRole]  # فقط مدیر
 
     def get_queryset(self):
-        return Tool.objects.order_by('-created_at')  # جدیدترین ابزارها
+        return Tool.objects.for_list().order_by('-created_at')  # جدیدترین ابزارها
 
 # ✅ ویرایش یا حذف ابزار فقط توسط ادمین‌ها
+@query_budget(GET=7, PUT=45, PATCH=12, DELETE=13)
 class ToolAdminDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Tool.objects.all()
     serializer_class = ToolSerializer
     permission_classes = [IsAuthenticated, IsAdminUserRole]  # فقط مدیرها
 
+    def perform_destroy(self, instance):
+        delete_tool(instance)  # نظرها و ری‌اکشن‌های ابزار بدون کار جداگانه برای هر ردیف
+
     # --------------------------------------------------
 # 🎯 دریافت لیست نظرات فقط برای کاربر لاگین‌شده (پروفایل)
 # --------------------------------------------------
+@query_budget(GET=8)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def my_reviews(request):
@@ -233,22 +368,73 @@ def my_reviews(request):
     """
 
     # 🔍 فقط نظراتی که توسط کاربر فعلی ثبت شده
-    reviews = ToolReview.objects.filter(user=request.user).select_related("tool")
+    reviews = list(ToolReview.objects.filter(user=request.user).select_related("user", "tool"))
 
-    # ✨ اگر بخوایم نام ابزار را هم داخل پاسخ بفرستیم، می‌تونیم serializer را تنظیم کنیم
-    serializer = ToolReviewSerializer(reviews, many=True, context={"request": request})
+    # 🧵 پاسخ‌های همه نظرها سطح به سطح (مثل لیست نظرات)
+    limits = thread_limits(request)
+    attach_reply_threads(reviews, limits["max_reply_depth"])
+    serializer = ToolReviewSerializer(reviews, many=True, context={"request": request, **limits})
 
     return Response(serializer.data)
 # ✅ فقط ری‌اکشن‌های کاربر فعلی برای نظرات
+@query_budget(GET=2)
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def my_reactions(request):
-    user = request.user
-    reactions = ReviewReaction.objects.filter(user=user)
-    data = {r.review.id: r.type for r in reactions}
-    return Response(data)
+    # 🔍 فقط دو ستون، بدون بارگذاری نظر هر ری‌اکشن
+    reactions = ReviewReaction.objects.filter(user=request.user).values_list("review_id", "type")
+    return Response(dict(reactions))
+
+# 📈 آمار کش پاسخ‌ها (hit/miss) فقط برای مدیرها
+@query_budget(GET=1)
+class CacheStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUserRole]
+
+    def get(self, request):
+        return Response(response_cache.stats())
 
+
+# 📦 ورود/خروج گروهی فهرست ابزارها (tools/catalog.py)
+#   GET  ?fmt=jsonl|csv → دانلود جریانی
+#   POST فایل در فیلد file (+ ?fmt=، پیش‌فرض از پسوند؛ ?dry_run=1 فقط اعتبارسنجی)
+@query_budget(GET=6, POST=15)
+class ToolCatalogView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUserRole]
+    content_types = {'jsonl': 'application/x-ndjson; charset=utf-8', 'csv': 'text/csv; charset=utf-8'}
+
+    def get_format(self, request, filename=''):
+        fmt = request.query_params.get('fmt') or ('csv' if filename.endswith('.csv') else 'jsonl')
+        if fmt not in catalog.FORMATS:
+            raise ValidationError({'fmt': f"فرمت باید یکی از {', '.join(catalog.FORMATS)} باشد."})
+        return fmt
+
+    def get(self, request):
+        fmt = self.get_format(request)
+        response = StreamingHttpResponse(catalog.export_catalog(fmt), content_type=self.content_types[fmt])
+        response['Content-Disposition'] = f'attachment; filename="tools.{fmt}"'
+        return response
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': "فایل ورودی ارسال نشده است."})
+        fmt = self.get_format(request, upload.name)
+        try:
+            report = catalog.import_catalog(
+                codecs.iterdecode(upload, 'utf-8-sig'), fmt,
+                dry_run=request.query_params.get('dry_run') in ('1', 'true'),
+            )
+        except (UnicodeDecodeError, csv.Error) as exc:
+            # ⚠️ دسته‌های کامل قبل از خطا ثبت شده‌اند؛ ورود دوباره همان فایل (upsert) بی‌خطر است
+            raise ValidationError({'file': f"فایل خوانا نیست (UTF-8 {fmt.upper()} لازم است): {exc}"})
+        return Response(report, status=status.HTTP_200_OK)
+
+
+@query_budget(DELETE=13)
 class ToolDeleteView(generics.DestroyAPIView):
     queryset = Tool.objects.all()
     serializer_class = ToolSerializer
-    permission_classes = [IsAuthenticated, permissions.IsAdminUser]  # فقط مدیر
\ No newline at end of file
+    permission_classes = [IsAuthenticated, permissions.IsAdminUser]  # فقط مدیر
+
+    def perform_destroy(self, instance):
+        delete_tool(instance)
\ No newline at end of file